@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'embedding'))
+
+from common.json_io import iter_records
+from sentence_encoder import length_sorted_encoder, file_order_encoder
+
+MODEL_ID = "nlpai-lab/KURE-v1"
+INPUT_FILE = os.path.join(PROJECT_ROOT, 'embedding_preprocessing', 'merged_sentence_output_by_qpoll_topic', 'merged_qpoll_text.json')
+
+# 합성 문장 재료 (짧은 단일 답변 문장과 답변이 여러 개 이어진 긴 문장이 섞이도록)
+SHORT_SENTENCES = [
+    "전통시장을 전혀 방문하지 않는다.",
+    "반려동물을 키워본 적이 없다.",
+    "여름철 최애 간식은 아이스크림이다.",
+    "주로 혼자 운동한다.",
+]
+ANSWERS = ["유튜브", "넷플릭스", "쿠팡", "배달의민족", "카카오톡", "인스타그램", "당근마켓", "토스",
+           "네이버 블로그", "스마트워치", "무선 이어폰", "로봇청소기", "공기청정기", "전기자전거"]
+
+
+def make_sentences(count, seed=0):
+    rng = np.random.default_rng(seed)
+    sentences = []
+    for _ in range(count):
+        if rng.random() < 0.6:
+            sentences.append(SHORT_SENTENCES[int(rng.integers(len(SHORT_SENTENCES)))])
+        else:
+            chosen = rng.choice(ANSWERS, size=int(rng.integers(2, len(ANSWERS))), replace=False)
+            sentences.append(f"최근 사용한 서비스와 제품은 {', '.join(chosen)} 입니다.")
+    return sentences
+
+
+def load_sentences(count):
+    """merged_qpoll_text.json 이 있으면 앞에서부터 count개 문장, 없으면 합성 문장"""
+    if os.path.exists(INPUT_FILE):
+        sentences = []
+        for record in iter_records(INPUT_FILE):
+            sentences.append(record["sentence"])
+            if len(sentences) >= count:
+                return sentences, os.path.basename(INPUT_FILE)
+        return sentences, os.path.basename(INPUT_FILE)
+    return make_sentences(count), "합성 문장"
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def token_lengths(tokenizer, sentences, max_length=None):
+    """Number of tokens (with special tokens, truncated to max_length) of each sentence."""
+    encoded = tokenizer(list(sentences), add_special_tokens=True, truncation=max_length is not None,
+                        max_length=max_length)
+    return np.fromiter((len(ids) for ids in encoded["input_ids"]), dtype=np.int64, count=len(sentences))
+
+
+def padding_efficiency(lengths, batch_size, order=None):
+    """Real tokens / padded tokens when lengths are batched batch_size at a time in the given order."""
+    lengths = np.asarray(lengths) if order is None else np.asarray(lengths)[order]
+    padded = sum(int(lengths[start:start + batch_size].max()) * len(lengths[start:start + batch_size])
+                 for start in range(0, len(lengths), batch_size))
+    return int(lengths.sum()) / padded if padded else 1.0
+
+
+# --- 2. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="KURE-v1 CPU 인코딩: 파일 순서 배치 vs model.encode 한 번 (길이 정렬) (tokens/sec)")
+    parser.add_argument("--sentences", type=int, default=4_096, help="인코딩할 문장 수 (기본: 4,096)")
+    parser.add_argument("--batch-size", type=int, default=64, help="배치 크기 (qpoll_embedding.py 의 BATCH_SIZE)")
+    parser.add_argument("--model", default=MODEL_ID, help=f"SentenceTransformer 모델 (기본: {MODEL_ID})")
+    parser.add_argument("--threads", type=int, help="torch CPU 스레드 수 (기본: torch 기본값)")
+    args = parser.parse_args()
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    model = SentenceTransformer(args.model, device="cpu")
+    sentences, source = load_sentences(args.sentences)
+    lengths = token_lengths(model.tokenizer, sentences, model.max_seq_length)
+    total_tokens = int(lengths.sum())
+    print(f"--- {source}: {len(sentences):,} 문장, {total_tokens:,} 토큰, 배치 {args.batch_size}, "
+          f"torch 스레드 {torch.get_num_threads()} ---")
+
+    encode_file_order = file_order_encoder(model, args.batch_size)
+    encode_length_sorted = length_sorted_encoder(model, args.batch_size)
+
+    encode_file_order(sentences[:args.batch_size]) # 워밍업
+    expected, file_sec = timed(encode_file_order, sentences)
+    actual, sorted_sec = timed(encode_length_sorted, sentences)
+
+    # SentenceTransformer.encode 는 문자 수 기준 내림차순으로 정렬해 배치를 만든다
+    order = np.argsort([-len(sentence) for sentence in sentences], kind='stable')
+    print(f"  > 파일 순서 : {file_sec:8.2f}s, {total_tokens / file_sec:10,.0f} tokens/s, "
+          f"padding 효율 {padding_efficiency(lengths, args.batch_size):.1%}")
+    print(f"  > 길이 정렬 : {sorted_sec:8.2f}s, {total_tokens / sorted_sec:10,.0f} tokens/s, "
+          f"padding 효율 {padding_efficiency(lengths, args.batch_size, order):.1%}  (x{file_sec / max(sorted_sec, 1e-9):.2f})")
+
+    # padding 길이만 달라지므로 벡터는 부동소수점 오차 범위에서 같아야 한다
+    cos = np.sum(expected * actual, axis=1) / (np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1))
+    same = bool(cos.min() >= 0.9999)
+    print(f"  > 벡터 비교: 최소 cos {cos.min():.6f}, 최대 절대 오차 {np.abs(expected - actual).max():.2e}, 일치: {same}")
+
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+
+import numpy as np
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.embedding_cache import EmbeddingCache
+
+MODEL_ID = "fake-model"
+
+
+# --- 2. 가짜 모델 (문장마다 고정된 float32 벡터, 문장당 encode_ms 만큼 대기) ---
+class FakeModel:
+    def __init__(self, dim, encode_ms):
+        self.dim = dim
+        self.encode_ms = encode_ms
+        self.encoded = 0
+
+    def encode(self, sentences):
+        self.encoded += len(sentences)
+        time.sleep(len(sentences) * self.encode_ms / 1000)
+        vectors = np.empty((len(sentences), self.dim), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            seed = int.from_bytes(hashlib.sha256(sentence.encode('utf-8')).digest()[:8], 'little')
+            vectors[i] = np.random.default_rng(seed).standard_normal(self.dim, dtype=np.float32)
+        return vectors
+
+
+def make_week(sentence_count, week, changed_ratio):
+    """week 주차 문장 목록: changed_ratio 비율만 그 주에 새로 바뀐 문장"""
+    changed_every = max(int(round(1 / changed_ratio)), 1) if changed_ratio > 0 else 0
+    sentences = []
+    for i in range(sentence_count):
+        if changed_every and i % changed_every == 0:
+            sentences.append(f"{week}주차에 바뀐 응답 {i}입니다.")
+        else:
+            sentences.append(f"패널 응답 문장 {i}입니다.")
+    return sentences
+
+
+def run_week(label, cache_path, sentences, model, batch_size, max_bytes):
+    expected_model = FakeModel(model.dim, 0)
+    model.encoded = 0
+    start = time.perf_counter()
+    with EmbeddingCache(MODEL_ID, "none", cache_path, max_bytes) as cache:
+        vectors = [cache.encode(sentences[i:i + batch_size], model.encode)
+                   for i in range(0, len(sentences), batch_size)]
+        elapsed = time.perf_counter() - start
+        stats = cache.format_stats()
+        stored_bytes = cache.stored_bytes
+    same = np.array_equal(np.concatenate(vectors), expected_model.encode(sentences))
+    print(f"  > {label}: {elapsed:7.2f}s, 모델 인코딩 {model.encoded:,}개 | {stats} | 벡터 일치: {same}")
+    return same, stored_bytes
+
+
+# --- 3. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 캐시: 주차별 재실행 시 적중률 / 시간 / LRU 크기 제한 확인")
+    parser.add_argument("--sentences", type=int, default=50_000, help="주차별 문장 수 (기본: 50,000)")
+    parser.add_argument("--dim", type=int, default=1024, help="벡터 차원 (기본: 1024)")
+    parser.add_argument("--changed", type=float, default=0.05, help="주마다 바뀌는 문장 비율 (기본: 0.05)")
+    parser.add_argument("--encode-ms", type=float, default=0.5, help="가짜 모델의 문장당 인코딩 시간 (기본: 0.5ms)")
+    parser.add_argument("--batch-size", type=int, default=4096, help="cache.encode 한 번에 넘기는 문장 수")
+    args = parser.parse_args()
+
+    model = FakeModel(args.dim, args.encode_ms)
+    vector_bytes = args.dim * 4
+    all_same = True
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "embeddings.sqlite")
+        unlimited = 1 << 62
+        print(f"--- {args.sentences:,} 문장, 주마다 {args.changed:.0%} 변경 ---")
+        for week in range(3):
+            same, _ = run_week(f"{week + 1}주차", cache_path, make_week(args.sentences, week, args.changed),
+                               model, args.batch_size, unlimited)
+            all_same &= same
+
+        # 크기 제한: 문장 수의 절반만 들어가는 캐시
+        cap = args.sentences // 2 * vector_bytes
+        print(f"--- 크기 제한 {cap / 1024 / 1024:.1f} MB ---")
+        same, stored_bytes = run_week("제한 적용", cache_path, make_week(args.sentences, 3, args.changed),
+                                      model, args.batch_size, cap)
+        within_cap = stored_bytes <= cap
+        print(f"  > 저장된 벡터 {stored_bytes / 1024 / 1024:.1f} MB, 제한 이내: {within_cap}")
+        all_same &= same and within_cap
+
+    if not all_same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
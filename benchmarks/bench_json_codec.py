@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+
+from common import json_io
+
+
+# --- 2. 합성 데이터 ---
+def make_embedding_records(row_count, dim, seed=0):
+    """qpoll_embedding.py 출력과 같은 모양의 레코드 (vector는 모델 출력과 같은 float32 numpy 배열)"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((row_count, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [
+        {
+            "panel_id": f"w{i:08d}",
+            "question": "여러분은 평소 체력 관리를 위해 어떤 활동을 하고 계신가요?",
+            "sentence": "체력 관리를 위해 걷기, 헬스 활동을 하고 있다.",
+            "vector": vectors[i],
+        }
+        for i in range(row_count)
+    ]
+
+
+def measure(codec_name, records, path):
+    """(쓰기 초, 읽기 초, 파일 MB, 읽은 레코드 수) - 모든 단계가 쓰는 json_io 경로 그대로 측정"""
+    os.environ[json_io.CODEC_ENV_VAR] = codec_name
+
+    start = time.perf_counter()
+    json_io.write_records(path, records, pretty=False)
+    write_sec = time.perf_counter() - start
+
+    # 다음 단계처럼 한 레코드씩 읽기만 측정 (읽은 레코드는 보관하지 않음)
+    start = time.perf_counter()
+    read_count = sum(1 for _ in json_io.iter_records(path))
+    read_sec = time.perf_counter() - start
+    return write_sec, read_sec, os.path.getsize(path) / 2**20, read_count
+
+
+# --- 3. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="json_io 코덱 비교 (표준 json vs orjson): 임베딩 벡터 NDJSON 쓰기/읽기")
+    parser.add_argument("--rows", type=int, default=100_000, help="벡터 수 (기본: 100,000)")
+    parser.add_argument("--dim", type=int, default=1024, help="벡터 차원 (기본: 1024, KURE-v1)")
+    args = parser.parse_args()
+
+    codecs = ['json'] + (['orjson'] if json_io.orjson is not None else [])
+    if len(codecs) == 1:
+        print("orjson이 설치되어 있지 않아 표준 json만 측정합니다. (pip install orjson)")
+
+    print(f"--- 합성 임베딩 레코드 생성: {args.rows:,} x {args.dim}d ---")
+    records = make_embedding_records(args.rows, args.dim)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench-json-') as work_dir:
+        for codec_name in codecs:
+            path = os.path.join(work_dir, f"embeddings_{codec_name}.json")
+            write_sec, read_sec, size_mb, read_count = measure(codec_name, records, path)
+            results[codec_name] = (write_sec, read_sec)
+            print(f"  > {codec_name:<7} 쓰기 {write_sec:8.2f}s  읽기 {read_sec:8.2f}s  파일 {size_mb:9.1f} MB")
+
+            # 되읽은 벡터가 float32로 원래 값과 같은지 확인
+            same = read_count == len(records) and all(
+                np.array_equal(np.asarray(item["vector"], dtype=np.float32), record["vector"])
+                for item, record in zip(json_io.iter_records(path), records)
+            )
+            print(f"    - float32 벡터 일치: {same}")
+            os.remove(path)
+
+    if 'orjson' in results:
+        base_write, base_read = results['json']
+        write_sec, read_sec = results['orjson']
+        print(f"  > orjson: 쓰기 x{base_write / max(write_sec, 1e-9):.1f}, 읽기 x{base_read / max(read_sec, 1e-9):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'xlsx_to_json_pipeline'))
+
+from convert_welcome_to_json import decode_multi_select_columns
+
+# 다중선택 컬럼별 (보기 개수, 최대 선택 수)
+MULTI_SELECT_SHAPES = {
+    'owned_electronics': (30, 8),
+    'smoking_experience': (6, 2),
+    'smoking_brand': (40, 3),
+    'e_cigarette_experience': (5, 2),
+    'drinking_experience': (12, 4),
+}
+
+
+# --- 2. 기존 방식 (행 단위 apply) ---
+def apply_multi_select_labels(value_str, labels):
+    if not isinstance(value_str, str):
+        return value_str # Return as is if not a string
+
+    labeled_values = []
+    for val in value_str.split(','):
+        val = val.strip()
+        if not val:
+            continue
+        try:
+            num_val = int(val)
+            labeled_values.append(labels.get(num_val, num_val))
+        except (ValueError, TypeError):
+            labeled_values.append(val) # Keep as is if not a number
+    return labeled_values
+
+
+def decode_with_apply(df, labels_by_column):
+    for key, labels in labels_by_column.items():
+        df[key] = df[key].apply(lambda x: apply_multi_select_labels(x, labels))
+    return df
+
+
+# --- 3. 합성 데이터 ---
+def make_synthetic_frame(panel_count, seed=0):
+    """Welcome 병합 결과와 같은 형태의 다중선택 컬럼 프레임과 라벨 사전을 만든다."""
+    rng = np.random.default_rng(seed)
+    data = {'panel_id': [f"w{i:08d}" for i in range(panel_count)]}
+    labels_by_column = {}
+
+    for key, (option_count, max_selected) in MULTI_SELECT_SHAPES.items():
+        labels_by_column[key] = {code: f"{key}_{code}" for code in range(1, option_count + 1)}
+
+        # 응답 문자열은 조합 수가 제한적이므로, 고유 문자열 풀에서 뽑는다
+        pool = []
+        for _ in range(2000):
+            picked = rng.choice(np.arange(1, option_count + 2), size=rng.integers(1, max_selected + 1), replace=False)
+            pool.append(",".join(str(code) for code in sorted(picked)))
+        pool += ["", " , ", "기타응답"]
+
+        values = np.array(pool, dtype=object)[rng.integers(0, len(pool), panel_count)]
+        values[rng.random(panel_count) < 0.1] = None   # 무응답
+        values[rng.random(panel_count) < 0.01] = 3     # 단일 숫자로 저장된 셀
+        data[key] = values
+
+    return pd.DataFrame(data), labels_by_column
+
+
+# --- 4. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="Welcome 다중선택 디코딩: 행 단위 apply vs 컬럼 단위 디코딩")
+    parser.add_argument("--panels", type=int, default=1_000_000, help="합성 패널 수 (기본: 1,000,000)")
+    args = parser.parse_args()
+
+    print(f"--- 합성 프레임 생성: {args.panels:,} 패널 x {len(MULTI_SELECT_SHAPES)}개 다중선택 컬럼 ---")
+    df, labels_by_column = make_synthetic_frame(args.panels)
+
+    start = time.perf_counter()
+    expected = decode_with_apply(df.copy(), labels_by_column)
+    apply_sec = time.perf_counter() - start
+    print(f"  > 행 단위 apply     : {apply_sec:8.2f}s")
+
+    start = time.perf_counter()
+    actual = decode_multi_select_columns(df.copy(), labels_by_column)
+    vectorized_sec = time.perf_counter() - start
+    print(f"  > 컬럼 단위 디코딩  : {vectorized_sec:8.2f}s  (x{apply_sec / max(vectorized_sec, 1e-9):.1f})")
+
+    same = all(
+        expected[key].equals(actual[key])
+        for key in labels_by_column
+    )
+    print(f"  > 결과 일치: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'xlsx_to_json_pipeline'))
+
+from qpoll_panel_aggregator import aggregate_by_panel
+
+
+# --- 2. 기존 방식 (to_dict('records') 루프) ---
+def aggregate_with_records(processed_df, all_data_by_panel=None):
+    if all_data_by_panel is None:
+        all_data_by_panel = {}
+
+    for record in processed_df.to_dict('records'):
+        panel_id = record.get('panel_id')
+        if not panel_id:
+            continue
+
+        if panel_id not in all_data_by_panel:
+            all_data_by_panel[panel_id] = {
+                'panel_id': panel_id,
+                'category': record.get('category'),
+                'gender': record.get('gender'),
+                'age_raw': record.get('age_raw'),
+                'region': record.get('region'),
+                'surveys': []
+            }
+
+        survey_data = {
+            'survey_question': record.get('survey_question'),
+            'survey_answers': record.get('survey_answers'),
+            'survey_timestamp': record.get('survey_timestamp')
+        }
+        all_data_by_panel[panel_id]['surveys'].append(survey_data)
+    return all_data_by_panel
+
+
+# --- 3. 합성 데이터 ---
+def make_melted_frame(panel_count, question_count, seed=0, panel_offset=0):
+    """process_qpoll_file 결과와 같은 형태(melt + 라벨 적용 + NaN -> None)의 프레임을 만든다."""
+    rng = np.random.default_rng(seed)
+    panel_ids = np.array([f"w{i:08d}" for i in range(panel_offset, panel_offset + panel_count)], dtype=object)
+    panel_ids[rng.random(panel_count) < 0.01] = None # panel_id가 빈 행
+    wide = pd.DataFrame({
+        'category': rng.choice(['A', 'B', None], panel_count),
+        'panel_id': panel_ids,
+        'gender': rng.choice(['남', '여'], panel_count),
+        'age_raw': rng.integers(20, 70, panel_count),
+        'region': rng.choice(['서울', '부산', '경기', None], panel_count),
+        'survey_timestamp': rng.choice(['2025-01-06T10:00:00', '2025-01-07T11:30:00', None], panel_count),
+    })
+    melted = wide.loc[np.tile(np.arange(panel_count), question_count)].reset_index(drop=True)
+    melted['survey_question'] = np.repeat([f"질문 {q + 1}" for q in range(question_count)], panel_count)
+    answers = [[f"보기 {code}"] for code in range(1, 6)] + [[]]
+    melted['survey_answers'] = [answers[code] for code in rng.integers(0, len(answers), len(melted))]
+    return melted.replace({np.nan: None})
+
+
+def measure(func, *args):
+    """(결과, 소요 시간, tracemalloc peak) - tracemalloc 오버헤드가 시간에 섞이지 않도록 두 번 실행"""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+# --- 4. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="qpoll 패널 집계: to_dict('records') 루프 vs groupby 집계")
+    parser.add_argument("--panels", type=int, default=20_000, help="파일당 합성 패널 수 (기본: 20,000)")
+    parser.add_argument("--questions", type=int, default=20, help="문항 수 (기본: 20)")
+    args = parser.parse_args()
+
+    # 두 번째 파일은 패널 절반이 겹치도록 (merged 출력 경로 검증)
+    frames = [
+        make_melted_frame(args.panels, args.questions, seed=0),
+        make_melted_frame(args.panels, args.questions, seed=1, panel_offset=args.panels // 2),
+    ]
+    print(f"--- 합성 프레임: {len(frames)}개 파일 x {len(frames[0]):,} 행 ---")
+
+    def run_all(aggregate):
+        all_data_by_panel = {}
+        for frame in frames:
+            aggregate(frame, all_data_by_panel)
+        return list(all_data_by_panel.values())
+
+    expected, records_sec, records_peak = measure(run_all, aggregate_with_records)
+    print(f"  > to_dict 루프  : {records_sec:8.2f}s, peak {records_peak / 2**20:8.1f} MiB")
+    actual, grouped_sec, grouped_peak = measure(run_all, aggregate_by_panel)
+    print(f"  > groupby 집계  : {grouped_sec:8.2f}s, peak {grouped_peak / 2**20:8.1f} MiB  (x{records_sec / max(grouped_sec, 1e-9):.1f})")
+
+    # 실제 변환기와 같은 방식으로 직렬화해 바이트 단위 비교
+    same = (
+        json.dumps(expected, ensure_ascii=False, indent=4).encode('utf-8')
+        == json.dumps(actual, ensure_ascii=False, indent=4).encode('utf-8')
+    )
+    print(f"  > JSON 바이트 일치: {same}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
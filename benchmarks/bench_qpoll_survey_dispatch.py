@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'embedding_preprocessing'))
+
+from sentence_templates import compile_rule
+from qpoll_json_to_text import TOPIC_TEMPLATES_BY_SURVEY, TOPIC_FORMATTERS_BY_SURVEY, survey_responses_by_question
+
+
+# --- 2. 기존 방식 (data_by_question 루프 + 응답마다 질문 부분 문자열 검사) ---
+def per_response_formatter(spec):
+    """
+    Mode B formatter that checks every branch's question_contains for each response, like the
+    per-topic functions did. Branch rules are the same compiled rules, so only the dispatch differs.
+    (The sentences themselves are checked against the old functions by check_qpoll_sentence_templates.py.)
+    """
+    branches = [(branch["question_contains"], compile_rule(branch)) for branch in spec["branches"]]
+
+    def formatter(panel_id, answers, question):
+        for question_part, build in branches:
+            if question_part in question:
+                return build(answers)
+        return None
+
+    return formatter
+
+
+def sentences_by_question_loop(panel_data, formatter):
+    data_by_question = {}
+
+    for panel in panel_data:
+        if not isinstance(panel, dict): continue
+
+        panel_id = panel.get('panel_id', 'UNKNOWN_ID')
+
+        for survey in panel.get('surveys', []):
+            if not isinstance(survey, dict): continue
+
+            question = survey.get('survey_question', 'N/A')
+            if question == 'N/A': continue
+
+            answers = survey.get('survey_answers', [])
+
+            if question not in data_by_question:
+                data_by_question[question] = []
+            data_by_question[question].append((panel_id, answers))
+
+    result = []
+    for question, responses in data_by_question.items():
+        result.append((question, [
+            {"panel_id": panel_id, "original_question": question, "sentence_for_embedding": formatter(panel_id, answers, question)}
+            for panel_id, answers in responses
+        ]))
+    return result
+
+
+# --- 3. 질문별 규칙 테이블 + explode ---
+def sentences_by_question_dispatch(panel_data, formatter):
+    result = []
+    for question, panel_ids, answers_list in survey_responses_by_question(panel_data):
+        build = formatter.resolve(question)
+        result.append((question, [
+            {"panel_id": panel_id, "original_question": question, "sentence_for_embedding": build(answers)}
+            for panel_id, answers in zip(panel_ids, answers_list)
+        ]))
+    return result
+
+
+# --- 4. 합성 패널 ---
+def make_panels(spec, panel_count, options, seed=0):
+    """주제의 모든 질문(+ 규칙에 없는 질문)에 응답한 패널 + 예외적인 패널 / 설문"""
+    rng = random.Random(seed)
+    questions = [branch["question_contains"] for branch in spec["branches"]] + ["규칙에 없는 질문입니다"]
+    vocabulary = [f"보기 {i + 1}" for i in range(options)] + ["기타"]
+    for branch in spec["branches"]:
+        vocabulary += list(branch.get("exact", {}))
+    panels = []
+    for i in range(panel_count):
+        surveys = []
+        for question in questions:
+            if rng.random() < 0.1:
+                continue # 응답하지 않은 질문
+            surveys.append({
+                "survey_question": question,
+                "survey_answers": rng.sample(vocabulary, rng.randint(1, 3)),
+            })
+        panels.append({"panel_id": f"p{i:08d}", "surveys": surveys})
+    panels += [
+        None, {"surveys": [{"survey_question": questions[0], "survey_answers": ["보기 1"]}]},
+        {"panel_id": "no-surveys"}, {"panel_id": "junk", "surveys": ["문자열", {"survey_answers": ["보기 1"]}]},
+        {"panel_id": "no-answers", "surveys": [{"survey_question": questions[1]}]},
+    ]
+    return panels
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+# --- 5. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="방식 B (다중 문항) 문장 생성: 응답별 질문 검사 vs 질문별 규칙 테이블")
+    parser.add_argument("--panels", type=int, default=200_000, help="주제당 합성 패널 수 (기본: 200,000)")
+    parser.add_argument("--options", type=int, default=8, help="질문당 보기 수 (기본: 8)")
+    args = parser.parse_args()
+
+    all_same = True
+    for topic, spec in TOPIC_TEMPLATES_BY_SURVEY.items():
+        panels = make_panels(spec, args.panels, args.options)
+        expected, loop_sec = timed(sentences_by_question_loop, panels, per_response_formatter(spec))
+        actual, dispatch_sec = timed(sentences_by_question_dispatch, panels, TOPIC_FORMATTERS_BY_SURVEY[topic])
+        same = expected == actual
+        rows = sum(len(records) for _, records in expected)
+        print(f"  > {topic}: {rows:,} 응답, {len(expected)} 질문 | 기존 {loop_sec:7.3f}s, "
+              f"규칙 테이블 {dispatch_sec:7.3f}s (x{loop_sec / max(dispatch_sec, 1e-9):.1f}) | 결과 일치: {same}")
+        all_same &= same
+
+    if not all_same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'xlsx_to_json_pipeline'))
+
+from common.json_io import iter_records, write_records
+from streaming_join import DEFAULT_CHUNK_SIZE, stream_left_join
+
+
+# --- 2. 측정 대상 ---
+def join_with_lookup(qpoll_path, welcome_path, output_path):
+    """기존 방식: welcome 전체 dict + 결과 전체 리스트를 메모리에 올린 뒤 저장"""
+    with open(qpoll_path, 'r', encoding='utf-8') as f:
+        qpoll_data = [json.loads(line) for line in f]
+    with open(welcome_path, 'r', encoding='utf-8') as f:
+        merged_data = [json.loads(line) for line in f]
+
+    merged_data_lookup = {record['panel_id']: record for record in merged_data if 'panel_id' in record}
+    final_data = []
+    for qpoll_record in qpoll_data:
+        panel_id = qpoll_record.get('panel_id')
+        if panel_id in merged_data_lookup:
+            combined_record = merged_data_lookup[panel_id].copy()
+            combined_record.update(qpoll_record)
+            final_data.append(combined_record)
+        else:
+            final_data.append(qpoll_record)
+    return write_records(output_path, final_data, pretty=False)
+
+
+def join_with_sort_merge(qpoll_path, welcome_path, output_path, chunk_size):
+    """신규 방식: 외부 정렬 + sort-merge left join, 결과는 바로 디스크로"""
+    merged_records = stream_left_join(iter_records(qpoll_path), iter_records(welcome_path), chunk_size=chunk_size)
+    return write_records(output_path, merged_records, pretty=False)
+
+
+# --- 3. 합성 데이터 ---
+def make_inputs(work_dir, panel_count, surveys_per_panel):
+    """panel_id 순서가 섞인 qpoll / welcome NDJSON 파일 (qpoll의 10%는 welcome에 없는 패널)"""
+    order = sorted(range(panel_count), key=lambda i: (i * 7919) % panel_count)
+    welcome_path = os.path.join(work_dir, 'welcome_data.json')
+    qpoll_path = os.path.join(work_dir, 'qpoll_data.json')
+
+    write_records(welcome_path, (
+        {'panel_id': f"w{i:08d}", 'gender': 'F' if i % 2 else 'M', 'birth_year': 1960 + i % 40,
+         'region_major': '서울', 'owned_electronics': ['TV', '냉장고', '세탁기'][: 1 + i % 3]}
+        for i in order if i % 10
+    ), pretty=False)
+    write_records(qpoll_path, (
+        {'panel_id': f"w{i:08d}", 'category': 'A', 'gender': 'F' if i % 2 else 'M',
+         'surveys': [{'survey_question': f"질문 {q}", 'survey_answers': [f"보기 {q}"]} for q in range(surveys_per_panel)]}
+        for i in reversed(order)
+    ), pretty=False)
+    return qpoll_path, welcome_path
+
+
+def run_single(mode, qpoll_path, welcome_path, output_path, chunk_size):
+    """자식 프로세스에서 한 가지 방식만 실행하고, 시간/최대 RSS를 JSON으로 출력한다."""
+    start = time.perf_counter()
+    if mode == 'lookup':
+        count = join_with_lookup(qpoll_path, welcome_path, output_path)
+    else:
+        count = join_with_sort_merge(qpoll_path, welcome_path, output_path, chunk_size)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss: Linux는 KB 단위
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({
+        "mode": mode,
+        "records": count,
+        "wall_time_sec": round(elapsed, 3),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+    }))
+
+
+# --- 4. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="merge_welcome_and_qpoll: dict lookup vs sort-merge streaming join")
+    parser.add_argument("--panels", type=int, default=300_000, help="합성 패널 수 (기본: 300,000)")
+    parser.add_argument("--surveys", type=int, default=5, help="패널당 설문 수 (기본: 5)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="외부 정렬 chunk 크기")
+    parser.add_argument("--single", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(*args.single, args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='bench-join-') as work_dir:
+        print(f"--- 합성 입력 생성: {args.panels:,} 패널 x {args.surveys}개 설문 ---")
+        qpoll_path, welcome_path = make_inputs(work_dir, args.panels, args.surveys)
+
+        outputs = {}
+        for mode in ('lookup', 'sort-merge'):
+            # 최대 RSS가 서로 섞이지 않도록 방식마다 새 프로세스에서 측정
+            outputs[mode] = os.path.join(work_dir, f"final_{mode}.json")
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--chunk-size", str(args.chunk_size),
+                 "--single", mode, qpoll_path, welcome_path, outputs[mode]],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"  > {mode:<10} {result['wall_time_sec']:>8.2f}s  {result['peak_rss_mb']:>9.1f} MB  ({result['records']:,} records)")
+
+        with open(outputs['lookup'], 'rb') as f1, open(outputs['sort-merge'], 'rb') as f2:
+            print(f"  > 출력 바이트 일치: {f1.read() == f2.read()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.json_io import RecordWriter, iter_records, iter_batches, get_codec
+from common.vector_file import VectorWriter, iter_vector_batches, metadata_path_for
+
+BATCH_SIZE = 128 # upload_to_qdrant.py 와 같은 배치 크기
+
+
+# --- 2. 합성 임베딩 ---
+def make_batches(rows, dim, batch_rows=4096, seed=0):
+    """(메타데이터 리스트, float32 벡터) 배치 (qpoll_embedding.py 출력과 같은 필드)"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, batch_rows):
+        count = min(batch_rows, rows - start)
+        metadata = [
+            {"panel_id": f"w{i:08d}", "topic_id": "qpoll_join_250106", "question": "여름철 최애 간식은 무엇인가요?",
+             "sentence": "여름철 최애 간식은 아이스크림이다."}
+            for i in range(start, start + count)
+        ]
+        yield metadata, rng.standard_normal((count, dim), dtype=np.float32)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def write_json(path, rows, dim):
+    # 기존 방식: 벡터까지 JSON 레코드로 기록
+    with RecordWriter(path, indent=None) as writer:
+        for metadata, vectors in make_batches(rows, dim):
+            for record, vector in zip(metadata, vectors):
+                record["vector"] = vector
+                writer.write(record)
+
+
+def write_npy(path, rows, dim):
+    with VectorWriter(path) as writer:
+        for metadata, vectors in make_batches(rows, dim):
+            writer.write_many(metadata, vectors)
+
+
+def read_json(path):
+    # 업로드 단계처럼 배치 단위로 읽어서 벡터를 모은다 (비교용으로 float32 행렬로 만듦)
+    return np.concatenate([np.asarray([item["vector"] for item in batch], dtype=np.float32)
+                           for batch in iter_batches(iter_records(path), BATCH_SIZE)])
+
+
+def read_npy(path):
+    return np.concatenate([np.asarray(vectors) for _, vectors in iter_vector_batches(path, BATCH_SIZE)])
+
+
+# --- 3. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 출력 형식: JSON 벡터 vs float32 .npy + 메타데이터 (크기 / 쓰기 / 읽기)")
+    parser.add_argument("--rows", type=int, default=50_000, help="벡터 수 (기본: 50,000)")
+    parser.add_argument("--dim", type=int, default=1024, help="벡터 차원 (기본: 1024)")
+    args = parser.parse_args()
+
+    expected = np.concatenate([vectors for _, vectors in make_batches(args.rows, args.dim)])
+    print(f"--- {args.rows:,} x {args.dim}d, JSON 코덱: {get_codec().name} ---")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "embeddings.json")
+        npy_path = os.path.join(tmp_dir, "embeddings.npy")
+
+        _, json_write_sec = timed(write_json, json_path, args.rows, args.dim)
+        _, npy_write_sec = timed(write_npy, npy_path, args.rows, args.dim)
+        json_vectors, json_read_sec = timed(read_json, json_path)
+        npy_vectors, npy_read_sec = timed(read_npy, npy_path)
+
+        json_mb = os.path.getsize(json_path) / 1024 / 1024
+        npy_mb = (os.path.getsize(npy_path) + os.path.getsize(metadata_path_for(npy_path))) / 1024 / 1024
+        print(f"  > JSON          : 쓰기 {json_write_sec:7.2f}s, 읽기 {json_read_sec:7.2f}s, {json_mb:9.1f} MB")
+        print(f"  > npy + 메타데이터: 쓰기 {npy_write_sec:7.2f}s, 읽기 {npy_read_sec:7.2f}s, {npy_mb:9.1f} MB "
+              f"(쓰기 x{json_write_sec / max(npy_write_sec, 1e-9):.1f}, 읽기 x{json_read_sec / max(npy_read_sec, 1e-9):.1f})")
+
+        same = np.array_equal(json_vectors, expected) and np.array_equal(npy_vectors, expected)
+        metadata_same = all(
+            {key: value for key, value in a.items() if key != "vector"} == b
+            for a, b in zip(iter_records(json_path), iter_records(metadata_path_for(npy_path)))
+        )
+        print(f"  > 벡터 일치: {same}, 메타데이터 일치: {metadata_same}")
+
+    if not (same and metadata_same):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
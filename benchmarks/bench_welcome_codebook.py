@@ -0,0 +1,174 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'xlsx_to_json_pipeline'))
+
+from convert_welcome_to_json import parse_label_sheet, apply_value_labels
+
+
+# --- 2. 기존 방식 (행 단위 순회 + 컬럼별 replace) ---
+def parse_label_sheet_loop(df_label):
+    qcode_to_question = {}
+    value_labels = {}
+    current_q_code = None
+
+    for row in df_label.itertuples(index=False, name=None):
+        col_a, col_b = row[0], row[1]
+
+        if pd.isna(col_a) and pd.isna(col_b):
+            current_q_code = None
+            continue
+
+        is_q_code = isinstance(col_a, str) and not col_a.isnumeric()
+
+        if is_q_code and pd.notna(col_b):
+            current_q_code = col_a
+            qcode_to_question[current_q_code] = col_b
+            value_labels[current_q_code] = {}
+        elif current_q_code and pd.notna(col_a) and pd.notna(col_b):
+            try:
+                value = float(col_a)
+                if value.is_integer():
+                    value = int(value)
+                value_labels[current_q_code][value] = col_b
+            except (ValueError, TypeError):
+                continue
+
+    return qcode_to_question, value_labels
+
+
+def apply_value_labels_replace(df_data, value_labels):
+    for col in df_data.columns:
+        if col in value_labels:
+            df_data[col] = df_data[col].replace(value_labels[col])
+    return df_data
+
+
+# --- 3. 합성 데이터 ---
+def make_label_sheet(question_count, options_per_question, seed=0):
+    """Welcome 라벨 시트와 같은 모양: Q-code 행 + (코드, 응답) 행 + 빈 행, 예외적인 행 포함"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for q in range(question_count):
+        q_code = f"Q{q + 1}"
+        rows.append((q_code, f"문항 {q + 1}"))
+        for code in range(1, options_per_question + 1):
+            # 코드 셀은 숫자 / 숫자 문자열 / 실수가 섞여 있음
+            cell = [code, str(code), float(code)][int(rng.integers(0, 3))]
+            rows.append((cell, f"{q_code} 보기 {code}"))
+        if q % 7 == 0:
+            rows.append((1.5, "소수 코드"))
+            rows.append(("기타", "숫자가 아닌 코드"))
+            rows.append((options_per_question + 1, None))
+            rows.append((None, "A열이 빈 행"))
+            rows.append((2, f"{q_code} 보기 2 (중복 코드)"))
+        if q % 11 == 0:
+            rows.append((f"Q{q + 1}", None)) # 문항 텍스트 없는 Q-code 행
+            rows.append((True, "bool 코드"))
+        if q % 13 == 5:
+            rows.append((f"Q{q}", f"문항 {q} (재정의)")) # 앞선 Q-code 재정의
+            rows.append((9, "재정의 이후 보기"))
+        if q % 17 == 3:
+            rows.append(("", "빈 문자열 Q-code"))
+            rows.append((1, "무시되는 보기"))
+        if q % 3 != 0:
+            rows.append((None, None))
+    return pd.DataFrame(rows, columns=['A', 'B'], dtype=object)
+
+
+def make_data_sheet(question_count, options_per_question, panel_count, seed=0):
+    """Q-code 컬럼별로 정수 / 결측 포함 실수 / 혼합 object / 문자열 / bool 컬럼을 섞은 데이터 시트"""
+    rng = np.random.default_rng(seed)
+    data = {'panel_id': [f"w{i:08d}" for i in range(panel_count)]}
+    for q in range(question_count):
+        codes = rng.integers(1, options_per_question + 3, panel_count)
+        kind = q % 5
+        if kind == 0:
+            column = codes
+        elif kind == 1:
+            column = np.where(rng.random(panel_count) < 0.1, np.nan, codes.astype(float))
+        elif kind == 2:
+            column = pd.Series(codes, dtype=object)
+            column[rng.random(panel_count) < 0.05] = "직접 입력"
+            column[rng.random(panel_count) < 0.05] = None
+        elif kind == 3:
+            column = codes.astype(str)
+        else:
+            column = codes % 2 == 0
+        data[f"Q{q + 1}"] = column
+    return pd.DataFrame(data)
+
+
+def describe(value):
+    """타입까지 비교하기 위한 표현 (1 과 1.0, 'a' 구분)"""
+    if isinstance(value, dict):
+        return [(describe(k), describe(v)) for k, v in value.items()]
+    return (type(value).__name__, repr(value))
+
+
+def frames_equal(expected, actual):
+    if list(expected.columns) != list(actual.columns):
+        return False
+    for col in expected.columns:
+        if expected[col].dtype != actual[col].dtype:
+            return False
+        if [describe(v) for v in expected[col].tolist()] != [describe(v) for v in actual[col].tolist()]:
+            return False
+    return True
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+# --- 4. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="Welcome 코드북 파싱/라벨 치환: 행 순회 + replace vs 벡터화")
+    parser.add_argument("--questions", type=int, default=2_000, help="Q-code 수 (기본: 2,000)")
+    parser.add_argument("--options", type=int, default=30, help="문항당 보기 수 (기본: 30)")
+    parser.add_argument("--panels", type=int, default=50_000, help="데이터 시트 패널 수 (기본: 50,000)")
+    parser.add_argument("--label-xlsx", help="실제 Welcome 워크북으로도 파싱 결과 일치 확인 (두 번째 시트)")
+    args = parser.parse_args()
+
+    df_label = make_label_sheet(args.questions, args.options)
+    print(f"--- 합성 라벨 시트: {len(df_label):,} 행 ---")
+    expected, loop_sec = timed(parse_label_sheet_loop, df_label)
+    actual, vector_sec = timed(parse_label_sheet, df_label)
+    parse_same = describe(expected[0]) == describe(actual[0]) and describe(expected[1]) == describe(actual[1])
+    print(f"  > 행 순회  : {loop_sec:8.3f}s")
+    print(f"  > 벡터화   : {vector_sec:8.3f}s  (x{loop_sec / max(vector_sec, 1e-9):.1f}), 결과 일치: {parse_same}")
+
+    value_labels = expected[1]
+    column_count = min(args.questions, 200)
+    df_data = make_data_sheet(column_count, args.options, args.panels)
+    print(f"--- 합성 데이터 시트: {len(df_data):,} 행 x {column_count} 코드 컬럼 ---")
+    replaced, replace_sec = timed(apply_value_labels_replace, df_data.copy(), value_labels)
+    mapped, mapped_sec = timed(apply_value_labels, df_data.copy(), value_labels)
+    map_same = frames_equal(replaced, mapped)
+    print(f"  > 컬럼별 replace : {replace_sec:8.3f}s")
+    print(f"  > factorize 매핑 : {mapped_sec:8.3f}s  (x{replace_sec / max(mapped_sec, 1e-9):.1f}), 결과 일치: {map_same}")
+
+    same = parse_same and map_same
+    if args.label_xlsx:
+        from xlsx_stream_reader import read_sheet
+        df_real = read_sheet(args.label_xlsx, 1)
+        real_same = describe(parse_label_sheet_loop(df_real)) == describe(parse_label_sheet(df_real))
+        print(f"  > {os.path.basename(args.label_xlsx)} 라벨 시트 결과 일치: {real_same}")
+        same = same and real_same
+
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'embedding_preprocessing'))
+
+from common.json_io import read_records, write_records, write_document
+from welcome_json_to_text import (
+    CATEGORIES, CATEGORY_FORMATTERS, clean_filename, compile_category_formatters,
+    generate_category_sentences, iter_panels, write_category_sentence_files
+)
+
+
+# --- 2. 기존 방식 (카테고리마다 전체 패널 순회 + 기본 템플릿 해석) ---
+def format_default_category_loop(panel, key_list):
+    parts = []
+    for key in key_list:
+        value = panel.get(key)
+
+        if value is None:
+            continue
+
+        if isinstance(value, list):
+            if not value: continue
+            filtered = [str(v) for v in value if v not in ["기타", "없음"]]
+            if filtered:
+                parts.append(f"{key}: {', '.join(filtered)}")
+        else:
+            value_str = str(value)
+            if value_str not in ["기타", "없음"]:
+                parts.append(f"{key}: {value_str}")
+
+    if not parts:
+        return None
+
+    return ". ".join(parts) + "."
+
+
+def generate_by_category_loop(panel_data):
+    """{category_name: [record, ...]} (기존 main()의 카테고리별 순회)"""
+    result = {}
+    for category_name, key_list in CATEGORIES.items():
+        formatter = CATEGORY_FORMATTERS.get(category_name)
+        generated_data = []
+        for panel in panel_data:
+            if not isinstance(panel, dict): continue
+
+            panel_id = panel.get('panel_id')
+            if not panel_id: continue
+
+            if formatter:
+                sentence = formatter(panel)
+            else:
+                sentence = format_default_category_loop(panel, key_list)
+
+            generated_data.append({
+                "panel_id": panel_id,
+                "sentence_for_embedding": sentence
+            })
+        result[category_name] = generated_data
+    return result
+
+
+def write_files_loop(input_path, output_dir):
+    """기존 main(): 전체 패널 리스트 로드 -> 카테고리별 리스트 -> 파일 저장"""
+    for category_name, generated_data in generate_by_category_loop(read_records(input_path)).items():
+        output_path = os.path.join(output_dir, f"{clean_filename(category_name)}.json")
+        write_document(output_path, {"topic_category": category_name}, "generated_data", generated_data)
+
+
+# --- 3. 단일 순회 ---
+def generate_by_category_single_pass(panel_data):
+    category_formatters = compile_category_formatters()
+    result = {category_name: [] for category_name, _ in category_formatters}
+    generate_category_sentences(
+        panel_data, [(formatter, result[category_name].append) for category_name, formatter in category_formatters]
+    )
+    return result
+
+
+def write_files_single_pass(input_path, output_dir):
+    write_category_sentence_files(iter_panels(input_path), output_dir)
+
+
+# --- 4. 합성 패널 ---
+SAMPLE_VALUES = ["남성", "여성", "기타", "없음", "서울", "경기", "", 0, 1, 2.0, 1990, True, False, None]
+
+
+def iter_synthetic_panels(panel_count, seed=0):
+    """CATEGORIES의 모든 key를 가진 패널 + 예외적인 값 (빈 리스트 / '기타'·'없음' / 숫자 / 빠진 key / 잘못된 패널)"""
+    rng = random.Random(seed)
+    keys = [key for key_list in CATEGORIES.values() for key in key_list]
+    for i in range(panel_count):
+        panel = {"panel_id": f"w{i:08d}"}
+        for key in keys:
+            roll = rng.random()
+            if roll < 0.15:
+                continue # key 없음
+            if roll < 0.35:
+                panel[key] = [rng.choice(SAMPLE_VALUES) for _ in range(rng.randint(0, 4))]
+            else:
+                panel[key] = rng.choice(SAMPLE_VALUES)
+        yield panel
+    yield from [None, "not a panel", {"panel_id": ""}, {"gender": "남성"}]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+MODES = {"loop": write_files_loop, "single": write_files_single_pass}
+
+
+def run_mode_in_child(mode, input_path, output_dir):
+    """파일 입출력 포함 전체 단계를 자식 프로세스로 실행하고 (wall time 초, 최대 RSS MB)를 반환"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--run", mode, input_path, output_dir],
+        stdout=subprocess.DEVNULL
+    )
+    # wait4: 해당 자식 프로세스만의 자원 사용량 (ru_maxrss: Linux는 KB 단위)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"{mode} 실행 실패")
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def same_files(dir_a, dir_b):
+    names = sorted(os.listdir(dir_a))
+    if names != sorted(os.listdir(dir_b)):
+        return False
+    for name in names:
+        with open(os.path.join(dir_a, name), 'rb') as fa, open(os.path.join(dir_b, name), 'rb') as fb:
+            if fa.read() != fb.read():
+                return False
+    return True
+
+
+# --- 5. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="Welcome 카테고리 문장 생성: 카테고리별 순회 vs 단일 순회")
+    parser.add_argument("--panels", type=int, default=200_000, help="합성 패널 수 (기본: 200,000)")
+    parser.add_argument("--run", nargs=3, metavar=("MODE", "INPUT", "OUTPUT_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        mode, input_path, output_dir = args.run
+        MODES[mode](input_path, output_dir)
+        return
+
+    # 파일 읽기 / 쓰기까지 포함한 단계 전체 (PIPELINE_JSON_FORMAT 설정을 따름)
+    # 자식 프로세스의 최대 RSS에 이 프로세스의 메모리가 섞이지 않도록, 패널 리스트를 만들기 전에 먼저 측정
+    print(f"--- 단계 전체: 합성 패널 {args.panels:,}명 (welcome_data.json 읽기 -> 카테고리 파일 쓰기) ---")
+    work_dir = tempfile.mkdtemp(prefix="welcome-sentences-")
+    try:
+        input_path = os.path.join(work_dir, "welcome_data.json")
+        write_records(input_path, iter_synthetic_panels(args.panels))
+        output_dirs = {}
+        for mode, label in (("loop", "카테고리별 순회"), ("single", "단일 순회")):
+            output_dirs[mode] = os.path.join(work_dir, mode)
+            os.makedirs(output_dirs[mode])
+            elapsed, peak_rss_mb = run_mode_in_child(mode, input_path, output_dirs[mode])
+            print(f"  > {label:<10}: {elapsed:8.3f}s, 최대 RSS {peak_rss_mb:8.1f} MB")
+        files_same = same_files(output_dirs["loop"], output_dirs["single"])
+        print(f"  > 출력 파일 일치: {files_same}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    panels = list(iter_synthetic_panels(args.panels))
+    print(f"--- 메모리 내 문장 생성: {len(CATEGORIES)}개 카테고리 ---")
+    expected, loop_sec = timed(generate_by_category_loop, panels)
+    actual, single_sec = timed(generate_by_category_single_pass, panels)
+    same = expected == actual and list(expected) == list(actual)
+    print(f"  > 카테고리별 순회: {loop_sec:8.3f}s")
+    print(f"  > 단일 순회     : {single_sec:8.3f}s  (x{loop_sec / max(single_sec, 1e-9):.1f}), 결과 일치: {same}")
+
+    if not (same and files_same):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
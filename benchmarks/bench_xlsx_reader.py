@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+import pandas as pd
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+PIPELINE_DIR = os.path.join(PROJECT_ROOT, 'xlsx_to_json_pipeline')
+sys.path.insert(0, PIPELINE_DIR)
+
+from xlsx_stream_reader import DEFAULT_ENGINE, read_sheet
+
+DEFAULT_INPUT = os.path.join(PIPELINE_DIR, 'data/Welcome/Welcome_1st.xlsx')
+
+
+# --- 2. 측정 대상 ---
+def read_with_excelfile(path, sheet_index, header):
+    """기존 방식: pd.ExcelFile(...).parse(...)"""
+    xlsx = pd.ExcelFile(path)
+    return xlsx.parse(xlsx.sheet_names[sheet_index], header=header)
+
+
+def read_with_stream(path, sheet_index, header, engine=None):
+    """신규 방식: 청크 단위 read-only 스트리밍 리더"""
+    return read_sheet(path, sheet_index, header=header, engine=engine)
+
+
+def run_single(mode, path, sheet_index, header):
+    """자식 프로세스에서 한 가지 방식만 실행하고, 시간/최대 RSS를 JSON으로 출력한다."""
+    start = time.perf_counter()
+    if mode == 'excelfile':
+        df = read_with_excelfile(path, sheet_index, header)
+    else:
+        df = read_with_stream(path, sheet_index, header, engine=mode.split(':', 1)[1])
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss: Linux는 KB 단위
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({
+        "mode": mode,
+        "rows": len(df),
+        "columns": len(df.columns),
+        "wall_time_sec": round(elapsed, 3),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+    }))
+
+
+# --- 3. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="Excel 읽기 방식별 실행 시간 / 최대 RSS 비교")
+    parser.add_argument("path", nargs="?", default=DEFAULT_INPUT, help="측정할 xlsx 파일")
+    parser.add_argument("--sheet", type=int, default=0, help="시트 인덱스 (기본: 0, 데이터 시트)")
+    parser.add_argument("--header", type=int, default=0, help="헤더 행 (qpoll 데이터 시트는 1)")
+    parser.add_argument("--check", action="store_true", help="두 방식의 결과 DataFrame이 같은지 확인")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.single, args.path, args.sheet, args.header)
+        return
+
+    if not os.path.exists(args.path):
+        print(f"오류: 입력 파일 '{args.path}'을(를) 찾을 수 없습니다.")
+        return
+
+    modes = ['excelfile', 'stream:openpyxl']
+    if DEFAULT_ENGINE == 'calamine':
+        modes.append('stream:calamine')
+
+    print(f"--- 측정 파일: {args.path} (sheet {args.sheet}, header {args.header}) ---")
+    results = []
+    for mode in modes:
+        # 최대 RSS가 서로 섞이지 않도록 방식마다 새 프로세스에서 측정
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), args.path,
+             "--sheet", str(args.sheet), "--header", str(args.header), "--single", mode],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print(f"  > {mode:<16} {result['wall_time_sec']:>8.2f}s  {result['peak_rss_mb']:>9.1f} MB  "
+              f"({result['rows']} rows x {result['columns']} cols)")
+
+    base = results[0]
+    for result in results[1:]:
+        print(f"  > {result['mode']}: 속도 x{base['wall_time_sec'] / max(result['wall_time_sec'], 1e-9):.2f}, "
+              f"최대 RSS {result['peak_rss_mb'] - base['peak_rss_mb']:+.1f} MB")
+
+    if args.check:
+        expected = read_with_excelfile(args.path, args.sheet, args.header)
+        for mode in modes[1:]:
+            actual = read_with_stream(args.path, args.sheet, args.header, engine=mode.split(':', 1)[1])
+            print(f"  > {mode} 결과 일치: {expected.equals(actual)}")
+
+
+if __name__ == '__main__':
+    main()
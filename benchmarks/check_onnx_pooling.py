@@ -0,0 +1,118 @@
+import os
+import sys
+
+import numpy as np
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'embedding'))
+
+from onnx_encoder import OnnxEncoder, POOLING_MODES
+
+# OnnxEncoder.encode_batch / encode 의 풀링 / 정규화 / 출력 순서 확인 (onnxruntime / transformers / 모델 파일 없이)
+# - 토크나이저 스텁: 글자 하나 = 토큰 하나 (id = 코드포인트), 배치 안의 가장 긴 문장까지 0으로 padding
+# - 세션 스텁: last_hidden_state[b, t, d] 를 토큰 id / 위치 / 차원으로 정해진 값으로 돌려준다
+#   (padding 위치에도 0이 아닌 값이 들어가므로, mask를 무시한 mean 풀링은 결과가 달라진다)
+HIDDEN_DIM = 8
+MAX_SEQ_LENGTH = 12
+
+SENTENCES = [
+    "전통시장을 전혀 방문하지 않는다.",
+    "운동",
+    "최근 사용한 서비스와 제품은 유튜브, 넷플릭스, 쿠팡 입니다.", # MAX_SEQ_LENGTH 보다 길어서 잘림
+    "반려동물을 키워본 적이 없다.",
+    "토스",
+    "여름철 최애 간식은 아이스크림이다.",
+    "a",
+]
+
+
+class StubTokenizer:
+    def __call__(self, sentences, padding, truncation, max_length, return_tensors):
+        assert padding is True and truncation is True and return_tensors == "np"
+        ids = [[ord(char) for char in sentence][:max_length] for sentence in sentences]
+        width = max(len(row) for row in ids)
+        input_ids = np.zeros((len(ids), width), dtype=np.int32)
+        attention_mask = np.zeros((len(ids), width), dtype=np.int32)
+        for i, row in enumerate(ids):
+            input_ids[i, :len(row)] = row
+            attention_mask[i, :len(row)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+def hidden_state(input_ids):
+    """(batch, sequence) token ids -> (batch, sequence, HIDDEN_DIM) float32, fixed per (id, position, dim)."""
+    positions = np.arange(input_ids.shape[1])[None, :, None]
+    dims = np.arange(HIDDEN_DIM)[None, None, :]
+    return (np.sin(input_ids[:, :, None] * 0.001 * (dims + 1)) + 0.1 * positions - 0.05 * dims).astype(np.float32)
+
+
+class StubSession:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def run(self, output_names, inputs):
+        assert output_names == ["last_hidden_state"]
+        assert inputs["input_ids"].dtype == np.int64 and inputs["attention_mask"].dtype == np.int64
+        self.batch_sizes.append(len(inputs["input_ids"]))
+        return [hidden_state(inputs["input_ids"])]
+
+
+def make_encoder(pooling, normalize):
+    # __init__ 은 onnxruntime / 모델 파일을 읽으므로 건너뛰고 encode_batch 가 쓰는 속성만 채운다
+    encoder = object.__new__(OnnxEncoder)
+    encoder.pooling = pooling
+    encoder.normalize = normalize
+    encoder.max_seq_length = MAX_SEQ_LENGTH
+    encoder.tokenizer = StubTokenizer()
+    encoder.session = StubSession()
+    return encoder
+
+
+def expected_vector(sentence, pooling, normalize):
+    """Pooling of one sentence on its own (no padding), computed directly from hidden_state."""
+    ids = np.array([[ord(char) for char in sentence][:MAX_SEQ_LENGTH]])
+    hidden = hidden_state(ids)[0].astype(np.float64)
+    vector = hidden[0] if pooling == "cls" else hidden.mean(axis=0)
+    if normalize:
+        vector = vector / np.linalg.norm(vector)
+    return vector
+
+
+# --- 2. 메인 실행 로직 ---
+def main():
+    all_same = True
+    for pooling in POOLING_MODES:
+        for normalize in (False, True):
+            expected = np.array([expected_vector(sentence, pooling, normalize) for sentence in SENTENCES])
+
+            encoder = make_encoder(pooling, normalize)
+            batch = encoder.encode_batch(SENTENCES)
+            batch_error = float(np.abs(batch - expected).max())
+
+            encoder = make_encoder(pooling, normalize)
+            encoded = encoder.encode(SENTENCES, batch_size=3)
+            encode_error = float(np.abs(encoded - expected).max())
+
+            norms = np.linalg.norm(encoded, axis=1)
+            norms_ok = bool(np.allclose(norms, 1.0, atol=1e-5)) if normalize else not np.allclose(norms, 1.0)
+            same = (batch.dtype == np.float32 and encoded.dtype == np.float32
+                    and batch_error < 1e-5 and encode_error < 1e-5 and norms_ok
+                    and encoder.session.batch_sizes == [3, 3, 1])
+            print(f"  > pooling={pooling:4s} normalize={normalize!s:5s}: encode_batch 최대 오차 {batch_error:.1e}, "
+                  f"encode(batch_size=3) 최대 오차 {encode_error:.1e}, 배치 {encoder.session.batch_sizes}, "
+                  f"norm {norms.min():.3f}~{norms.max():.3f} | 일치: {same}")
+            all_same &= same
+
+    empty = make_encoder("cls", True).encode([])
+    print(f"  > 빈 입력: shape {empty.shape}")
+    all_same &= empty.shape == (0, 0)
+
+    print(f"\n결과 일치: {all_same}")
+    if not all_same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
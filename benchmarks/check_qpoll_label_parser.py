@@ -0,0 +1,168 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'xlsx_to_json_pipeline'))
+
+from qpoll_long_table import INPUT_FILES, parse_qpoll_label_sheet
+from xlsx_stream_reader import read_sheet
+
+
+# --- 2. 기존 방식 (행 단위 iloc 순회) ---
+def parse_qpoll_label_sheet_loop(df_labels):
+    label_data_in_order = []
+    row_index = 0
+
+    while row_index < len(df_labels):
+        id_row_value = df_labels.iloc[row_index, 0]
+        if pd.isna(id_row_value):
+            break
+        if id_row_value.strip() != "설문제목":
+            row_index += 1
+            continue
+
+        id_row_data_series = df_labels.iloc[row_index, 1:]
+
+        stop_col_pos = None
+        for i, item in enumerate(id_row_data_series):
+            if pd.notna(item) and str(item).strip() == '총참여자수':
+                stop_col_pos = i
+                break
+
+        if stop_col_pos is not None:
+            ids = id_row_data_series.iloc[:stop_col_pos].values
+        else:
+            ids = id_row_data_series.values
+
+        row_index += 1
+        if row_index >= len(df_labels):
+            break
+
+        question_text = df_labels.iloc[row_index, 0]
+        if pd.isna(question_text):
+            question_text = ""
+        question_text = question_text.strip()
+
+        label_row_data_series = df_labels.iloc[row_index, 1:]
+
+        if stop_col_pos is not None:
+            labels = label_row_data_series.iloc[:stop_col_pos].values
+        else:
+            labels = label_row_data_series.values
+
+        value_label_map = {
+            str(id_).strip(): label
+            for id_, label in zip(ids, labels)
+            if pd.notna(id_) and pd.notna(label)
+        }
+
+        label_data_in_order.append({
+            "text": question_text,
+            "map": value_label_map
+        })
+        row_index += 1
+
+    return label_data_in_order
+
+
+# --- 3. 합성 라벨 시트 ---
+def make_label_sheet(question_count, option_count, seed=0):
+    """qpoll 라벨 시트와 같은 모양(header=None): 블록마다 '설문제목' ids 행 + 질문/라벨 행, 예외적인 블록 포함"""
+    rng = np.random.default_rng(seed)
+    width = option_count + 3
+    rows = [["퀵폴 결과"] + [None] * (width - 1)]
+    for q in range(question_count):
+        chosen = int(rng.integers(2, option_count + 1))
+        ids = [f" 보기{i + 1} " for i in range(chosen)] + ['총참여자수'] + [None] * (width - chosen - 2)
+        labels = [f"응답 {i + 1}" for i in range(chosen)] + [int(rng.integers(100, 1000))] + [None] * (width - chosen - 2)
+        if q % 5 == 0:
+            ids[0], labels[1] = None, None # 빈 id / 빈 라벨
+        if q % 7 == 0:
+            ids = ids[:chosen] + [None] * (width - chosen - 1) # '총참여자수' 없는 블록
+        if q % 11 == 0:
+            ids[1] = ids[0] # 중복 id
+        if q % 9 == 0:
+            ids[2 % chosen] = 3 # 숫자 id
+        rows.append(["설문제목 "] + ids)
+        rows.append([f"  질문 {q + 1}  " if q % 13 else None] + labels)
+        if q % 4 == 0:
+            rows.append(["메모"] + [None] * (width - 1))
+    return pd.DataFrame(rows, dtype=object)
+
+
+def describe(value):
+    """타입까지 비교하기 위한 표현"""
+    if isinstance(value, dict):
+        return [(describe(k), describe(v)) for k, v in value.items()]
+    if isinstance(value, list):
+        return [describe(v) for v in value]
+    return (type(value).__name__, repr(value))
+
+
+def run_parser(parse, df_labels):
+    """(결과, 걸린 시간); 예외가 나면 결과 대신 예외"""
+    start = time.perf_counter()
+    try:
+        result = parse(df_labels)
+    except Exception as e:
+        result = e
+    return result, time.perf_counter() - start
+
+
+def compare(name, df_labels):
+    expected, loop_sec = run_parser(parse_qpoll_label_sheet_loop, df_labels)
+    actual, block_sec = run_parser(parse_qpoll_label_sheet, df_labels)
+
+    if isinstance(expected, Exception):
+        # A열의 문자열이 아닌 값: 기존 방식은 .strip()에서 AttributeError, 새 파서는 ValueError
+        same = isinstance(expected, AttributeError) and isinstance(actual, ValueError)
+        print(f"  > {name}: 기존 {type(expected).__name__} / 새 파서 {type(actual).__name__}: {actual} | 일치: {same}")
+        return same
+    same = describe(expected) == describe(actual)
+    print(f"  > {name}: {len(df_labels):,} 행, {len(expected):,} 블록 | iloc 순회 {loop_sec:7.3f}s, "
+          f"블록 인덱스 {block_sec:7.3f}s (x{loop_sec / max(block_sec, 1e-9):.1f}) | 결과 일치: {same}")
+    return same
+
+
+# --- 4. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="qpoll 라벨 시트 파서: 기존 iloc 순회와 결과 / 속도 비교")
+    parser.add_argument("paths", nargs='*', help="비교할 qpoll 워크북 (기본: data/Quickpoll/qpoll*.xlsx 전체)")
+    parser.add_argument("--questions", type=int, default=2_000, help="합성 라벨 시트 문항 수 (기본: 2,000)")
+    parser.add_argument("--options", type=int, default=12, help="합성 라벨 시트 최대 보기 수 (기본: 12)")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(INPUT_FILES)
+    if not paths:
+        print("비교할 qpoll 워크북이 없어 합성 라벨 시트만 비교합니다.")
+
+    all_same = True
+    for path in paths:
+        all_same &= compare(os.path.basename(path), read_sheet(path, 1, header=None))
+
+    synthetic = make_label_sheet(args.questions, args.options)
+    all_same &= compare("합성 라벨 시트", synthetic)
+    # 빈 A열 셀에서 멈추는 경우 / 마지막 블록의 라벨 행이 없는 경우
+    middle = int(np.flatnonzero(synthetic[0] == "설문제목 ")[len(synthetic) // 4])
+    blank_row = pd.DataFrame([[None] * synthetic.shape[1]], dtype=object)
+    all_same &= compare("합성 (중간 빈 행)", pd.concat([synthetic.iloc[:middle], blank_row, synthetic.iloc[middle:]], ignore_index=True))
+    all_same &= compare("합성 (라벨 행 없음)", synthetic.iloc[:-1] if synthetic.iat[-1, 0] != "메모" else synthetic.iloc[:-2])
+    # A열에 문자열이 아닌 값 (블록 사이 / 질문 텍스트 자리)
+    for label, row in [("블록 사이 숫자", middle), ("질문 자리 숫자", middle + 1)]:
+        broken = synthetic.copy()
+        broken.iat[row, 0] = 2024
+        all_same &= compare(f"합성 ({label})", broken)
+
+    if not all_same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
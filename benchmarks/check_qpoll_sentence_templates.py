@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'embedding_preprocessing'))
+
+from qpoll_json_to_text import TOPIC_FORMATTERS_BY_PANEL, TOPIC_FORMATTERS_BY_SURVEY, survey_responses_by_question
+
+# 템플릿으로 바뀌기 전의 주제별 함수가 만든 (입력 -> 문장) 고정 결과
+# - by_panel : {주제: [[답변 리스트, 결과], ...]}
+# - by_survey: {주제: [[질문, 답변 리스트, 결과], ...]}
+# 결과는 ["ok", 문장 또는 null] / ["error", 예외 이름]
+EXPECTED_FILE = os.path.join(SCRIPT_DIR, 'qpoll_sentence_expected.json')
+
+
+# --- 2. 비교 ---
+def outcome(func, args):
+    try:
+        return ["ok", func(*args)]
+    except Exception as e:
+        return ["error", type(e).__name__]
+
+
+def panel_cases(entries):
+    """방식 A: 고정 결과의 답변 리스트마다 (패널, 기대 결과) - 두 번째 설문은 무시되고, 설문이 없으면 빈 리스트"""
+    cases = []
+    for answers, expected in entries:
+        cases.append((({"panel_id": "p", "surveys": [{"survey_question": "질문", "survey_answers": answers}]},), expected))
+        cases.append((({"panel_id": "p", "surveys": [{"survey_answers": answers}, {"survey_answers": ["응답 C"]}]},), expected))
+        if answers == []:
+            for panel in ({}, {"surveys": []}, {"surveys": [{}]}, {"surveys": [{"survey_question": "질문"}]}):
+                cases.append(((panel,), expected))
+    return cases
+
+
+def survey_cases(entries):
+    return [(("p", answers, question), expected) for question, answers, expected in entries]
+
+
+def survey_sentence(formatter):
+    """방식 B: qpoll_json_to_text 와 같은 경로 (응답을 질문별로 묶으면서 답변 검사 -> 질문의 규칙 적용)"""
+    def run(panel_id, answers, question):
+        panel = {"panel_id": panel_id, "surveys": [{"survey_question": question, "survey_answers": answers}]}
+        ((_, _, [decoded_answers]),) = survey_responses_by_question([panel])
+        return formatter.resolve(question)(decoded_answers)
+    return run
+
+
+def compare(topic, formatter, cases, repeat, run=None):
+    actual = [outcome(run or formatter, args) for args, _ in cases]
+    mismatches = [(args, expected, a) for (args, expected), a in zip(cases, actual) if expected != a]
+
+    # 예외가 나지 않는 입력만 반복해서 시간 측정 (같은 답변 조합이 반복되는 실제 파일처럼 캐시 적중 포함)
+    timed_inputs = [args for args, expected in cases if expected[0] == "ok"] * repeat
+    start = time.perf_counter()
+    for args in timed_inputs:
+        formatter(*args)
+    elapsed = time.perf_counter() - start
+
+    print(f"  > {topic}: {len(cases):,} 입력, 템플릿 {elapsed:7.3f}s | 불일치 {len(mismatches)}")
+    for args, expected, a in mismatches[:3]:
+        print(f"      입력 {args!r}\n      기대 {expected!r}\n      템플릿 {a!r}")
+    return not mismatches
+
+
+# --- 3. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="qpoll 문장 템플릿: 기존 주제별 함수의 고정 결과(qpoll_sentence_expected.json)와 비교")
+    parser.add_argument("--expected", default=EXPECTED_FILE, help="고정 결과 파일 (기본: benchmarks/qpoll_sentence_expected.json)")
+    parser.add_argument("--repeat", type=int, default=200, help="시간 측정 시 입력 반복 횟수 (기본: 200)")
+    args = parser.parse_args()
+
+    with open(args.expected, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    print(f"--- 기준: {expected['generated_from']} ---")
+
+    all_same = True
+    missing = (set(expected["by_panel"]) ^ set(TOPIC_FORMATTERS_BY_PANEL)) | \
+              (set(expected["by_survey"]) ^ set(TOPIC_FORMATTERS_BY_SURVEY))
+    if missing:
+        print(f"  > 주제 목록 불일치: {sorted(missing)}")
+        all_same = False
+
+    print("--- 방식 A (패널 단위) ---")
+    for topic, entries in expected["by_panel"].items():
+        if topic in TOPIC_FORMATTERS_BY_PANEL:
+            all_same &= compare(topic, TOPIC_FORMATTERS_BY_PANEL[topic], panel_cases(entries), args.repeat)
+
+    print("--- 방식 B (답변 단위) ---")
+    for topic, entries in expected["by_survey"].items():
+        if topic in TOPIC_FORMATTERS_BY_SURVEY:
+            formatter = TOPIC_FORMATTERS_BY_SURVEY[topic]
+            all_same &= compare(topic, formatter, survey_cases(entries), args.repeat, survey_sentence(formatter))
+
+    print(f"\n결과 일치: {all_same}")
+    if not all_same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'embedding'))
+
+from onnx_encoder import MODEL_ID, DEFAULT_ONNX_DIR, ONNX_FILES, load_encoder_model
+from sentence_encoder import length_sorted_encoder
+from bench_embedding_batching import load_sentences, token_lengths
+
+# 검색 일치도 확인용 질의 (패널 검색에서 실제로 쓰는 형태)
+SAMPLE_QUERIES = [
+    "전통시장을 자주 방문하는 사람",
+    "반려동물을 키우는 30대",
+    "운동을 혼자 하는 편이다",
+    "배달 앱을 자주 사용한다",
+    "전기차 구매를 고려하는 사람",
+    "OTT 서비스를 여러 개 구독한다",
+    "여름에 해외여행을 가는 사람",
+    "스마트워치를 사용하는 직장인",
+]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def normalize(vectors):
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+def top_k_overlap(corpus_a, queries_a, corpus_b, queries_b, k):
+    """Mean |top-k(a) ∩ top-k(b)| / k over the queries (cosine similarity)."""
+    top_a = np.argsort(-normalize(queries_a) @ normalize(corpus_a).T, axis=1)[:, :k]
+    top_b = np.argsort(-normalize(queries_b) @ normalize(corpus_b).T, axis=1)[:, :k]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(top_a, top_b)]))
+
+
+# --- 2. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="KURE-v1 PyTorch vs ONNX / int8: 처리량과 벡터 / 검색 결과 일치도 비교")
+    parser.add_argument("--sentences", type=int, default=2_000, help="비교할 문장 수 (기본: 2,000)")
+    parser.add_argument("--batch-size", type=int, default=64, help="배치 크기 (기본: 64)")
+    parser.add_argument("--onnx-dir", default=DEFAULT_ONNX_DIR, help=f"ONNX 모델 폴더 (기본: {DEFAULT_ONNX_DIR})")
+    parser.add_argument("--threads", type=int, help="CPU 스레드 수 (torch / onnxruntime 공통)")
+    parser.add_argument("--top-k", type=int, default=10, help="검색 결과 비교 개수 (기본: 10)")
+    parser.add_argument("--min-cos", type=float, default=0.99, help="통과 기준: 평균 cos (기본: 0.99)")
+    parser.add_argument("--min-overlap", type=float, default=0.9, help="통과 기준: 평균 top-k 겹침 (기본: 0.9)")
+    args = parser.parse_args()
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    sentences, source = load_sentences(args.sentences)
+    reference_model = load_encoder_model("torch", MODEL_ID, device="cpu")
+    total_tokens = int(token_lengths(reference_model.tokenizer, sentences, reference_model.max_seq_length).sum())
+    print(f"--- {source}: {len(sentences):,} 문장, {total_tokens:,} 토큰, 질의 {len(SAMPLE_QUERIES)}개, top-{args.top_k} ---")
+
+    def run(name, model):
+        encode = length_sorted_encoder(model, args.batch_size)
+        encode(sentences[:args.batch_size]) # 워밍업
+        vectors, sec = timed(encode, sentences)
+        print(f"  > {name:10s}: {sec:8.2f}s, {len(sentences) / sec:8.1f} 문장/s, {total_tokens / sec:10,.0f} tokens/s")
+        return np.asarray(vectors, dtype=np.float32), encode(SAMPLE_QUERIES), sec
+
+    reference, reference_queries, reference_sec = run("torch", reference_model)
+
+    all_passed = True
+    compared = 0
+    for backend in ONNX_FILES:
+        if not os.path.exists(os.path.join(args.onnx_dir, ONNX_FILES[backend])):
+            print(f"  > {backend:10s}: '{ONNX_FILES[backend]}' 없음, 건너뜀 (python embedding/onnx_encoder.py export --quantize)")
+            continue
+        vectors, queries, sec = run(backend, load_encoder_model(backend, MODEL_ID, args.onnx_dir, threads=args.threads))
+        cos = np.sum(normalize(reference) * normalize(vectors), axis=1)
+        overlap = top_k_overlap(reference, reference_queries, vectors, queries, args.top_k)
+        passed = cos.mean() >= args.min_cos and overlap >= args.min_overlap
+        print(f"    {backend}: x{reference_sec / sec:.2f} | cos 평균 {cos.mean():.4f}, 최소 {cos.min():.4f} | "
+              f"top-{args.top_k} 겹침 {overlap:.1%} | 기준 통과: {passed}")
+        all_passed &= passed
+        compared += 1
+
+    if compared == 0 or not all_passed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
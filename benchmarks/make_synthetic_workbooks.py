@@ -0,0 +1,242 @@
+import os
+import sys
+import time
+import argparse
+import datetime
+
+import numpy as np
+import openpyxl
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'xlsx_to_json_pipeline'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'embedding_preprocessing'))
+
+from convert_welcome_to_json import FINAL_COLUMN_MAPPING
+from qpoll_json_to_text import TOPIC_FORMATTERS_BY_PANEL, TOPIC_FORMATTERS_BY_SURVEY
+
+# 변환기가 읽는 실제 데이터(data/Welcome, data/Quickpoll)와 같은 레이아웃의 합성 워크북 생성기
+# - Welcome: 데이터 시트(1행 Q-code, 2행 중복 헤더) + 라벨 시트(Q-code 행 + 코드/응답 행 + 빈 행)
+# - Qpoll: 데이터 시트(1행 제목, 2행 헤더, G열부터 문항) + 라벨 시트('설문제목' ids 행 + 질문/라벨 행, '총참여자수'로 끝)
+
+# 엑셀 시트 최대 행 수에서 헤더 2행을 뺀 값 = 워크북 하나에 넣을 수 있는 최대 패널 수
+# (약 100만. 그보다 큰 규모(예: 1,000만)는 run_pipeline_benchmark.py 가 변환 결과를 반복해서 측정)
+EXCEL_MAX_ROWS = 1_048_576
+MAX_PANELS = EXCEL_MAX_ROWS - 2
+
+# 기본 출력 폴더: 실제 워크북이 있는 xlsx_to_json_pipeline/data 가 아닌 벤치마크 전용 폴더
+DEFAULT_OUT_DIR = os.path.join(SCRIPT_DIR, 'data')
+
+# Welcome 문항: 영문 키 -> (Q-code, 형식, 보기 수 / 숫자 범위)
+# 형식: single(코드 1개, '_raw'는 가끔 직접 입력 문자열), multi("1,3,5"), number, text
+WELCOME_1ST_FIELDS = {
+    'gender': ('Q1', 'single', 2),
+    'birth_year': ('Q2', 'number', (1950, 2006)),
+    'region_major': ('Q12', 'single', 17),
+    'region_minor': ('Q12_1', 'single', 25),
+}
+WELCOME_2ND_FIELDS = {
+    'marital_status': ('Q1', 'single', 3),
+    'children_count': ('Q2', 'number', (0, 5)),
+    'family_size': ('Q3', 'single', 5),
+    'education_level': ('Q4', 'single', 4),
+    'job_title_raw': ('Q5', 'single', 15),
+    'job_duty_raw': ('Q5_1', 'single', 21),
+    'income_personal_monthly': ('Q6', 'single', 11),
+    'income_household_monthly': ('Q7', 'single', 11),
+    'owned_electronics': ('Q8', 'multi', 30),
+    'phone_brand_raw': ('Q9_1', 'single', 3),
+    'phone_model_raw': ('Q9_2', 'single', 20),
+    'car_ownership': ('Q10', 'single', 2),
+    'car_manufacturer_raw': ('Q11_1', 'single', 20),
+    'car_model_raw': ('Q11_2', 'single', 30),
+    'smoking_experience': ('Q12', 'multi', 6),
+    'smoking_brand': ('Q12_1', 'multi', 40),
+    'smoking_brand_etc_raw': ('Q12_1_etc', 'text', None),
+    'e_cigarette_experience': ('Q12_2', 'multi', 5),
+    'smoking_brand_other_details_raw': ('Q12_3', 'text', None),
+    'drinking_experience': ('Q13', 'multi', 12),
+    'drinking_experience_other_details_raw': ('Q13_etc', 'text', None),
+}
+
+MISSING_RATE = 0.1 # 빈 셀 비율
+FREE_TEXT_RATE = 0.05 # '_raw' 단일선택 문항의 직접 입력 비율
+QPOLL_RESPONSE_RATE = 0.6 # Welcome 패널 중 각 qpoll에 응답한 비율
+
+
+def panel_id(index):
+    return f"w{index:09d}"
+
+
+def _question_text(key):
+    """FINAL_COLUMN_MAPPING에서 영문 키에 해당하는 라벨 시트 문항 텍스트"""
+    return next(text for text, mapped in FINAL_COLUMN_MAPPING.items() if mapped == key)
+
+
+def _value_label(key, code):
+    return "기타" if code == 1 else f"{key} 응답 {code}"
+
+
+# --- 2. Welcome 워크북 ---
+def _welcome_column(rng, key, kind, spec, size):
+    """한 문항의 셀 값 배열 (object, None = 빈 셀)"""
+    if kind == 'single':
+        values = rng.integers(1, spec + 1, size).astype(object)
+        if key.endswith('_raw'):
+            values[rng.random(size) < FREE_TEXT_RATE] = f"{key} 직접 입력"
+    elif kind == 'multi':
+        # 응답 조합 풀에서 뽑아 "1,3,5" 형태로 저장
+        pool = [
+            ','.join(str(code) for code in sorted(rng.choice(np.arange(1, spec + 1), size=min(spec, 1 + i % 4), replace=False)))
+            for i in range(64)
+        ]
+        values = np.array(pool, dtype=object)[rng.integers(0, len(pool), size)]
+    elif kind == 'number':
+        values = rng.integers(spec[0], spec[1] + 1, size).astype(object)
+    else:
+        values = np.array([f"{key} 내용 {i}" for i in range(8)], dtype=object)[rng.integers(0, 8, size)]
+    values[rng.random(size) < MISSING_RATE] = None
+    return values
+
+
+def write_welcome_workbook(path, fields, panel_count, seed, chunk_size=50_000):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('data')
+    ws.append(['mb_sn'] + [q_code for q_code, _, _ in fields.values()])
+    ws.append(['패널ID'] + [_question_text(key) for key in fields]) # 중복 헤더 행 (변환기가 건너뜀)
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, panel_count, chunk_size):
+        size = min(chunk_size, panel_count - start)
+        columns = [_welcome_column(rng, key, kind, spec, size) for key, (_, kind, spec) in fields.items()]
+        for offset, row in enumerate(zip(*columns)):
+            ws.append([panel_id(start + offset)] + list(row))
+
+    wl = wb.create_sheet('label')
+    wl.append(['변수', '설명'])
+    for key, (q_code, kind, spec) in fields.items():
+        wl.append([q_code, _question_text(key)])
+        if kind in ('single', 'multi'):
+            for code in range(1, spec + 1):
+                wl.append([code, _value_label(key, code)])
+        wl.append([None, None])
+    wb.save(path)
+
+
+# --- 3. Qpoll 워크북 ---
+def write_qpoll_workbook(path, topic_id, panel_count, question_count, option_count, seed, chunk_size=50_000):
+    rng = np.random.default_rng(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('data')
+    ws.append([f"Quickpoll 결과 ({topic_id})"])
+    ws.append(['구분', '고유번호', '성별', '나이', '지역', '설문일시'] + [f"문항{q + 1}" for q in range(question_count)])
+
+    base_time = datetime.datetime(2025, 1, 6, 9, 0, 0)
+    regions = np.array(['서울', '경기', '부산', '인천', '대구', '광주', '대전'], dtype=object)
+    # 세 문항 중 하나는 다중선택("1,3"), 나머지는 단일선택
+    multi_pool = np.array([f"{a},{b}" for a in range(1, option_count + 1) for b in range(a + 1, option_count + 1)], dtype=object)
+    for start in range(0, panel_count, chunk_size):
+        size = min(chunk_size, panel_count - start)
+        responded = np.flatnonzero(rng.random(size) < QPOLL_RESPONSE_RATE) + start
+        answers = []
+        for q in range(question_count):
+            if q % 3 == 2 and len(multi_pool):
+                column = multi_pool[rng.integers(0, len(multi_pool), len(responded))]
+            else:
+                column = rng.integers(1, option_count + 1, len(responded)).astype(object)
+            column[rng.random(len(responded)) < MISSING_RATE / 2] = None
+            answers.append(column)
+        genders = rng.choice(['남', '여'], len(responded)).tolist()
+        ages = rng.integers(20, 70, len(responded)).tolist()
+        region_values = regions[rng.integers(0, len(regions), len(responded))]
+        minutes = rng.integers(0, 60 * 24 * 14, len(responded)).tolist()
+        for i, index in enumerate(responded.tolist()):
+            ws.append(
+                ['퀵폴', panel_id(index), genders[i], ages[i], region_values[i],
+                 base_time + datetime.timedelta(minutes=minutes[i])]
+                + [column[i] for column in answers]
+            )
+
+    wl = wb.create_sheet('label')
+    for q in range(question_count):
+        wl.append(['설문제목'] + [f"보기{k + 1}" for k in range(option_count)] + ['총참여자수', panel_count])
+        wl.append([f"{topic_id} 합성 질문 {q + 1}은 무엇인가요?"]
+                  + [_value_label(f"{topic_id} Q{q + 1}", k + 1) for k in range(option_count)] + [panel_count])
+    wb.save(path)
+
+
+# --- 4. 전체 데이터 폴더 생성 ---
+def generate_workbooks(data_dir, panel_count, panel_topics=4, survey_topics=2, survey_questions=5,
+                       option_count=8, seed=0, log=print, force=False):
+    """
+    Writes data_dir/Welcome/{Welcome_1st,welcome_2nd}.xlsx and data_dir/Quickpoll/qpoll_join_*.xlsx.
+    panel_topics single-question polls (qpoll_json_to_text mode A) and survey_topics polls with
+    survey_questions questions (mode B) use real topic ids so every stage processes them.
+    Refuses to overwrite an existing workbook unless force is set.
+    Returns the list of written paths.
+    """
+    if panel_count > MAX_PANELS:
+        raise ValueError(f"panel_count {panel_count:,} exceeds the Excel sheet limit ({MAX_PANELS:,} panels per workbook)")
+    welcome_dir = os.path.join(data_dir, 'Welcome')
+    qpoll_dir = os.path.join(data_dir, 'Quickpoll')
+    os.makedirs(welcome_dir, exist_ok=True)
+    os.makedirs(qpoll_dir, exist_ok=True)
+
+    jobs = [
+        (os.path.join(welcome_dir, 'Welcome_1st.xlsx'), write_welcome_workbook, (WELCOME_1ST_FIELDS, panel_count, seed)),
+        (os.path.join(welcome_dir, 'welcome_2nd.xlsx'), write_welcome_workbook, (WELCOME_2ND_FIELDS, panel_count, seed + 1)),
+    ]
+    topics = [(topic_id, 1) for topic_id in list(TOPIC_FORMATTERS_BY_PANEL)[:panel_topics]]
+    topics += [(topic_id, survey_questions) for topic_id in list(TOPIC_FORMATTERS_BY_SURVEY)[:survey_topics]]
+    for index, (topic_id, question_count) in enumerate(topics):
+        jobs.append((
+            os.path.join(qpoll_dir, f"{topic_id}.xlsx"), write_qpoll_workbook,
+            (topic_id, panel_count, question_count, option_count, seed + 2 + index)
+        ))
+
+    existing = [path for path, _, _ in jobs if os.path.exists(path)]
+    if existing and not force:
+        raise FileExistsError(
+            f"{len(existing)} workbook(s) already exist in {data_dir} (e.g. {existing[0]}); pass force=True to overwrite"
+        )
+
+    paths = []
+    for path, writer, args in jobs:
+        start = time.perf_counter()
+        writer(path, *args)
+        log(f"  > {os.path.relpath(path, data_dir)} ({time.perf_counter() - start:.1f}s)")
+        paths.append(path)
+    return paths
+
+
+# --- 5. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="변환기 입력과 같은 레이아웃의 합성 Welcome / Qpoll 워크북 생성")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR,
+                        help="출력 data 폴더 (기본: benchmarks/data). 같은 이름의 워크북이 있으면 --force 없이는 중단")
+    parser.add_argument("--force", action="store_true", help="이미 있는 워크북을 덮어씀")
+    parser.add_argument("--panels", type=int, default=10_000,
+                        help=f"패널 수 (기본: 10,000). 엑셀 시트 한도 때문에 워크북 하나당 최대 {MAX_PANELS:,} (약 100만) 패널. "
+                             "1,000만 같은 큰 규모는 run_pipeline_benchmark.py 의 반복(tile) 측정 사용")
+    parser.add_argument("--panel-topics", type=int, default=4, help="단일 문항 qpoll 워크북 수 (방식 A, 기본: 4)")
+    parser.add_argument("--survey-topics", type=int, default=2, help="다중 문항 qpoll 워크북 수 (방식 B, 기본: 2)")
+    parser.add_argument("--questions", type=int, default=5, help="다중 문항 qpoll 워크북의 문항 수 (기본: 5)")
+    parser.add_argument("--options", type=int, default=8, help="qpoll 문항당 보기 수 (기본: 8)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.panels > MAX_PANELS:
+        parser.error(f"--panels {args.panels:,}: 워크북 하나당 최대 {MAX_PANELS:,} 패널 (엑셀 시트 한도)")
+
+    print(f"--- 합성 워크북 생성: {args.panels:,} 패널 -> {args.out} ---")
+    try:
+        generate_workbooks(args.out, args.panels, args.panel_topics, args.survey_topics, args.questions, args.options,
+                           args.seed, force=args.force)
+    except FileExistsError as e:
+        print(f"[오류] {e} (덮어쓰려면 --force)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
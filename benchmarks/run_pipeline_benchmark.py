@@ -0,0 +1,236 @@
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import platform
+import resource
+import datetime
+import tempfile
+import subprocess
+
+# --- 1. 경로 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/benchmarks
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.json_io import iter_records, write_records, FORMAT_ENV_VAR, CODEC_ENV_VAR
+
+# 합성 워크북으로 파이프라인 단계를 차례로 실행하고, 단계별 wall time / 최대 RSS를 JSON 리포트로 저장한다.
+# 스크립트들은 자기 위치 기준 경로(data/, *_output/)를 쓰므로, 규모마다 코드만 임시 작업 폴더에 복사해 실행한다.
+
+# 작업 폴더로 복사할 코드 폴더 (데이터 / 출력 / 캐시는 제외)
+CODE_DIRS = ['common', 'xlsx_to_json_pipeline', 'embedding_preprocessing']
+COPY_IGNORE = shutil.ignore_patterns(
+    'data', '*_output', '*_output_by_*', '.label_cache', '__pycache__', '*_manifest.json', '*.json'
+)
+
+# (단계 이름, 실행 폴더, 스크립트, 인자, 엑셀 입력 단계 여부)
+STAGES = [
+    ('convert_welcome_to_json', 'xlsx_to_json_pipeline', 'convert_welcome_to_json.py', ['--force'], True),
+    ('convert_qpoll_to_json', 'xlsx_to_json_pipeline', 'convert_qpoll_to_json.py', ['--force'], True),
+    ('convert_qpolls_to_merged_json', 'xlsx_to_json_pipeline', 'convert_qpolls_to_merged_json.py', [], True),
+    ('merge_welcome_and_qpoll', 'xlsx_to_json_pipeline', 'merge_welcome_and_qpoll.py', [], False),
+    ('qpoll_json_to_text', 'embedding_preprocessing', 'qpoll_json_to_text.py', [], False),
+    ('welcome_json_to_text', 'embedding_preprocessing', 'welcome_json_to_text.py', [], False),
+    ('merge_qpoll_text', 'embedding_preprocessing', 'merge_qpoll_text.py', [], False),
+    # qpoll_json_to_text + merge_qpoll_text 를 한 번에 (주제별 파일 없이 병합 파일만): 위 두 단계의 합과 비교
+    ('qpoll_json_to_text_merged', 'embedding_preprocessing', 'qpoll_json_to_text.py', ['--merged'], False),
+]
+STAGE_NAMES = [name for name, *_ in STAGES]
+
+DEFAULT_SCALES = '10000,100000'
+
+# make_synthetic_workbooks.MAX_PANELS (워크북 하나에 넣을 수 있는 최대 패널 수)
+# Linux는 fork 시점의 최대 RSS를 자식 프로세스에 물려주므로, 단계별 최대 RSS가 부풀려지지 않도록
+# 이 스크립트는 pandas / openpyxl을 import하지 않고 워크북 생성도 자식 프로세스로 실행한다.
+MAX_PANELS = 1_048_576 - 2
+
+
+# --- 2. 단계 실행 ---
+def run_stage(work_dir, stage_dir, script, args, log_path):
+    """스크립트를 자식 프로세스로 실행하고 (종료 코드, wall time 초, 최대 RSS MB)를 반환한다."""
+    cwd = os.path.join(work_dir, stage_dir)
+    with open(log_path, 'w', encoding='utf-8') as log:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, script] + args, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+        # wait4: 해당 자식 프로세스만의 자원 사용량 (ru_maxrss: Linux는 KB 단위)
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+    return os.waitstatus_to_exitcode(status), elapsed, usage.ru_maxrss / 1024
+
+
+def prepare_merge_inputs(work_dir):
+    """merge_welcome_and_qpoll / welcome_json_to_text가 읽는 위치로 변환 결과를 복사"""
+    pipeline_dir = os.path.join(work_dir, 'xlsx_to_json_pipeline')
+    copies = {
+        os.path.join(pipeline_dir, 'welcome_json_output', 'welcome_data.json'): os.path.join(pipeline_dir, 'welcome_data.json'),
+        os.path.join(pipeline_dir, 'merged_qpoll_json_output', 'merged_qpoll_data.json'): os.path.join(pipeline_dir, 'qpoll_data.json'),
+    }
+    for source, target in copies.items():
+        if os.path.exists(source):
+            shutil.copyfile(source, target)
+
+
+# --- 3. 엑셀 한도를 넘는 규모: 변환 결과를 panel_id만 바꿔 반복 ---
+def _tiled(records_factory, copies):
+    for copy in range(copies):
+        for record in records_factory():
+            if copy and isinstance(record, dict) and record.get('panel_id') is not None:
+                record['panel_id'] = f"{record['panel_id']}-{copy}"
+            yield record
+
+
+def tile_stage_outputs(work_dir, copies):
+    """
+    Repeats the records of every converter output copies times (panel_id suffixed with -N),
+    so the JSON stages can be measured beyond the Excel row limit. Streams; nothing is held in memory.
+    """
+    pipeline_dir = os.path.join(work_dir, 'xlsx_to_json_pipeline')
+    qpoll_dir = os.path.join(pipeline_dir, 'qpoll_json_output')
+    paths = [os.path.join(qpoll_dir, name) for name in sorted(os.listdir(qpoll_dir)) if name.endswith('.json')]
+    paths += [
+        os.path.join(pipeline_dir, 'welcome_json_output', 'welcome_data.json'),
+        os.path.join(pipeline_dir, 'merged_qpoll_json_output', 'merged_qpoll_data.json'),
+    ]
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        tmp_path = path + '.tiled'
+        write_records(tmp_path, _tiled(lambda: iter_records(path), copies))
+        os.replace(tmp_path, path)
+
+
+# --- 4. 규모별 실행 ---
+def run_scale(panel_count, args, report_dir):
+    workbook_panels = min(panel_count, MAX_PANELS)
+    copies = math.ceil(panel_count / workbook_panels)
+    result = {
+        "panels": panel_count,
+        "workbook_panels": workbook_panels,
+        "tile_factor": copies, # JSON 단계 패널 수 = workbook_panels x tile_factor
+        "stages": [],
+    }
+    log_dir = os.path.join(report_dir, f"logs_{panel_count}")
+    os.makedirs(log_dir, exist_ok=True)
+
+    work_dir = tempfile.mkdtemp(prefix=f"pipeline-bench-{panel_count}-", dir=args.work_dir)
+    try:
+        for name in CODE_DIRS:
+            shutil.copytree(os.path.join(PROJECT_ROOT, name), os.path.join(work_dir, name), ignore=COPY_IGNORE)
+
+        print(f"\n=== {panel_count:,} 패널 (워크북 {workbook_panels:,} 패널 x {copies}) ===")
+        # 워크북 생성도 자식 프로세스로 실행 (MAX_PANELS 주석 참고)
+        generate_args = [
+            '--out', os.path.join(work_dir, 'xlsx_to_json_pipeline', 'data'), '--panels', str(workbook_panels),
+            '--panel-topics', str(args.panel_topics), '--survey-topics', str(args.survey_topics),
+            '--questions', str(args.questions), '--options', str(args.options), '--seed', str(args.seed),
+        ]
+        returncode, elapsed, _ = run_stage(
+            work_dir, 'xlsx_to_json_pipeline', os.path.join(SCRIPT_DIR, 'make_synthetic_workbooks.py'), generate_args,
+            os.path.join(log_dir, 'make_synthetic_workbooks.log')
+        )
+        if returncode != 0:
+            raise RuntimeError(f"합성 워크북 생성 실패 (로그: {os.path.join(log_dir, 'make_synthetic_workbooks.log')})")
+        result["generate_sec"] = round(elapsed, 3)
+        print(f"  > 합성 워크북 생성 {result['generate_sec']:.1f}s")
+
+        tiled = False
+        for name, stage_dir, script, stage_args, reads_excel in STAGES:
+            if name not in args.stages:
+                continue
+            if not reads_excel and copies > 1 and not tiled:
+                start = time.perf_counter()
+                tile_stage_outputs(work_dir, copies)
+                result["tile_sec"] = round(time.perf_counter() - start, 3)
+                tiled = True
+                print(f"  > 변환 결과 {copies}배 반복 {result['tile_sec']:.1f}s")
+            if name in ('merge_welcome_and_qpoll', 'welcome_json_to_text'):
+                prepare_merge_inputs(work_dir)
+
+            log_path = os.path.join(log_dir, f"{name}.log")
+            returncode, elapsed, peak_rss_mb = run_stage(work_dir, stage_dir, script, stage_args, log_path)
+            result["stages"].append({
+                "stage": name,
+                "panels": workbook_panels if reads_excel else workbook_panels * copies,
+                "wall_time_sec": round(elapsed, 3),
+                "peak_rss_mb": round(peak_rss_mb, 1),
+                "returncode": returncode,
+                "log": os.path.relpath(log_path, report_dir),
+            })
+            status = "" if returncode == 0 else f"  [실패: 종료 코드 {returncode}, 로그 {log_path}]"
+            print(f"  > {name:<30} {elapsed:9.2f}s  {peak_rss_mb:9.1f} MB{status}")
+    finally:
+        if args.keep:
+            print(f"  > 작업 폴더 유지: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return result
+
+
+# --- 5. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="합성 워크북으로 파이프라인 단계별 wall time / 최대 RSS 측정")
+    parser.add_argument("--scales", default=DEFAULT_SCALES,
+                        help=f"패널 수 목록 (쉼표 구분, 기본: {DEFAULT_SCALES}). "
+                             f"{MAX_PANELS:,} 초과분은 워크북을 한도까지 만든 뒤 변환 결과를 반복해 JSON 단계만 해당 규모로 측정")
+    parser.add_argument("--stages", default=','.join(STAGE_NAMES), help="실행할 단계 (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--panel-topics", type=int, default=4, help="단일 문항 qpoll 워크북 수 (기본: 4)")
+    parser.add_argument("--survey-topics", type=int, default=2, help="다중 문항 qpoll 워크북 수 (기본: 2)")
+    parser.add_argument("--questions", type=int, default=5, help="다중 문항 qpoll 워크북의 문항 수 (기본: 5)")
+    parser.add_argument("--options", type=int, default=8, help="qpoll 문항당 보기 수 (기본: 8)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default=os.path.join(SCRIPT_DIR, 'reports', 'pipeline_benchmark.json'),
+                        help="JSON 리포트 경로 (단계별 로그는 같은 폴더의 logs_<패널 수>/)")
+    parser.add_argument("--work-dir", default=None, help="임시 작업 폴더를 만들 위치 (기본: 시스템 임시 폴더)")
+    parser.add_argument("--keep", action="store_true", help="실행 후 작업 폴더를 지우지 않음")
+    args = parser.parse_args()
+
+    scales = [int(value) for value in args.scales.split(',') if value.strip()]
+    args.stages = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = sorted(set(args.stages) - set(STAGE_NAMES))
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(unknown)} (가능: {', '.join(STAGE_NAMES)})")
+
+    report_dir = os.path.dirname(os.path.abspath(args.report))
+    os.makedirs(report_dir, exist_ok=True)
+
+    report = {
+        "created_at": datetime.datetime.now().isoformat(timespec='seconds'),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            # 단계별 최대 RSS의 하한 (자식 프로세스는 fork 시점의 이 값을 물려받음)
+            "runner_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            FORMAT_ENV_VAR: os.environ.get(FORMAT_ENV_VAR, ''),
+            CODEC_ENV_VAR: os.environ.get(CODEC_ENV_VAR, ''),
+        },
+        "workload": {
+            "panel_topics": args.panel_topics,
+            "survey_topics": args.survey_topics,
+            "questions": args.questions,
+            "options": args.options,
+            "seed": args.seed,
+        },
+        "scales": [],
+    }
+    failed = False
+    for panel_count in scales:
+        result = run_scale(panel_count, args, report_dir)
+        report["scales"].append(result)
+        failed = failed or any(stage["returncode"] != 0 for stage in result["stages"])
+
+        # 규모마다 리포트를 갱신 (긴 실행 도중에도 결과 확인 가능)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+    print(f"\n리포트 저장: {args.report}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import os
+import time
+import sqlite3
+import hashlib
+
+import numpy as np
+
+# 실행 간에 유지되는 문장 임베딩 캐시 (SQLite 파일 한 개)
+#
+# 키는 (모델 ID, normalization, sha256(문장)). 같은 모델 / 같은 후처리로 이미 인코딩한 문장은
+# 모델을 다시 호출하지 않고 저장해 둔 벡터를 사용한다 (매주 실행해도 대부분의 문장은 바뀌지 않음).
+# normalization은 벡터를 만든 방식의 이름 (예: 'none', 'l2')으로, 설정이 바뀌면 다른 키가 되어 예전 벡터를 쓰지 않는다.
+# 벡터는 float32 바이트로 저장하므로 float32 모델 출력과 값이 같다.
+#
+# 크기 제한: 전체 벡터 바이트가 max_bytes를 넘으면 마지막으로 사용한 시각이 오래된 항목부터 삭제 (LRU).
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, '.embedding_cache', 'embeddings.sqlite')
+DEFAULT_MAX_MB = 4096
+
+# 한 번의 SQL 문에 넣는 키 개수 (SQLite 변수 개수 제한보다 작게)
+LOOKUP_CHUNK_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model_id TEXT NOT NULL,
+    normalization TEXT NOT NULL,
+    sentence_hash BLOB NOT NULL,
+    vector BLOB NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (model_id, normalization, sentence_hash)
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used);
+"""
+
+
+def sentence_hash(sentence):
+    return hashlib.sha256(sentence.encode('utf-8')).digest()
+
+
+class EmbeddingCache:
+    """
+    On-disk sentence -> vector cache for one (model_id, normalization).
+    encode(sentences, encode_func) returns the vectors in input order and only calls
+    encode_func(list_of_missing_sentences) -> 2D array for the sentences that are not cached.
+    """
+
+    def __init__(self, model_id, normalization='none', path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.model_id = model_id
+        self.normalization = normalization
+        self.path = path
+        self.max_bytes = max_bytes
+        # 이번 실행에서의 사용 통계 (실행 요약에 출력)
+        self.stats = {'hits': 0, 'misses': 0, 'bytes_written': 0, 'evicted': 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # 여러 프로세스가 같은 캐시를 쓰더라도 잠금을 기다리도록 timeout, 읽기와 쓰기가 서로 막지 않도록 WAL
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.stored_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(length(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        if self.conn is not None:
+            self.evict()
+            self.conn.close()
+            self.conn = None
+
+    # --- 1. 조회 / 저장 ---
+
+    def lookup(self, hashes):
+        """{sentence_hash: float32 vector} for the cached hashes (last_used is refreshed)."""
+        found = {}
+        for start in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+            chunk = hashes[start:start + LOOKUP_CHUNK_SIZE]
+            rows = self.conn.execute(
+                f"SELECT sentence_hash, vector FROM embeddings "
+                f"WHERE model_id = ? AND normalization = ? AND sentence_hash IN ({','.join('?' * len(chunk))})",
+                (self.model_id, self.normalization, *chunk),
+            )
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32)
+
+        if found:
+            now = time.time_ns()
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model_id = ? AND normalization = ? AND sentence_hash = ?",
+                    [(now, self.model_id, self.normalization, key) for key in found],
+                )
+        return found
+
+    def store(self, hashes, vectors):
+        now = time.time_ns()
+        rows = []
+        for key, vector in zip(hashes, vectors):
+            blob = np.asarray(vector, dtype=np.float32).tobytes()
+            rows.append((self.model_id, self.normalization, key, blob, now))
+            self.stats['bytes_written'] += len(blob)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model_id, normalization, sentence_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        self.stored_bytes += sum(len(row[3]) for row in rows)
+        if self.stored_bytes > self.max_bytes:
+            self.evict()
+
+    def encode(self, sentences, encode_func):
+        """
+        Vectors (2D float32 array) for sentences in input order.
+        Only the distinct sentences missing from the cache are passed to encode_func, once each.
+        """
+        hashes = [sentence_hash(sentence) for sentence in sentences]
+        found = self.lookup(list(dict.fromkeys(hashes)))
+
+        missing = {}
+        for key, sentence in zip(hashes, sentences):
+            if key not in found and key not in missing:
+                missing[key] = sentence
+        self.stats['hits'] += len(sentences) - sum(1 for key in hashes if key in missing)
+        self.stats['misses'] += len(missing)
+
+        if missing:
+            new_vectors = np.asarray(encode_func(list(missing.values())), dtype=np.float32)
+            self.store(list(missing), new_vectors)
+            found.update(zip(missing, new_vectors))
+
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in hashes])
+
+    # --- 2. 정리 (eviction) ---
+
+    def evict(self):
+        """Deletes the least recently used entries (of any model) until the stored vectors fit in max_bytes."""
+        excess = self.stored_bytes - self.max_bytes
+        if excess <= 0:
+            return 0
+
+        victims = []
+        freed = 0
+        rows = self.conn.execute(
+            "SELECT model_id, normalization, sentence_hash, length(vector) FROM embeddings ORDER BY last_used"
+        )
+        for model_id, normalization, key, size in rows:
+            if freed >= excess:
+                break
+            victims.append((model_id, normalization, key))
+            freed += size
+        rows.close()
+
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM embeddings WHERE model_id = ? AND normalization = ? AND sentence_hash = ?",
+                victims,
+            )
+        self.stored_bytes -= freed
+        self.stats['evicted'] += len(victims)
+        return len(victims)
+
+    # --- 3. 통계 ---
+
+    def format_stats(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        hit_rate = self.stats['hits'] / lookups if lookups else 0.0
+        return (f"Embedding cache: {self.stats['hits']} hits, {self.stats['misses']} misses "
+                f"(hit rate {hit_rate:.1%}), {self.stats['bytes_written'] / 1024 / 1024:.1f} MB written, "
+                f"{self.stats['evicted']} evicted, {self.stored_bytes / 1024 / 1024:.1f} MB stored")
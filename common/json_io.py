@@ -0,0 +1,320 @@
+import os
+import json
+from itertools import islice
+
+try:
+    import orjson
+except ImportError: # pip install orjson 이 없으면 표준 json 모듈 사용
+    orjson = None
+
+# 파이프라인 단계 사이에서 주고받는 JSON 파일 읽기/쓰기
+#
+# 기본 형식은 NDJSON (한 줄에 레코드 1개): 레코드를 만드는 대로 바로 쓰고, 다음 단계도 한 줄씩 읽으므로
+# 전체 리스트를 메모리에 올리지 않아도 된다.
+# PIPELINE_JSON_FORMAT=pretty 로 실행하면 기존과 같은 indent=4 JSON 형식으로 쓴다 (디버깅용).
+# 읽기 함수는 두 형식을 자동으로 구분하므로, 어느 형식으로 만든 파일이든 그대로 읽을 수 있다.
+#
+# NDJSON 인코딩/디코딩은 orjson이 설치되어 있으면 orjson, 없으면 표준 json 모듈을 사용한다.
+# PIPELINE_JSON_CODEC=json 으로 표준 모듈을 강제할 수 있다. (pretty 형식은 항상 표준 모듈: 기존 출력과 바이트 단위로 동일)
+# orjson은 NaN/Infinity를 null로 쓰고 표준 모듈은 JSON 규격 밖의 NaN 리터럴로 쓰므로, 변환기는 쓰기 전에 NaN을 None으로 바꾼다.
+# 두 코덱의 출력 바이트(공백 등)는 다르므로 변환기의 CONVERTER_VERSION 에 코덱 이름이 포함된다.
+
+FORMAT_ENV_VAR = 'PIPELINE_JSON_FORMAT'
+NDJSON = 'ndjson'
+PRETTY = 'pretty'
+
+# 문서형 파일({"topic_file_id": ..., "generated_data": [...]})을 NDJSON으로 쓸 때
+# 첫 줄(헤더)에 레코드 리스트의 키 이름을 기록하는 키
+RECORDS_KEY_FIELD = '__records__'
+
+CODEC_ENV_VAR = 'PIPELINE_JSON_CODEC'
+
+
+def output_format():
+    """The output format selected by PIPELINE_JSON_FORMAT ('ndjson' by default)."""
+    value = os.environ.get(FORMAT_ENV_VAR, NDJSON).strip().lower()
+    if value not in (NDJSON, PRETTY):
+        raise ValueError(f"{FORMAT_ENV_VAR} must be '{NDJSON}' or '{PRETTY}', got '{value}'")
+    return value
+
+
+# --- 0. 코덱 ---
+
+class StdlibCodec:
+    name = 'json'
+
+    @staticmethod
+    def dumps(obj):
+        """obj -> UTF-8 bytes (one line, no trailing newline)."""
+        return json.dumps(obj, ensure_ascii=False, default=_to_builtin).encode('utf-8')
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = 'orjson'
+    # 표준 json과 같이 정수 등 문자열이 아닌 dict 키를 허용하고, numpy 배열은 tolist() 없이 직렬화
+    OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+    @staticmethod
+    def dumps(obj):
+        try:
+            return orjson.dumps(obj, default=_to_builtin, option=OrjsonCodec.OPTIONS)
+        except TypeError: # 예: 64비트를 넘는 정수 -> 표준 모듈로 처리
+            return StdlibCodec.dumps(obj)
+
+    @staticmethod
+    def loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError: # 예: 표준 모듈이 쓴 NaN 리터럴 -> 표준 모듈로 처리
+            return json.loads(data)
+
+
+def _to_builtin(value):
+    """default= hook: numpy scalars/arrays -> Python values (anything else is an error, as in json.dumps)."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_CODECS = {'json': StdlibCodec, 'orjson': OrjsonCodec}
+
+
+def get_codec():
+    """The codec selected by PIPELINE_JSON_CODEC ('auto' by default: orjson if installed, else json)."""
+    value = os.environ.get(CODEC_ENV_VAR, 'auto').strip().lower()
+    if value == 'auto':
+        return OrjsonCodec if orjson is not None else StdlibCodec
+    if value not in _CODECS:
+        raise ValueError(f"{CODEC_ENV_VAR} must be 'auto', 'json' or 'orjson', got '{value}'")
+    if value == 'orjson' and orjson is None:
+        raise ImportError(f"{CODEC_ENV_VAR}=orjson but orjson is not installed (pip install orjson)")
+    return _CODECS[value]
+
+
+def dumps(obj):
+    """obj -> compact one-line JSON str using the selected codec."""
+    return get_codec().dumps(obj).decode('utf-8')
+
+
+def loads(data):
+    """JSON str/bytes -> obj using the selected codec."""
+    return get_codec().loads(data)
+
+
+# --- 1. 쓰기 ---
+
+class RecordWriter:
+    """
+    Writes records one at a time.
+    NDJSON: one compact JSON object per line (selected codec).
+    pretty: a JSON array byte-identical to json.dump(records, f, ensure_ascii=False, indent=indent).
+    The records go to path + '.tmp', which replaces path only if the with block ends without an exception.
+    """
+
+    def __init__(self, path, pretty=None, indent=4):
+        self.path = path
+        self.pretty = output_format() == PRETTY if pretty is None else pretty
+        self.indent = indent
+        self.count = 0
+        self._file = None
+        self._tmp_path = f"{path}.tmp"
+        self._dumps = get_codec().dumps
+
+    def __enter__(self):
+        if self.pretty:
+            self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        else:
+            self._file = open(self._tmp_path, 'wb')
+        return self
+
+    def write(self, record):
+        if not self.pretty:
+            self._file.write(self._dumps(record) + b'\n')
+        elif self.indent is None:
+            self._file.write('[' if self.count == 0 else ', ')
+            self._file.write(json.dumps(record, ensure_ascii=False, default=_to_builtin))
+        else:
+            # json.dump(list, indent=N)과 같은 모양: 레코드마다 한 단계 들여쓰기
+            pad = ' ' * self.indent
+            self._file.write('[\n' if self.count == 0 else ',\n')
+            self._file.write(pad + json.dumps(record, ensure_ascii=False, indent=self.indent, default=_to_builtin).replace('\n', '\n' + pad))
+        self.count += 1
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+    def _write_end(self):
+        if self.pretty:
+            if self.count == 0:
+                self._file.write('[]')
+            elif self.indent is None:
+                self._file.write(']')
+            else:
+                self._file.write('\n]')
+
+    def __exit__(self, exc_type, exc, tb):
+        # 중간에 실패하면 닫는 괄호를 쓰지 않고 임시 파일을 지운다 (이전 출력은 그대로 남음)
+        if exc_type is not None:
+            self._file.close()
+            os.remove(self._tmp_path)
+            return False
+        self._write_end()
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return False
+
+
+def write_records(path, records, pretty=None, indent=4):
+    """Writes an iterable of records and returns how many were written."""
+    with RecordWriter(path, pretty=pretty, indent=indent) as writer:
+        writer.write_all(records)
+    return writer.count
+
+
+class DocumentWriter(RecordWriter):
+    """
+    Writes {**header, records_key: [records...]} one record at a time (same bytes as write_document).
+    NDJSON: the first line is the header (plus '__records__': records_key), then one record per line.
+    pretty: byte-identical to json.dump(document, f, ensure_ascii=False, indent=4).
+    """
+
+    def __init__(self, path, header, records_key, pretty=None):
+        super().__init__(path, pretty=pretty, indent=4)
+        self.header = header
+        self.records_key = records_key
+
+    def __enter__(self):
+        super().__enter__()
+        if not self.pretty:
+            super().write(dict(self.header, **{RECORDS_KEY_FIELD: self.records_key}))
+            self.count = 0 # 헤더 줄은 레코드 수에 포함하지 않음
+            return self
+
+        # 헤더 키들을 먼저 쓰고, 레코드 리스트는 한 단계 안쪽에 들여쓰기
+        pad = ' ' * self.indent
+        lines = [
+            f"{pad}{json.dumps(key, ensure_ascii=False)}: "
+            + json.dumps(value, ensure_ascii=False, indent=self.indent, default=_to_builtin).replace('\n', '\n' + pad)
+            for key, value in self.header.items() if key != self.records_key
+        ]
+        lines.append(f"{pad}{json.dumps(self.records_key, ensure_ascii=False)}: [")
+        self._file.write('{\n' + ',\n'.join(lines))
+        return self
+
+    def write(self, record):
+        if not self.pretty:
+            super().write(record)
+            return
+        pad = ' ' * (2 * self.indent)
+        self._file.write('\n' if self.count == 0 else ',\n')
+        self._file.write(pad + json.dumps(record, ensure_ascii=False, indent=self.indent, default=_to_builtin).replace('\n', '\n' + pad))
+        self.count += 1
+
+    def _write_end(self):
+        if self.pretty:
+            self._file.write(']\n}' if self.count == 0 else '\n' + ' ' * self.indent + ']\n}')
+
+
+def write_document(path, header, records_key, records, pretty=None):
+    """
+    Writes {**header, records_key: [records...]} (see DocumentWriter) and returns how many records were written.
+    """
+    with DocumentWriter(path, header, records_key, pretty=pretty) as writer:
+        writer.write_all(records)
+    return writer.count
+
+
+# --- 2. 읽기 ---
+
+def _first_byte(f):
+    """First non-whitespace byte of a binary file (the file position is rewound)."""
+    while True:
+        chunk = f.read(4096)
+        if not chunk:
+            f.seek(0)
+            return b''
+        stripped = chunk.lstrip()
+        if stripped:
+            f.seek(0)
+            return stripped[:1]
+
+
+def _iter_lines(f, loads):
+    for line in f:
+        if line.strip():
+            yield loads(line)
+
+
+def iter_ndjson(path):
+    """Yields one value per non-empty line (no format detection, any JSON value per line)."""
+    loads = get_codec().loads
+    with open(path, 'rb') as f:
+        yield from _iter_lines(f, loads)
+
+
+def iter_records(path):
+    """
+    Yields the records (objects) of a JSON array file or an NDJSON file.
+    NDJSON files are read line by line; a JSON array is loaded at once (legacy / pretty files).
+    """
+    loads = get_codec().loads
+    with open(path, 'rb') as f:
+        if _first_byte(f) == b'[':
+            yield from loads(f.read())
+        else:
+            yield from _iter_lines(f, loads)
+
+
+def read_records(path):
+    """All records of path as a list."""
+    return list(iter_records(path))
+
+
+def _iter_lines_from(path, offset, loads):
+    """Yields the NDJSON values of path from byte offset; the file is open only while iterating."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        yield from _iter_lines(f, loads)
+
+
+def read_document(path):
+    """
+    Reads a file written by write_document (either format).
+    Returns (header, records_key, records iterator); records_key is None if the file is not a document.
+    """
+    loads = get_codec().loads
+    with open(path, 'rb') as f:
+        first_line = f.readline()
+        try:
+            header = loads(first_line)
+        except ValueError:
+            header = None
+
+        if isinstance(header, dict) and RECORDS_KEY_FIELD in header:
+            # 레코드는 헤더 다음 줄부터: 반복을 시작할 때 파일을 다시 열고, 끝나거나 닫히면 바로 닫는다
+            records_key = header.pop(RECORDS_KEY_FIELD)
+            return header, records_key, _iter_lines_from(path, f.tell(), loads)
+
+        # indent=4 등 일반 JSON 문서: 통째로 읽어서 리스트 값을 레코드로 사용
+        f.seek(0)
+        document = loads(f.read())
+    if not isinstance(document, dict):
+        return {}, None, iter(document if isinstance(document, list) else [])
+    records_key = next((key for key, value in reversed(document.items()) if isinstance(value, list)), None)
+    records = document.pop(records_key) if records_key is not None else []
+    return document, records_key, iter(records)
+
+
+def iter_batches(records, batch_size):
+    """Groups an iterable into lists of at most batch_size items."""
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
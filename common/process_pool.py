@@ -0,0 +1,54 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def default_workers():
+    """Number of CPU cores available to this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _timed_call(func, args):
+    """
+    Runs func(*args) and measures its wall time.
+    Exceptions are returned as a traceback string so that one failing task never aborts the batch.
+    """
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+        error = None
+    except Exception:
+        result = None
+        error = traceback.format_exc()
+    return result, error, time.perf_counter() - start
+
+
+def run_tasks(func, task_args, workers=1):
+    """
+    Runs func(*args) for every args tuple in task_args.
+    With workers > 1 the tasks are fanned out over a process pool (func must be a module-level function).
+    Yields (index, result, error, elapsed_sec) in completion order.
+    """
+    task_args = list(task_args)
+
+    if workers <= 1 or len(task_args) <= 1:
+        for index, args in enumerate(task_args):
+            yield (index, *_timed_call(func, args))
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(task_args))) as executor:
+        futures = {
+            executor.submit(_timed_call, func, args): index
+            for index, args in enumerate(task_args)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield (index, *future.result())
+            except Exception as e:
+                # 워커 프로세스 자체가 죽은 경우 (BrokenProcessPool 등)
+                yield index, None, f"{type(e).__name__}: {e}", 0.0
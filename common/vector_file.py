@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+
+from common.json_io import RecordWriter, iter_records, iter_batches
+
+# 임베딩 결과 파일 형식: float32 행렬(.npy) + 행 순서가 같은 메타데이터 파일(.meta.json)
+#
+# 벡터를 JSON 텍스트로 쓰면 float 하나에 약 20바이트가 들고, 다음 단계가 전체를 다시 파싱해야 한다.
+# .npy는 float 하나에 4바이트이고, 다음 단계는 np.load(mmap_mode='r')로 복사 없이 필요한 행만 읽는다.
+# 메타데이터({panel_id, question, sentence, ...})는 json_io 형식(기본 NDJSON)으로 i번째 레코드가 i번째 벡터 행.
+#
+# 쓰는 동안에는 행 수를 모르므로 헤더 자리를 넉넉히 잡아 두고 벡터를 이어 쓴 뒤, 닫을 때 실제 행 수로 헤더를 고친다.
+
+METADATA_SUFFIX = '.meta.json'
+DTYPE = np.float32
+
+# 헤더 자리를 잡을 때 쓰는 행 수 (실제 행 수의 헤더는 항상 이보다 짧다)
+_PLACEHOLDER_ROWS = 10 ** 15
+_HEADER_ALIGNMENT = 64
+
+
+def metadata_path_for(vectors_path):
+    """'.../qpoll_embeddings.npy' -> '.../qpoll_embeddings.meta.json'"""
+    return os.path.splitext(vectors_path)[0] + METADATA_SUFFIX
+
+
+def newer_format(vector_paths, json_paths):
+    """
+    'npy' or 'json': which of the two sets of embedding files was written most recently
+    (for inputs that exist in both formats; a stale .npy must not win just because it is .npy).
+    """
+    newest_npy = max((os.path.getmtime(path) for path in vector_paths), default=float('-inf'))
+    newest_json = max((os.path.getmtime(path) for path in json_paths), default=float('-inf'))
+    return 'npy' if newest_npy >= newest_json else 'json'
+
+
+def _npy_header(rows, dim, total_length=None):
+    """.npy (version 1.0) header bytes for a C-order float32 (rows, dim) array, padded to total_length."""
+    header = repr({'descr': np.dtype(DTYPE).str, 'fortran_order': False, 'shape': (rows, dim)})
+    prefix_length = len(np.lib.format.MAGIC_PREFIX) + 2 + 2 # magic + version + 헤더 길이(uint16)
+    if total_length is None:
+        unpadded = prefix_length + len(header) + 1
+        total_length = -(-unpadded // _HEADER_ALIGNMENT) * _HEADER_ALIGNMENT
+    header = header.ljust(total_length - prefix_length - 1) + '\n'
+    return (np.lib.format.magic(1, 0)
+            + (len(header)).to_bytes(2, 'little')
+            + header.encode('latin1'))
+
+
+class VectorWriter:
+    """
+    Writes embedding records {..., 'vector': [...]} one at a time:
+    the vectors go to a float32 .npy file and the other fields to the row-aligned metadata file.
+    """
+
+    def __init__(self, vectors_path, metadata_path=None, vector_key='vector'):
+        self.vectors_path = vectors_path
+        self.metadata_path = metadata_path or metadata_path_for(vectors_path)
+        self.vector_key = vector_key
+        self.dim = None
+        self.count = 0
+        self._file = None
+        self._metadata = RecordWriter(self.metadata_path, indent=None)
+        self._header_length = None
+
+    def __enter__(self):
+        self._file = open(self.vectors_path, 'wb')
+        self._metadata.__enter__()
+        return self
+
+    def _write_vectors(self, vectors):
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            header = _npy_header(_PLACEHOLDER_ROWS, self.dim)
+            self._header_length = len(header)
+            self._file.write(header)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"vector dimension {vectors.shape[1]} does not match {self.dim}")
+        self._file.write(vectors.tobytes())
+        self.count += len(vectors)
+
+    def write(self, record):
+        vector = np.asarray(record[self.vector_key], dtype=DTYPE).reshape(1, -1)
+        self._metadata.write({key: value for key, value in record.items() if key != self.vector_key})
+        self._write_vectors(vector)
+
+    def write_many(self, metadata_records, vectors):
+        """Writes a block of rows: metadata_records[i] belongs to vectors[i]."""
+        vectors = np.ascontiguousarray(vectors, dtype=DTYPE)
+        if len(metadata_records) != len(vectors):
+            raise ValueError(f"{len(metadata_records)} metadata records for {len(vectors)} vectors")
+        if not len(vectors):
+            return
+        self._metadata.write_all(metadata_records)
+        self._write_vectors(vectors)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metadata.__exit__(exc_type, exc, tb)
+        if self.dim is None:
+            # 벡터가 하나도 없으면 (0, 0) 배열
+            self._file.write(_npy_header(0, 0))
+        else:
+            self._file.seek(0)
+            self._file.write(_npy_header(self.count, self.dim, self._header_length))
+        self._file.close()
+        return False
+
+
+def load_vectors(vectors_path):
+    """The float32 (rows, dim) matrix, memory-mapped read-only (no copy)."""
+    return np.load(vectors_path, mmap_mode='r')
+
+
+def count_metadata_rows(vectors_path, metadata_path=None):
+    """Number of metadata records (must equal the number of vector rows)."""
+    return sum(1 for _ in iter_records(metadata_path or metadata_path_for(vectors_path)))
+
+
+def iter_vector_batches(vectors_path, batch_size, metadata_path=None):
+    """
+    Yields (metadata_records, vectors) blocks of up to batch_size rows in file order.
+    vectors is a read-only memmap slice; the metadata must have exactly one record per row.
+    """
+    vectors = load_vectors(vectors_path)
+    start = 0
+    for records in iter_batches(iter_records(metadata_path or metadata_path_for(vectors_path)), batch_size):
+        block = vectors[start:start + len(records)]
+        if len(block) != len(records):
+            raise ValueError(f"{vectors_path}: metadata has more records than the {len(vectors)} vector rows")
+        yield records, block
+        start += len(records)
+    if start != len(vectors):
+        raise ValueError(f"{vectors_path}: {len(vectors)} vector rows but {start} metadata records")
@@ -1,73 +1,141 @@
 import os
-import json
+import sys
 import glob
+import argparse
 
 # --- 1. 경로 설정 ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/embedding
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.json_io import iter_records, RecordWriter
+from common.vector_file import (
+    METADATA_SUFFIX, VectorWriter, load_vectors, iter_vector_batches, count_metadata_rows,
+    metadata_path_for, newer_format,
+)
 
 # [입력] 나눠진 임베딩 파일들 (이름 패턴)
-# 'qpoll_embedding1.json', 'qpoll_embedding2.json' ...
+# 'qpoll_embedding1.npy' (+ 'qpoll_embedding1.meta.json'), 'qpoll_embedding2.npy' ...
+INPUT_VECTOR_FILES_PATTERN = os.path.join(SCRIPT_DIR, 'qpoll_embedding*.npy')
+# 기존 형식: 'qpoll_embedding1.json', 'qpoll_embedding2.json' ...
+# 두 형식이 모두 있으면 --format 으로 고르고, 지정하지 않으면 더 최근에 만든 쪽을 사용 (경고 출력)
 INPUT_FILES_PATTERN = os.path.join(SCRIPT_DIR, 'qpoll_embedding*.json')
 
-# [출력] Qdrant 업로드용 최종 파일
+# [출력] Qdrant 업로드용 최종 파일 (.npy 입력 -> .npy + .meta.json, JSON 입력 -> JSON)
+OUTPUT_VECTORS_FILE = os.path.join(SCRIPT_DIR, 'qpoll_upload_ready.npy')
 OUTPUT_FILE = os.path.join(SCRIPT_DIR, 'qpoll_upload_ready.json')
 
+# .npy 병합 시 한 번에 복사하는 행 수 (memmap에서 이만큼씩 읽어서 씀)
+MERGE_BATCH_ROWS = 65_536
+
 # --- 2. 헬퍼 함수 ---
 def load_json(path):
-    """JSON 파일을 로드합니다."""
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f) # [ {...}, {...}, ... ]
-    except Exception as e:
-        print(f"  > 파일 로드 오류: {os.path.basename(path)}, {e}")
-        return None
+    """임베딩 파일의 레코드를 하나씩 읽습니다. (NDJSON / JSON 배열 모두 지원)"""
+    return iter_records(path) # [ {...}, {...}, ... ]
 
-# --- 3. 메인 실행 로직 ---
-def main():
-    # 모든 임베딩 객체를 저장할 마스터 리스트
-    master_data = []
-    
-    # 1. 패턴에 맞는 모든 임베딩 파일 찾기
-    embedding_files = glob.glob(INPUT_FILES_PATTERN)
-    if not embedding_files:
-        print(f"오류: '{INPUT_FILES_PATTERN}' 패턴에 맞는 임베딩 파일이 없습니다.")
-        return
 
-    print(f"--- 총 {len(embedding_files)}개의 임베딩 파일 병합 시작 ---")
+def merge_vector_files(vector_files):
+    """
+    .npy + .meta.json 파일들을 하나로 병합합니다.
+    벡터는 np.load(mmap_mode='r')로 복사 없이 읽어 MERGE_BATCH_ROWS 행씩 이어 쓰고, 메타데이터에서는 'topic_id'를 제거합니다.
+    """
+    output_files = [OUTPUT_VECTORS_FILE, metadata_path_for(OUTPUT_VECTORS_FILE)]
+    tmp_output_files = [f"{path}.tmp" for path in output_files]
+    with VectorWriter(*tmp_output_files) as writer:
+        for file_path in vector_files:
+            print(f"  > 처리 중: {os.path.basename(file_path)}")
+
+            count = 0
+            try:
+                rows = len(load_vectors(file_path))
+                metadata_rows = count_metadata_rows(file_path)
+                if rows != metadata_rows:
+                    raise ValueError(f"벡터 {rows}행, 메타데이터 {metadata_rows}개 (행 수 불일치)")
+                for records, vectors in iter_vector_batches(file_path, MERGE_BATCH_ROWS):
+                    for item in records:
+                        # 'topic_id' 키를 제거합니다. (키가 없어도 오류 없음)
+                        item.pop("topic_id", None)
+                    writer.write_many(records, vectors)
+                    count += len(records)
+            except Exception as e:
+                print(f"  > 파일 로드 오류: {os.path.basename(file_path)}, {e}")
+
+            print(f"    - {count}개 데이터 추가 완료 ('topic_id' 제외).")
+    return writer.count, tmp_output_files, output_files
+
 
-    for file_path in embedding_files:
-        print(f"  > 처리 중: {os.path.basename(file_path)}")
-        data_list = load_json(file_path)
-        
-        if isinstance(data_list, list):
+def merge_json_files(embedding_files):
+    """기존 JSON 임베딩 파일들을 하나로 병합합니다."""
+    # 마스터 리스트에 모으지 않고 읽는 대로 최종 파일에 기록
+    # (기본 NDJSON, PIPELINE_JSON_FORMAT=pretty 이면 기존과 같은 한 줄짜리 JSON 배열 - indent 없음)
+    tmp_output_file = f"{OUTPUT_FILE}.tmp"
+    with RecordWriter(tmp_output_file, indent=None) as writer:
+        for file_path in embedding_files:
+            print(f"  > 처리 중: {os.path.basename(file_path)}")
             
             # [수정] .extend() 대신 for 루프로 'topic_id' 제거
             count = 0
-            for item in data_list:
-                # 'topic_id' 키를 제거합니다. (키가 없어도 오류 없음)
-                item.pop("topic_id", None) 
-                master_data.append(item)
-                count += 1
+            try:
+                for item in load_json(file_path):
+                    if not isinstance(item, dict):
+                        continue
+                    # 'topic_id' 키를 제거합니다. (키가 없어도 오류 없음)
+                    item.pop("topic_id", None) 
+                    writer.write(item)
+                    count += 1
+            except Exception as e:
+                print(f"  > 파일 로드 오류: {os.path.basename(file_path)}, {e}")
                 
             print(f"    - {count}개 데이터 추가 완료 ('topic_id' 제외).")
+    return writer.count, [tmp_output_file], [OUTPUT_FILE]
+
+# --- 3. 메인 실행 로직 ---
+def main():
+    parser = argparse.ArgumentParser(description="qpoll_embedding*.npy / .json 임베딩 파일을 업로드용 파일 하나로 병합")
+    parser.add_argument("--format", choices=["auto", "npy", "json"], default="auto",
+                        help="입력 형식. auto: 한 형식만 있으면 그 형식, 둘 다 있으면 더 최근에 만든 쪽 (기본)")
+    args = parser.parse_args()
+
+    # 1. 패턴에 맞는 모든 임베딩 파일 찾기
+    vector_files = glob.glob(INPUT_VECTOR_FILES_PATTERN)
+    embedding_files = [
+        path for path in glob.glob(INPUT_FILES_PATTERN) if not path.endswith(METADATA_SUFFIX)
+    ]
+    if not vector_files and not embedding_files:
+        print(f"오류: '{INPUT_VECTOR_FILES_PATTERN}' / '{INPUT_FILES_PATTERN}' 패턴에 맞는 임베딩 파일이 없습니다.")
+        return
+
+    input_format = args.format
+    if input_format == "auto":
+        if vector_files and embedding_files:
+            input_format = newer_format(vector_files, embedding_files)
+            print(f"경고: .npy 와 JSON 임베딩 파일이 모두 있습니다. 더 최근에 만든 {input_format} 파일을 병합합니다 "
+                  f"(다른 형식은 --format 으로 지정).")
         else:
-            print(f"    - 건너뛰기: 파일 내용이 리스트 형식이 아닙니다.")
+            input_format = "npy" if vector_files else "json"
+
+    if input_format == "npy" and vector_files:
+        print(f"--- 총 {len(vector_files)}개의 임베딩 파일(.npy) 병합 시작 ---")
+        total, tmp_output_files, output_files = merge_vector_files(vector_files)
+    elif input_format == "json" and embedding_files:
+        print(f"--- 총 {len(embedding_files)}개의 임베딩 파일 병합 시작 ---")
+        total, tmp_output_files, output_files = merge_json_files(embedding_files)
+    else:
+        pattern = INPUT_VECTOR_FILES_PATTERN if input_format == "npy" else INPUT_FILES_PATTERN
+        print(f"오류: '{pattern}' 패턴에 맞는 임베딩 파일이 없습니다.")
+        return
 
     # --- 최종 파일 저장 ---
-    if not master_data:
+    if total == 0:
+        for tmp_path in tmp_output_files:
+            os.remove(tmp_path)
         print("\n병합할 데이터가 없습니다.")
         return
 
     print(f"\n--- 최종 파일 저장 중 ---")
-    try:
-        # indent=4 제외 (파일 크기 절약)
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(master_data, f, ensure_ascii=False)
-        
-        print(f"성공! 총 {len(master_data)}개의 벡터가 '{OUTPUT_FILE}'에 저장되었습니다.")
-        
-    except Exception as e:
-        print(f"최종 파일 저장 오류: {e}")
+    for tmp_path, path in zip(tmp_output_files, output_files):
+        os.replace(tmp_path, path)
+    print(f"성공! 총 {total}개의 벡터가 {', '.join(repr(path) for path in output_files)}에 저장되었습니다.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,208 @@
+import os
+import json
+import argparse
+
+import numpy as np
+
+# ONNX Runtime CPU 추론 백엔드 (KURE-v1)
+#
+# SentenceTransformer 모델의 트랜스포머 부분을 ONNX로 내보내고 (선택: 동적 int8 양자화),
+# 풀링 / 정규화는 원래 모델 설정(encoder_config.json)대로 numpy로 계산한다.
+# OnnxEncoder는 SentenceTransformer와 같은 encode(list[str]) -> ndarray / tokenizer / max_seq_length 를 제공하므로
+# sentence_encoder.py 의 배치 방식 / 워커 풀에서 그대로 사용할 수 있다.
+#
+# 1) 내보내기 (torch / sentence-transformers 필요, 한 번만): python embedding/onnx_encoder.py export [--quantize]
+# 2) 추론 (onnxruntime / transformers 필요): qpoll_embedding.py --backend onnx | onnx-int8
+#
+# 실험적: 실제 모델에서 PyTorch 벡터와의 일치도(benchmarks/compare_onnx_encoder.py)는 아직 확인하지 않았다.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/embedding
+MODEL_ID = "nlpai-lab/KURE-v1"
+DEFAULT_ONNX_DIR = os.path.join(SCRIPT_DIR, 'onnx_models', 'KURE-v1')
+
+FP32_FILE = 'model.onnx'
+INT8_FILE = 'model_int8.onnx'
+CONFIG_FILE = 'encoder_config.json'
+
+# --backend 이름 -> ONNX 파일 (torch는 SentenceTransformer 그대로)
+BACKENDS = ("torch", "onnx", "onnx-int8")
+ONNX_FILES = {"onnx": FP32_FILE, "onnx-int8": INT8_FILE}
+
+POOLING_MODES = ("cls", "mean")
+
+
+# --- 1. 내보내기 ---
+
+def export_onnx(model_id=MODEL_ID, output_dir=DEFAULT_ONNX_DIR, quantize=False, opset=17):
+    """Exports the transformer of a SentenceTransformer model to ONNX (and an int8 copy if quantize)."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Pooling, Normalize
+
+    st_model = SentenceTransformer(model_id, device="cpu")
+    pooling = next(module for module in st_model if isinstance(module, Pooling))
+    pooling_mode = pooling.get_pooling_mode_str()
+    if pooling_mode not in POOLING_MODES:
+        raise ValueError(f"unsupported pooling mode for ONNX export: {pooling_mode}")
+
+    class TransformerOnly(torch.nn.Module):
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, input_ids, attention_mask):
+            return self.auto_model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, FP32_FILE)
+    dummy = st_model.tokenizer(["예시 문장입니다.", "두 번째 예시 문장"], padding=True, return_tensors="pt")
+    with torch.no_grad():
+        # 2GB가 넘는 가중치는 torch가 같은 폴더에 external data 파일로 저장한다
+        torch.onnx.export(
+            TransformerOnly(st_model[0].auto_model).eval(),
+            (dummy["input_ids"], dummy["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=opset,
+        )
+    st_model.tokenizer.save_pretrained(output_dir)
+    config = {
+        "model_id": model_id,
+        "pooling": pooling_mode,
+        "normalize": any(isinstance(module, Normalize) for module in st_model),
+        "max_seq_length": st_model.max_seq_length,
+    }
+    with open(os.path.join(output_dir, CONFIG_FILE), 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=4)
+    print(f"ONNX 저장: {fp32_path} (pooling={pooling_mode}, normalize={config['normalize']})")
+
+    if quantize:
+        quantize_int8(output_dir)
+
+
+def quantize_int8(onnx_dir=DEFAULT_ONNX_DIR):
+    """Dynamic int8 quantization of the exported fp32 model (weights int8, activations quantized at runtime)."""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    fp32_path = os.path.join(onnx_dir, FP32_FILE)
+    int8_path = os.path.join(onnx_dir, INT8_FILE)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8, use_external_data_format=True)
+    print(f"int8 양자화 저장: {int8_path}")
+
+
+# --- 2. 추론 ---
+
+class OnnxEncoder:
+    """
+    ONNX Runtime version of SentenceTransformer.encode for an exported model directory.
+    encode(sentences) -> float32 array (pooling / normalization as in the original model).
+    """
+
+    def __init__(self, onnx_dir=DEFAULT_ONNX_DIR, quantized=False, threads=None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = os.path.join(onnx_dir, INT8_FILE if quantized else FP32_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"'{model_path}' 이 없습니다. 먼저 'python embedding/onnx_encoder.py export"
+                f"{' --quantize' if quantized else ''}' 를 실행하세요."
+            )
+        with open(os.path.join(onnx_dir, CONFIG_FILE), encoding='utf-8') as f:
+            config = json.load(f)
+        self.pooling = config["pooling"]
+        self.normalize = config["normalize"]
+        self.max_seq_length = config["max_seq_length"]
+        self.tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+
+    def encode_batch(self, sentences):
+        inputs = self.tokenizer(list(sentences), padding=True, truncation=True,
+                                max_length=self.max_seq_length, return_tensors="np")
+        mask = inputs["attention_mask"].astype(np.int64)
+        hidden = self.session.run(
+            ["last_hidden_state"],
+            {"input_ids": inputs["input_ids"].astype(np.int64), "attention_mask": mask},
+        )[0]
+
+        if self.pooling == "cls":
+            vectors = hidden[:, 0]
+        else:
+            weights = mask[:, :, None].astype(hidden.dtype)
+            vectors = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors.astype(np.float32, copy=False)
+
+    def encode(self, sentences, batch_size=64, show_progress_bar=False):
+        """
+        Same call shape as SentenceTransformer.encode (show_progress_bar is ignored).
+        Like SentenceTransformer, sentences are batched longest first and returned in input order.
+        """
+        sentences = list(sentences)
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+        order = np.argsort([-len(sentence) for sentence in sentences], kind='stable')
+        vectors = None
+        for start in range(0, len(order), batch_size):
+            positions = order[start:start + batch_size]
+            batch_vectors = self.encode_batch([sentences[i] for i in positions])
+            if vectors is None:
+                vectors = np.empty((len(sentences), batch_vectors.shape[1]), dtype=np.float32)
+            vectors[positions] = batch_vectors
+        return vectors
+
+
+def load_encoder_model(backend, model_id=MODEL_ID, onnx_dir=DEFAULT_ONNX_DIR, threads=None, device=None):
+    """
+    SentenceTransformer (backend 'torch') or OnnxEncoder ('onnx' / 'onnx-int8') with the same encode interface.
+    threads fixes the intra-op thread count of either backend (torch.set_num_threads / onnxruntime session).
+    """
+    if backend == "torch":
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_id, device=device)
+    if backend not in ONNX_FILES:
+        raise ValueError(f"unknown backend: {backend} (choose from {', '.join(BACKENDS)})")
+    return OnnxEncoder(onnx_dir, quantized=backend == "onnx-int8", threads=threads)
+
+
+def cache_model_id(model_id, backend):
+    """Embedding cache key for vectors of this backend (ONNX / int8 vectors are not mixed with torch vectors)."""
+    return model_id if backend == "torch" else f"{model_id}#{backend}"
+
+
+# --- 3. 메인 실행 로직 ---
+
+def main():
+    parser = argparse.ArgumentParser(description="KURE-v1 -> ONNX 내보내기 / int8 양자화")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="SentenceTransformer 모델을 ONNX로 내보내기")
+    export_parser.add_argument("--model", default=MODEL_ID, help=f"모델 ID (기본: {MODEL_ID})")
+    export_parser.add_argument("--out", default=DEFAULT_ONNX_DIR, help=f"저장 폴더 (기본: {DEFAULT_ONNX_DIR})")
+    export_parser.add_argument("--quantize", action="store_true", help="동적 int8 양자화 모델도 저장")
+    quantize_parser = subparsers.add_parser("quantize", help="이미 내보낸 ONNX 모델을 int8로 양자화")
+    quantize_parser.add_argument("--dir", default=DEFAULT_ONNX_DIR, help=f"ONNX 폴더 (기본: {DEFAULT_ONNX_DIR})")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_onnx(args.model, args.out, args.quantize)
+    else:
+        quantize_int8(args.dir)
+
+
+if __name__ == '__main__':
+    main()
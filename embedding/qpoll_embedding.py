@@ -1,6 +1,6 @@
 import os
-import json
-from sentence_transformers import SentenceTransformer # [수정] API 대신 라이브러리 import
+import sys
+import argparse
 from tqdm import tqdm # 진행률 표시
 import numpy as np # [신규] 벡터를 리스트로 변환하기 위해 import
 
@@ -9,6 +9,13 @@ import numpy as np # [신규] 벡터를 리스트로 변환하기 위해 import
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__)) # .../infra/embedding
 # 상위 'infra' 폴더
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR) # .../infra
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.json_io import iter_records, iter_batches, RecordWriter
+from common.vector_file import VectorWriter, metadata_path_for
+from common.embedding_cache import EmbeddingCache, DEFAULT_CACHE_PATH, DEFAULT_MAX_MB
+from sentence_encoder import ENCODERS, EncoderPool, default_processes, default_threads
+from onnx_encoder import BACKENDS, DEFAULT_ONNX_DIR, load_encoder_model, cache_model_id
 
 # [입력] master_qpoll_input.json 파일의 정확한 경로
 INPUT_FILE = os.path.join(
@@ -19,6 +26,8 @@ INPUT_FILE = os.path.join(
 )
 
 # [출력] 임베딩 결과는 이 스크립트와 동일한 폴더에 저장
+# 기본: float32 행렬(.npy) + 행 순서가 같은 메타데이터(.meta.json), --format json 이면 기존 JSON 파일
+OUTPUT_VECTORS_FILE = os.path.join(SCRIPT_DIR, 'qpoll_embeddings.npy')
 OUTPUT_FILE = os.path.join(SCRIPT_DIR, 'qpoll_embeddings.json')
 
 # [모델 설정]
@@ -28,82 +37,224 @@ MODEL_ID = "nlpai-lab/KURE-v1"
 # [성능 설정]
 BATCH_SIZE = 64 # 한 번에 모델이 처리할 문장 수
 
+# [중복 문장 제거] qpoll 답변은 대부분 선택형이라 같은 문장이 패널마다 반복된다
+# 레코드를 DEDUP_CHUNK_SIZE개씩 읽어서 처음 보는 문장만 한 번씩 인코딩하고, 같은 문장의 행에는 같은 벡터를 쓴다
+DEDUP_CHUNK_SIZE = 4096
+# 기억해 두는 (문장 -> 벡터) 최대 개수 (1024차원 float32 기준 약 2GB), 넘으면 새 문장은 청크 안에서만 재사용
+MAX_DEDUP_SENTENCES = 500_000
+
+# [임베딩 캐시] 이전 실행에서 인코딩한 문장은 디스크 캐시에서 가져오고, 없는 문장만 모델에 넣는다
+# model.encode 기본값(normalize_embeddings=False)으로 만든 벡터이므로 'none'
+CACHE_NORMALIZATION = "none"
+
+
+# --- 2. 입력 ---
+
+def iter_input_records(from_qpoll_json):
+    """
+    Merged sentence records {panel_id, question, sentence}.
+    from_qpoll_json: generate them straight from the qpoll JSON files (embedding_preprocessing/qpoll_json_to_text.py)
+    instead of reading merged_qpoll_text.json, so the preprocessing files are not written / parsed again.
+    """
+    if from_qpoll_json:
+        sys.path.insert(0, os.path.join(PROJECT_ROOT, 'embedding_preprocessing'))
+        from qpoll_json_to_text import iter_merged_sentences
+        return iter_merged_sentences()
+    return iter_records(INPUT_FILE)
+
 
-# --- 2. 메인 실행 로직 ---
+# --- 3. 메인 실행 로직 ---
 
 def main():
-    print(f"입력 파일 로드 중: {INPUT_FILE}")
-    try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-            master_data = json.load(f) # [ {panel_id: ..., sentence: ...}, ... ]
-        if not master_data:
-            print("오류: 파일에 데이터가 없습니다.")
+    parser = argparse.ArgumentParser(description="merged_qpoll_text.json -> qpoll_embeddings.npy (+ .meta.json)")
+    parser.add_argument(
+        "--from-qpoll-json", action="store_true",
+        help="merged_qpoll_text.json 대신 qpoll_json_output/*.json 에서 문장을 바로 만들어 임베딩 (문장 파일 생략)"
+    )
+    parser.add_argument("--no-dedup", dest="dedup", action="store_false",
+                        help="중복 문장도 행마다 다시 인코딩 (기존 방식, 비교용)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help=f"임베딩 캐시 파일 (기본: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_MB,
+                        help=f"캐시 최대 크기, 넘으면 오래 사용하지 않은 벡터부터 삭제 (기본: {DEFAULT_MAX_MB} MB)")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="임베딩 캐시를 사용하지 않음")
+    parser.add_argument("--batching", choices=["length", "file"], default="length",
+                        help="length: 청크 전체를 model.encode 한 번에 넘겨 모델이 길이 순으로 배치 (기본), "
+                             "file: 파일 순서대로 BATCH_SIZE개씩 따로 인코딩")
+    parser.add_argument("--processes", type=int,
+                        help="인코딩 워커 프로세스 수 (기본: 코어 수 / 워커당 스레드 수, 1이면 이 프로세스에서 인코딩)")
+    parser.add_argument("--threads-per-process", type=int,
+                        help="워커 한 개의 torch / onnxruntime 스레드 수 (기본: 코어 수 / 워커 수). 워커가 1개면 이 프로세스의 스레드 수")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch",
+                        help="torch: SentenceTransformer (기본), onnx / onnx-int8: ONNX Runtime (실험적, 실제 모델로 검증 전. "
+                             "onnx_encoder.py export 필요)")
+    parser.add_argument("--onnx-dir", default=DEFAULT_ONNX_DIR, help=f"ONNX 모델 폴더 (기본: {DEFAULT_ONNX_DIR})")
+    parser.add_argument("--format", choices=["npy", "json"], default="npy",
+                        help="npy: qpoll_embeddings.npy + qpoll_embeddings.meta.json (기본), json: 벡터까지 JSON에 기록 (기존 방식)")
+    args = parser.parse_args()
+
+    processes = args.processes or default_processes()
+    threads_per_process = args.threads_per_process or default_threads(processes)
+
+    if not args.from_qpoll_json:
+        print(f"입력 파일 확인 중: {INPUT_FILE}")
+        if not os.path.exists(INPUT_FILE):
+            print(f"파일 로드 오류: '{INPUT_FILE}' 파일이 없습니다.")
             return
-    except Exception as e:
-        print(f"파일 로드 오류: {e}")
-        return
 
-    print(f"총 {len(master_data)}개의 문장을 임베딩합니다 (배치 크기: {BATCH_SIZE})...")
+    # 입력은 전체를 메모리에 올리지 않고 배치 단위로 읽는다 ([ {panel_id: ..., sentence: ...}, ... ])
+    print(f"문장을 배치 단위로 읽어 임베딩합니다 (배치 크기: {BATCH_SIZE})...")
 
     # 1. [신규] 로컬에서 Sentence Transformer 모델 로드
     # (처음 실행 시 모델을 다운로드하므로 시간이 걸릴 수 있습니다)
+    # --processes 2 이상이면 워커 프로세스마다 모델을 한 번씩 로드하고 문장을 나눠서 인코딩 (결과는 입력 순서대로)
+    encoder_pool = None
     try:
-        print(f"Hugging Face 모델 로드 중: {MODEL_ID}")
-        # device='cuda'를 추가하면 GPU 사용 (GPU가 있는 경우)
-        model = SentenceTransformer(MODEL_ID) 
+        print(f"Hugging Face 모델 로드 중: {MODEL_ID} (backend: {args.backend})")
+        if processes > 1:
+            print(f"인코딩 워커 {processes}개, 워커당 스레드 {threads_per_process}개")
+            encoder_pool = EncoderPool(MODEL_ID, processes, threads_per_process, BATCH_SIZE, args.batching,
+                                       args.backend, args.onnx_dir)
+            encoder_pool.encode(["모델 로드 확인"] * processes) # 워커 모델 로드 실패를 여기서 확인
+            encoder_pool.stats.clear()
+            encode_batches = encoder_pool.encode
+        else:
+            # device='cuda'를 추가하면 GPU 사용 (GPU가 있는 경우)
+            model = load_encoder_model(args.backend, MODEL_ID, args.onnx_dir, threads=args.threads_per_process)
+            encode_batches = ENCODERS[args.batching](model, BATCH_SIZE)
         print("모델 로드 완료.")
     except Exception as e:
+        if encoder_pool is not None:
+            encoder_pool.close()
         print(f"모델 로드 실패: {e}")
-        print("'pip install sentence-transformers torch'가 올바르게 설치되었는지 확인하세요.")
+        print("'pip install sentence-transformers torch' (onnx 백엔드는 'pip install onnxruntime transformers')가 올바르게 설치되었는지 확인하세요.")
         return
 
-    # 최종 임베딩 결과를 저장할 리스트
-    embedded_data = []
-
     # 2. [수정] tqdm을 사용하여 배치 처리
     # (API 호출 대신 model.encode() 사용)
-    for i in tqdm(range(0, len(master_data), BATCH_SIZE), desc="임베딩 진행 중"):
-        
-        batch = master_data[i : i + BATCH_SIZE]
-        texts_to_embed = [item["sentence"] for item in batch]
-        
-        try:
-            # 3. [핵심] 로컬에서 임베딩 수행 (API 호출 대체)
-            # show_progress_bar=False (tqdm이 이미 외부 진행률 표시 중)
-            vectors_batch = model.encode(texts_to_embed, show_progress_bar=False)
-            
-            # 4. [신규] 결과를 JSON 저장을 위해 numpy array -> python list로 변환
-            vectors_batch_list = [v.tolist() for v in vectors_batch]
-            
-            # 5. 메타데이터와 벡터를 결합
-            for idx, item in enumerate(batch):
-                embedded_data.append({
-                    "panel_id": item.get("panel_id"),
-                    "topic_id": item.get("topic_id"),
-                    "question": item.get("question"),
-                    "sentence": item.get("sentence"),
-                    "vector": vectors_batch_list[idx] # 로컬에서 생성된 벡터
-                })
-                
-        except Exception as e:
-            print(f"  > 배치 {i // BATCH_SIZE + 1} 임베딩 중 오류 발생: {e}")
-            continue
+    # 임베딩 결과는 리스트에 모으지 않고 배치가 끝날 때마다 바로 기록
+    # npy: 벡터는 float32 행렬, 나머지 필드는 메타데이터 파일 (기본 NDJSON)
+    # json: 기본 NDJSON, PIPELINE_JSON_FORMAT=pretty 이면 기존과 같은 한 줄짜리 JSON 배열 - 파일 크기 절약을 위해 indent 없음
+    if args.format == "npy":
+        output_files = [OUTPUT_VECTORS_FILE, metadata_path_for(OUTPUT_VECTORS_FILE)]
+    else:
+        output_files = [OUTPUT_FILE]
+    tmp_output_files = [f"{path}.tmp" for path in output_files]
+    vector_cache = {} # 문장 -> 벡터 (이번 실행에서 이미 인코딩한 문장)
+    requested_count = 0 # 중복 제거 후 캐시 / 모델에 요청한 문장 수 (--no-dedup 이면 행 수와 같음)
+    encoded_count = 0 # 실제로 모델에 넣은 문장 수 (캐시 적중 제외)
+    # 길이 정렬은 여러 배치를 한꺼번에 넘겨야 효과가 있으므로, 파일 순서 + 중복 제거 없음(기존 방식)일 때만 BATCH_SIZE개씩 읽는다
+    chunk_size = DEDUP_CHUNK_SIZE if args.dedup or args.batching == "length" else BATCH_SIZE
+
+    cache = None
+    if args.use_cache:
+        cache = EmbeddingCache(cache_model_id(MODEL_ID, args.backend), CACHE_NORMALIZATION, args.cache, args.cache_max_mb * 1024 * 1024)
+        print(f"임베딩 캐시: {args.cache} ({cache.stored_bytes / 1024 / 1024:.1f} MB)")
+
+    def model_encode(texts):
+        nonlocal encoded_count
+        vectors = encode_batches(texts)
+        encoded_count += len(texts)
+        return vectors
+
+    def encode(texts, use_cache=True):
+        nonlocal requested_count
+        # 캐시에 없는 문장만 모델에 넣는다
+        if cache is None or not use_cache:
+            vectors = model_encode(texts)
+        else:
+            vectors = cache.encode(texts, model_encode)
+        requested_count += len(texts)
+        return vectors
+
+    def embed(texts, use_cache=True):
+        """Vectors for texts (row order); with dedup, each new sentence is encoded once."""
+        if not args.dedup:
+            return encode(texts, use_cache)
+        # 처음 보는 문장만 한 번씩 인코딩 (모델에는 BATCH_SIZE개씩)
+        new_texts = [text for text in dict.fromkeys(texts) if text not in vector_cache]
+        new_vectors = {}
+        if new_texts:
+            new_vectors = dict(zip(new_texts, encode(new_texts, use_cache)))
+        vectors = [new_vectors[text] if text in new_vectors else vector_cache[text] for text in texts]
+        if len(vector_cache) < MAX_DEDUP_SENTENCES:
+            vector_cache.update(new_vectors)
+        return vectors
+
+    try:
+        if args.format == "npy":
+            output_writer = VectorWriter(*tmp_output_files)
+        else:
+            output_writer = RecordWriter(tmp_output_files[0], indent=None)
+        with output_writer as writer:
+            records = iter_input_records(args.from_qpoll_json)
+            for batch_index, batch in enumerate(tqdm(iter_batches(records, chunk_size), desc="임베딩 진행 중")):
+                texts_to_embed = [item["sentence"] for item in batch]
+
+                # 3. [핵심] 로컬에서 임베딩 수행 (API 호출 대체)
+                # 배치를 건너뛰면 출력에서 최대 DEDUP_CHUNK_SIZE개 행이 빠진 채로 성공처럼 끝나므로,
+                # 실패하면 캐시 없이 한 번 더 시도하고 그래도 실패하면 전체를 실패로 끝낸다
+                try:
+                    vectors_batch = embed(texts_to_embed)
+                except Exception as e:
+                    if cache is None:
+                        raise RuntimeError(f"배치 {batch_index + 1} 임베딩 실패: {e}") from e
+                    print(f"  > 배치 {batch_index + 1} 임베딩 중 오류 발생: {e} (임베딩 캐시 없이 다시 시도)")
+                    try:
+                        vectors_batch = embed(texts_to_embed, use_cache=False)
+                    except Exception as retry_error:
+                        raise RuntimeError(f"배치 {batch_index + 1} 임베딩 실패 (캐시 없이 다시 시도해도 실패): {retry_error}") from retry_error
+                # 4. numpy array는 그대로 넘긴다 (orjson은 tolist() 없이 직렬화, 표준 json 코덱은 내부에서 tolist())
+
+                # 5. 메타데이터와 벡터를 결합 (같은 문장의 행은 같은 벡터)
+                metadata = [
+                    {
+                        "panel_id": item.get("panel_id"),
+                        "topic_id": item.get("topic_id"),
+                        "question": item.get("question"),
+                        "sentence": item.get("sentence"),
+                    }
+                    for item in batch
+                ]
+                if args.format == "npy":
+                    writer.write_many(metadata, vectors_batch) # i번째 메타데이터 = i번째 벡터 행
+                else:
+                    for record, vector in zip(metadata, vectors_batch):
+                        record["vector"] = vector # 로컬에서 생성된 벡터
+                        writer.write(record)
+    except Exception as e:
+        print(f"임베딩 실패: {e}")
+        for tmp_path in tmp_output_files:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        sys.exit(1)
+    finally:
+        if cache is not None:
+            cache.close()
+        if encoder_pool is not None:
+            encoder_pool.close()
 
     # --- 최종 파일 저장 ---
-    if not embedded_data:
+    if writer.count == 0:
+        for tmp_path in tmp_output_files:
+            os.remove(tmp_path)
         print("\n임베딩된 데이터가 없습니다.")
         return
 
-    print(f"\n--- 임베딩 완료. 총 {len(embedded_data)}개 벡터 파일 저장 중 ---")
-    try:
-        # indent=4 제외 (파일 크기 절약)
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(embedded_data, f, ensure_ascii=False) 
-        
-        print(f"성공! 임베딩 결과가 '{OUTPUT_FILE}'에 저장되었습니다.")
-        
-    except Exception as e:
-        print(f"최종 파일 저장 오류: {e}")
+    for tmp_path, path in zip(tmp_output_files, output_files):
+        os.replace(tmp_path, path)
+    print(f"\n--- 임베딩 완료. 총 {writer.count}개 벡터 ---")
+    # 중복 제거와 임베딩 캐시의 효과를 따로 출력 (행 수 -> 중복 제거 후 문장 수 -> 캐시 적중을 뺀 인코딩 수)
+    print(f"인코딩한 문장: {encoded_count}개 / {writer.count}행")
+    if args.dedup:
+        print(f"  > 중복 제거: {writer.count}행 -> 문장 {requested_count}개 "
+              f"(중복 제거율 {1 - requested_count / writer.count:.1%}, {writer.count / max(requested_count, 1):.1f}배 감소)")
+    if cache is not None:
+        print(f"  > 임베딩 캐시 적중: {requested_count - encoded_count}개 / {requested_count}개 문장")
+    if cache is not None:
+        print(cache.format_stats())
+    if encoder_pool is not None:
+        print(encoder_pool.format_stats())
+    print(f"성공! 임베딩 결과가 {', '.join(repr(path) for path in output_files)}에 저장되었습니다.")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,153 @@
+import os
+import time
+import contextlib
+import multiprocessing
+
+import numpy as np
+
+from common.process_pool import default_workers
+from onnx_encoder import load_encoder_model, DEFAULT_ONNX_DIR
+
+# 문장 인코딩 보조 함수
+#
+# 길이 정렬 배치: 파일 순서대로 BATCH_SIZE개씩 자르면 짧은 문장("전통시장을 전혀 방문하지 않는다.")과
+# 답변이 여러 개 이어진 긴 문장이 한 배치에 섞이고, 트랜스포머는 배치 안의 가장 긴 문장 길이까지 padding 한다.
+# SentenceTransformer.encode (와 OnnxEncoder.encode)는 한 번의 호출 안에서 문장을 길이 순으로 정렬해 배치를 만들고
+# 결과는 입력 순서로 돌려주므로, 여러 배치 분량의 문장을 한 번에 넘기기만 하면 된다.
+#
+# 다중 프로세스 인코딩 (EncoderPool): GPU가 없는 서버에서는 모델 하나가 모든 코어를 쓰지 못하므로,
+# 워커 프로세스마다 모델을 한 번 로드하고 (스레드 수 고정) 문장을 나눠서 인코딩한 뒤 입력 순서대로 합친다.
+
+# 워커 한 개가 쓰는 스레드 수 기본값 (워커 수 = 코어 수 / 이 값)
+DEFAULT_THREADS_PER_PROCESS = 4
+
+
+def length_sorted_encoder(model, batch_size):
+    """
+    encode(sentences) -> vectors in input order, in one model.encode call:
+    the model sorts the sentences by length and batches similar lengths together.
+    """
+    def encode(sentences):
+        return model.encode(sentences, batch_size=batch_size, show_progress_bar=False)
+
+    return encode
+
+
+def file_order_encoder(model, batch_size):
+    """encode(sentences) -> vectors, one model.encode call per batch_size sentences in input order (previous behaviour)."""
+    def encode(sentences):
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate([
+            np.asarray(model.encode(sentences[start:start + batch_size], batch_size=batch_size, show_progress_bar=False))
+            for start in range(0, len(sentences), batch_size)
+        ])
+
+    return encode
+
+
+ENCODERS = {"length": length_sorted_encoder, "file": file_order_encoder}
+
+
+# --- 다중 프로세스 인코딩 ---
+
+def default_processes(threads_per_process=DEFAULT_THREADS_PER_PROCESS):
+    """Number of encoding workers so that workers x threads_per_process fills the available cores."""
+    return max(1, default_workers() // threads_per_process)
+
+
+def default_threads(processes):
+    """torch threads per worker so that the workers share the available cores."""
+    return max(1, default_workers() // processes)
+
+
+# 워커 프로세스 안에서만 사용 (_init_worker에서 설정)
+_worker_encode = None
+_worker_error = None
+
+
+def _init_worker(model_id, threads, batch_size, batching, backend, onnx_dir):
+    global _worker_encode, _worker_error
+    # OMP / MKL 스레드 수는 부모가 환경 변수로 넘겨준다 (_thread_env). torch 스레드 수는 load_encoder_model에서 고정
+    try:
+        model = load_encoder_model(backend, model_id, onnx_dir, threads=threads, device="cpu")
+        _worker_encode = ENCODERS[batching](model, batch_size)
+    except Exception as e:
+        # 초기화에서 예외가 나면 Pool이 워커를 계속 다시 만들기 때문에, 저장해 두었다가 인코딩 요청에서 알린다
+        _worker_error = f"{type(e).__name__}: {e}"
+
+
+@contextlib.contextmanager
+def _thread_env(threads):
+    """
+    Sets OMP_NUM_THREADS / MKL_NUM_THREADS in this process for the duration of the block.
+    Processes spawned inside it start with these values, before they import numpy / torch.
+    """
+    names = ("OMP_NUM_THREADS", "MKL_NUM_THREADS")
+    previous = {name: os.environ.get(name) for name in names}
+    os.environ.update({name: str(threads) for name in names})
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _encode_in_worker(sentences):
+    if _worker_error is not None:
+        raise RuntimeError(f"워커 모델 로드 실패: {_worker_error}")
+    start = time.perf_counter()
+    vectors = _worker_encode(sentences)
+    return os.getpid(), vectors, time.perf_counter() - start
+
+
+class EncoderPool:
+    """
+    encode(sentences) -> vectors in input order, split across worker processes.
+    Every worker loads the model (torch or ONNX backend) once and uses threads_per_process threads.
+    """
+
+    def __init__(self, model_id, processes, threads_per_process, batch_size, batching="length",
+                 backend="torch", onnx_dir=DEFAULT_ONNX_DIR):
+        self.processes = processes
+        self.threads_per_process = threads_per_process
+        # 이번 실행에서 워커별 (인코딩한 문장 수, 인코딩 시간)
+        self.stats = {}
+        # fork는 부모의 torch 스레드 상태를 물려받아 멈출 수 있으므로 spawn
+        context = multiprocessing.get_context("spawn")
+        # 워커는 numpy를 import하기 전에 OpenMP / MKL 스레드 풀을 만들므로, 스레드 수는 워커를 띄울 때 환경 변수로 넘긴다
+        with _thread_env(threads_per_process):
+            self.pool = context.Pool(processes, initializer=_init_worker,
+                                     initargs=(model_id, threads_per_process, batch_size, batching, backend, onnx_dir))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def encode(self, sentences):
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+        # 연속된 구간으로 나눠 워커 수만큼 보낸다 (map은 입력 순서대로 결과를 돌려줌)
+        part_size = -(-len(sentences) // self.processes)
+        parts = [sentences[start:start + part_size] for start in range(0, len(sentences), part_size)]
+        results = self.pool.map(_encode_in_worker, parts, chunksize=1)
+        for (pid, vectors, elapsed), part in zip(results, parts):
+            count, seconds = self.stats.get(pid, (0, 0.0))
+            self.stats[pid] = (count + len(part), seconds + elapsed)
+        return np.concatenate([vectors for _, vectors, _ in results])
+
+    def format_stats(self):
+        lines = [f"인코딩 워커 {len(self.stats)}개 (워커당 스레드 {self.threads_per_process})"]
+        for pid, (count, seconds) in sorted(self.stats.items()):
+            lines.append(f"  > 워커 {pid}: {count}문장, {seconds:.1f}s, {count / max(seconds, 1e-9):.1f} 문장/초")
+        return "\n".join(lines)
@@ -1,13 +1,22 @@
 import os
-import json
+import sys
+import argparse
+from itertools import chain
 from qdrant_client import QdrantClient, models
 from uuid import uuid4
 from tqdm import tqdm # 진행률 표시
 
 # --- 1. 경로 및 설정 ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from common.json_io import iter_records, iter_batches
+from common.vector_file import load_vectors, iter_vector_batches, count_metadata_rows, newer_format
 
 # [입력] 임베딩이 완료된 파일
+# .npy (+ .meta.json) 는 벡터를 np.load(mmap_mode='r')로 복사 없이 읽는다. 기존 JSON 파일도 지원
+# 두 형식이 모두 있으면 --format 으로 고르고, 지정하지 않으면 더 최근에 만든 쪽을 사용 (경고 출력)
+INPUT_VECTORS_FILE = os.path.join(SCRIPT_DIR, 'qpoll_upload_ready.npy')
 INPUT_FILE = os.path.join(SCRIPT_DIR, 'qpoll_upload_ready.json')
 
 # [Qdrant 설정]
@@ -51,29 +60,70 @@ def setup_qdrant_collection(client, collection_name, vector_size):
         print(f"Qdrant 컬렉션 설정 오류: {e}")
         raise
 
-# --- 3. 메인 실행 로직 ---
+# --- 3. 입력 ---
+
+def iter_json_batches(records, batch_size):
+    """기존 JSON 입력: (레코드 리스트, 벡터 리스트) 배치"""
+    for batch in iter_batches(records, batch_size):
+        yield batch, [item["vector"] for item in batch]
+
+
+def choose_input_format(requested):
+    """'npy' / 'json' 중 업로드할 입력 형식 (auto: 있는 쪽, 둘 다 있으면 더 최근에 만든 쪽)"""
+    if requested != "auto":
+        return requested
+    has_npy, has_json = os.path.exists(INPUT_VECTORS_FILE), os.path.exists(INPUT_FILE)
+    if has_npy and has_json:
+        input_format = newer_format([INPUT_VECTORS_FILE], [INPUT_FILE])
+        print(f"경고: '{os.path.basename(INPUT_VECTORS_FILE)}' 와 '{os.path.basename(INPUT_FILE)}' 이 모두 있습니다. "
+              f"더 최근에 만든 {input_format} 파일을 업로드합니다 (다른 형식은 --format 으로 지정).")
+        return input_format
+    return "npy" if has_npy else "json"
+
+
+def open_input(input_format):
+    """(벡터 차원, (메타데이터 리스트, 벡터) 배치 iterator), 데이터가 없으면 None"""
+    if input_format == "npy":
+        print(f"입력 파일 로드 중: {INPUT_VECTORS_FILE} (memmap)")
+        vectors = load_vectors(INPUT_VECTORS_FILE)
+        # 컬렉션을 재생성하기 전에 벡터 행 수와 메타데이터 수가 맞는지 확인
+        metadata_rows = count_metadata_rows(INPUT_VECTORS_FILE)
+        if metadata_rows != len(vectors):
+            raise ValueError(f"벡터 {len(vectors)}행, 메타데이터 {metadata_rows}개 (행 수 불일치)")
+        if len(vectors) == 0:
+            return None
+        return vectors.shape[1], iter_vector_batches(INPUT_VECTORS_FILE, BATCH_SIZE)
 
-def main():
     print(f"입력 파일 로드 중: {INPUT_FILE}")
+    # 전체를 메모리에 올리지 않고 한 레코드씩 읽는다 ([ {panel_id: ..., vector: [...]}, ... ])
+    records = iter_records(INPUT_FILE)
+    first_item = next(records, None)
+    if first_item is None:
+        return None
+    return len(first_item["vector"]), iter_json_batches(chain([first_item], records), BATCH_SIZE)
+
+
+# --- 4. 메인 실행 로직 ---
+
+def main():
+    parser = argparse.ArgumentParser(description="qpoll 임베딩 파일을 Qdrant 컬렉션에 업로드")
+    parser.add_argument("--format", choices=["auto", "npy", "json"], default="auto",
+                        help="입력 형식. auto: 한 형식만 있으면 그 형식, 둘 다 있으면 더 최근에 만든 쪽 (기본)")
+    args = parser.parse_args()
+
+    # 1. 입력 파일 열기 및 벡터 크기(dimension) 확인
     try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-            embedded_data = json.load(f) # [ {panel_id: ..., vector: [...]}, ... ]
-        if not embedded_data:
+        opened = open_input(choose_input_format(args.format))
+        if opened is None:
             print("오류: 파일에 데이터가 없습니다.")
             return
+        VECTOR_DIMENSION, embedded_batches = opened
+        print(f"벡터 차원(Dimension) 확인: {VECTOR_DIMENSION}")
     except Exception as e:
         print(f"파일 로드 오류: {e}")
         return
 
-    print(f"총 {len(embedded_data)}개의 벡터를 Qdrant에 업로드합니다.")
-
-    # 1. 벡터 크기(dimension) 확인
-    try:
-        VECTOR_DIMENSION = len(embedded_data[0]["vector"])
-        print(f"벡터 차원(Dimension) 확인: {VECTOR_DIMENSION}")
-    except Exception as e:
-        print(f"오류: 첫 번째 데이터에서 벡터를 읽을 수 없습니다. {e}")
-        return
+    print(f"벡터를 {BATCH_SIZE}개 단위로 읽어 Qdrant에 업로드합니다.")
 
     # 2. Qdrant 클라이언트 연결 및 컬렉션 설정
     try:
@@ -87,12 +137,11 @@ def main():
     print(f"--- {BATCH_SIZE}개 단위로 Qdrant 업로드 시작 ---")
     
     # tqdm을 사용하여 진행률 표시
-    for i in tqdm(range(0, len(embedded_data), BATCH_SIZE), desc="Qdrant 업로드 중"):
+    for batch_index, (batch, vectors) in enumerate(tqdm(embedded_batches, desc="Qdrant 업로드 중")):
         
-        batch = embedded_data[i : i + BATCH_SIZE]
         batch_points = [] # Qdrant에 업로드할 포인트 배치
 
-        for item in batch:
+        for item, vector in zip(batch, vectors):
             
             # 메타데이터 (Payload) 생성 (vector와 sentence 제외)
             payload = {
@@ -104,7 +153,7 @@ def main():
             
             point = models.PointStruct(
                 id=str(uuid4()), # 고유 ID
-                vector=item["vector"], # 저장된 벡터
+                vector=vector.tolist() if hasattr(vector, "tolist") else vector, # 저장된 벡터 (memmap 행 -> list)
                 payload=payload
             )
             batch_points.append(point)
@@ -117,7 +166,7 @@ def main():
                 wait=True
             )
         except Exception as e:
-            print(f"  > 배치 {i // BATCH_SIZE + 1} 업로드 실패: {e}")
+            print(f"  > 배치 {batch_index + 1} 업로드 실패: {e}")
             
     print("\n--- 모든 작업 완료 ---")
     count_result = client.count(collection_name=QPOLL_COLLECTION_NAME, exact=True)
@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import glob
 import re
@@ -8,6 +9,9 @@ import re
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # 이 스크립트의 상위 폴더(PROJECT_ROOT)를 찾습니다. (예: /.../infra/)
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.json_io import read_document, RecordWriter
 
 # [입력] qpoll 문장 파일이 있는 폴더
 QPOLL_INPUT_DIR = os.path.join(
@@ -21,73 +25,97 @@ OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'merged_sentence_output_by_qpoll_topic')
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'merged_qpoll_text.json')
 
 def load_json(path):
-    """JSON 파일을 안전하게 로드"""
+    """문장 파일의 (헤더, 레코드 키, 레코드 iterator)를 안전하게 로드 (NDJSON / indent=4 JSON 모두 지원)"""
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return read_document(path)
     except Exception as e:
         print(f"  > 파일 로드 오류: {os.path.basename(path)}, {e}")
         return None
 
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    # 모든 qpoll 답변 객체를 저장할 마스터 리스트
-    master_data = []
-    
-    # --- Qpoll 데이터 병합 ---
-    qpoll_files = glob.glob(os.path.join(QPOLL_INPUT_DIR, '*.json'))
-    if not qpoll_files:
-        print(f"오류: '{QPOLL_INPUT_DIR}' 폴더에서 *.json 파일을 찾을 수 없습니다.")
-        return
+def natural_sort_key(path):
+    """'01_2_...json' < '01_10_...json' (파일명 안의 숫자는 숫자로 비교)"""
+    return [int(token) if token.isdigit() else token for token in re.split(r'(\d+)', os.path.basename(path))]
 
-    print(f"--- Qpoll 데이터 병합 시작 (총 {len(qpoll_files)}개 파일) ---")
-    
-    total_qpoll_sentences = 0
+def to_merged_record(item):
+    """문장 파일의 레코드 -> 병합 파일 레코드 {panel_id, question, sentence} (문장이 없으면 None)"""
+    sentence = item.get("sentence_for_embedding")
+
+    # [중요] 문장이 null(None)이거나 빈 문자열인 경우는 제외
+    if not sentence:
+        return None
+    return {
+        "panel_id": item.get("panel_id"),
+        #" topic_id": topic_id,
+        "question": item.get("original_question", "N/A"),
+        "sentence": sentence
+    }
+
+def iter_merged_records(qpoll_files):
+    """주제별 문장 파일들을 순서대로 읽어 병합 파일 레코드를 하나씩 반환"""
     for file_path in qpoll_files:
         data = load_json(file_path)
-        
+
         # 파일 형식 확인
-        if data is None or "topic_file_id" not in data or "generated_data" not in data:
+        if data is None or "topic_file_id" not in data[0] or data[1] != "generated_data":
             print(f"  > 건너뛰기: {os.path.basename(file_path)} (형식 오류)")
             continue
-            
-        # topic_id = data["topic_file_id"]
-        generated_data = data["generated_data"]
-        
-        # 'generated_data' 리스트를 순회
+
+        # topic_id = data[0]["topic_file_id"]
+        _, _, generated_data = data
+
+        # 'generated_data' 레코드를 순회
         for item in generated_data:
-            sentence = item.get("sentence_for_embedding")
-            
-            # [중요] 문장이 null(None)이거나 빈 문자열인 경우는 제외
-            if sentence: 
-                master_data.append({
-                    "panel_id": item.get("panel_id"),
-                    #" topic_id": topic_id,
-                    "question": item.get("original_question", "N/A"),
-                    "sentence": sentence
-                })
-                total_qpoll_sentences += 1
-                
-    print(f"--- Qpoll 문장 {total_qpoll_sentences}개 병합 완료 ---")
+            merged_item = to_merged_record(item)
+            if merged_item is not None:
+                yield merged_item
+
+def write_merged_file(merged_records, output_file=OUTPUT_FILE):
+    """
+    Streams merged records into output_file (via a .tmp file, replaced at the end).
+    Returns the number of records written (the file is not created if there are none).
+    """
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+    # 문장 객체를 마스터 리스트에 모으지 않고, 읽는 대로 최종 파일에 바로 기록
+    # (기본 NDJSON, PIPELINE_JSON_FORMAT=pretty 이면 indent=4 JSON)
+    first_item = None
+    tmp_output_file = f"{output_file}.tmp"
+    try:
+        with RecordWriter(tmp_output_file) as writer:
+            for merged_item in merged_records:
+                writer.write(merged_item)
+                if first_item is None:
+                    first_item = merged_item
+    except Exception as e:
+        print(f"최종 파일 저장 오류: {e}")
+        return 0
+
+    print(f"--- Qpoll 문장 {writer.count}개 병합 완료 ---")
 
     # --- 최종 마스터 파일 저장 ---
-    if not master_data:
+    if writer.count == 0:
+        os.remove(tmp_output_file)
         print("\n병합할 데이터가 없습니다.")
-        return
+        return 0
 
     print(f"\n--- 최종 파일 저장 중 ---")
-    try:
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(master_data, f, ensure_ascii=False, indent=4)
-        
-        print(f"성공! 총 {len(master_data)}개의 문장이 '{OUTPUT_FILE}'에 저장되었습니다.")
-        
-        if master_data:
-            print("\n--- 최종 데이터 구조 예시 ---")
-            print(json.dumps(master_data[0], indent=4, ensure_ascii=False))
+    os.replace(tmp_output_file, output_file)
+    print(f"성공! 총 {writer.count}개의 문장이 '{output_file}'에 저장되었습니다.")
 
-    except Exception as e:
-        print(f"최종 파일 저장 오류: {e}")
+    print("\n--- 최종 데이터 구조 예시 ---")
+    print(json.dumps(first_item, indent=4, ensure_ascii=False))
+    return writer.count
+
+def main():
+    # --- Qpoll 데이터 병합 ---
+    # 파일명 순서(입력 파일 순번 -> 하위 질문 순번)대로 병합 (qpoll_json_to_text.py --merged 와 같은 순서)
+    qpoll_files = sorted(glob.glob(os.path.join(QPOLL_INPUT_DIR, '*.json')), key=natural_sort_key)
+    if not qpoll_files:
+        print(f"오류: '{QPOLL_INPUT_DIR}' 폴더에서 *.json 파일을 찾을 수 없습니다.")
+        return
+
+    print(f"--- Qpoll 데이터 병합 시작 (총 {len(qpoll_files)}개 파일) ---")
+    write_merged_file(iter_merged_records(qpoll_files))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,154 @@
+# qpoll 주제별 문장 템플릿 엔진
+#
+# 주제마다 함수를 새로 작성하는 대신, 아래 키를 가진 dict(규칙)로 문장 생성 방식을 선언하고
+# compile_* 함수로 한 번 컴파일해서 포맷터 함수로 사용한다.
+#
+#   "opt_out"     : (답변, 문장) - 답변 리스트에 이 답변이 있으면 다른 처리 없이 이 문장을 반환
+#   "exclude"     : 답변 리스트에서 뺄 답변 목록 (예: ["기타"])
+#   "answer_map"  : {답변: 문장에 넣을 표현} - 답변마다 치환 (없는 답변은 그대로)
+#   "joiner"      : 답변을 이어 붙일 문자열 (기본: ", ")
+#   "exact"       : {이어 붙인 답변: 문장} - 이어 붙인 결과가 정확히 같으면 이 문장을 반환
+#   "template"    : "{answers}" 자리에 이어 붙인 답변을 넣은 문장
+#
+# 처리 순서는 opt_out -> exclude -> answer_map -> (남은 답변이 없으면 None) -> joiner -> exact -> template.
+# 다중 문항 파일(방식 B)은 {"branches": [{"question_contains": 질문 일부, ...규칙}, ...]} 형태로,
+# 질문 텍스트에 question_contains가 들어 있는 첫 번째 규칙을 사용한다 (맞는 규칙이 없으면 None).
+# 질문 텍스트 -> 규칙은 질문마다 한 번만 찾아서 기억해 둔다 (formatter.resolve).
+
+DEFAULT_JOINER = ", "
+ANSWERS_FIELD = "{answers}"
+
+# 규칙마다 기억해 두는 (답변 조합 -> 문장) 최대 개수
+# 응답 조합은 패널 수보다 훨씬 적으므로, 같은 조합은 한 번만 문장을 만든다
+MAX_CACHED_ANSWER_SETS = 65_536
+# 방식 B에서 기억해 두는 (질문 텍스트 -> 규칙) 최대 개수
+MAX_CACHED_QUESTIONS = 4_096
+
+RULE_KEYS = {"opt_out", "exclude", "answer_map", "joiner", "exact", "template"}
+
+
+def _split_template(template):
+    """'앞 {answers} 뒤' -> ('앞 ', ' 뒤')"""
+    parts = template.split(ANSWERS_FIELD)
+    if len(parts) != 2:
+        raise ValueError(f"template must contain {ANSWERS_FIELD} exactly once: {template!r}")
+    return parts[0], parts[1]
+
+
+def compile_rule(rule):
+    """
+    Compiles one rule dict into build(answers) -> sentence or None.
+    The result for each distinct answer list is cached (answers must be a list of hashable values).
+    """
+    unknown = set(rule) - RULE_KEYS - {"question_contains"}
+    if unknown:
+        raise ValueError(f"unknown template keys: {sorted(unknown)}")
+
+    opt_out = rule.get("opt_out")
+    exclude = tuple(rule.get("exclude", ()))
+    answer_map = dict(rule.get("answer_map", {}))
+    joiner = rule.get("joiner", DEFAULT_JOINER)
+    exact = dict(rule.get("exact", {}))
+    prefix, suffix = _split_template(rule["template"])
+    opt_out_answer, opt_out_sentence = opt_out if opt_out is not None else (None, None)
+
+    def build(answers):
+        if opt_out is not None and opt_out_answer in answers:
+            return opt_out_sentence
+        if exclude:
+            answers = [answer for answer in answers if answer not in exclude]
+        if answer_map:
+            answers = [answer_map.get(answer, answer) for answer in answers]
+        if not answers:
+            return None
+        answer_str = joiner.join(answers)
+        if exact and answer_str in exact:
+            return exact[answer_str]
+        return prefix + answer_str + suffix
+
+    cache = {}
+
+    def cached_build(answers):
+        # list가 아닌 값(None 등)은 캐시하지 않고 그대로 처리 (기존 함수와 같은 결과 / 예외)
+        if type(answers) is not list:
+            return build(answers)
+        try:
+            key = tuple(answers)
+            return cache[key]
+        except KeyError:
+            pass
+        except TypeError: # hash 불가능한 답변
+            return build(answers)
+        sentence = build(answers)
+        if len(cache) < MAX_CACHED_ANSWER_SETS:
+            cache[key] = sentence
+        return sentence
+
+    return cached_build
+
+
+def _first_answer_list(panel):
+    """panel의 첫 번째 설문 답변 리스트 (설문이 없으면 빈 리스트)"""
+    surveys = panel.get('surveys', [])
+    try:
+        return surveys[0].get('survey_answers', [])
+    except IndexError:
+        return []
+
+
+def compile_panel_template(topic_file_id, rule):
+    """Single-question topic (mode A): returns formatter(panel) -> sentence for the first survey's answers."""
+    build = compile_rule(rule)
+
+    def formatter(panel):
+        return build(_first_answer_list(panel))
+
+    formatter.__name__ = f"{topic_file_id} 템플릿"
+    return formatter
+
+
+def _no_branch(answers):
+    """맞는 질문 규칙이 없을 때: 문장 없음"""
+    return None
+
+
+def compile_survey_template(topic_file_id, spec):
+    """
+    Multi-question topic (mode B): returns formatter(panel_id, answers, question) that applies the
+    first branch whose question_contains is part of the question text (None if no branch matches).
+    formatter.resolve(question) returns that branch's build(answers); each distinct question is resolved once.
+    """
+    branches = [(branch["question_contains"], compile_rule(branch)) for branch in spec["branches"]]
+    dispatch = {}
+
+    def find_branch(question):
+        for question_part, build in branches:
+            if question_part in question:
+                return build
+        return _no_branch
+
+    def resolve(question):
+        try:
+            return dispatch[question]
+        except KeyError:
+            pass
+        except TypeError: # hash 불가능한 질문
+            return find_branch(question)
+        build = find_branch(question)
+        if len(dispatch) < MAX_CACHED_QUESTIONS:
+            dispatch[question] = build
+        return build
+
+    def formatter(panel_id, answers, question):
+        return resolve(question)(answers)
+
+    formatter.__name__ = f"{topic_file_id} 템플릿"
+    formatter.resolve = resolve
+    return formatter
+
+
+def compile_topic_templates(panel_specs, survey_specs):
+    """{topic_file_id: rule}, {topic_file_id: spec} -> (TOPIC_FORMATTERS_BY_PANEL, TOPIC_FORMATTERS_BY_SURVEY)"""
+    by_panel = {topic: compile_panel_template(topic, rule) for topic, rule in panel_specs.items()}
+    by_survey = {topic: compile_survey_template(topic, spec) for topic, spec in survey_specs.items()}
+    return by_panel, by_survey
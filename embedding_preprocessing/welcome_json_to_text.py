@@ -1,11 +1,16 @@
 import os
-import json
+import sys
 import re
+import time
+from contextlib import ExitStack
 
 # --- 1. 경로 설정 ---
 # (경로 설정은 qpoll 스크립트와 동일한 구조를 가정합니다)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.json_io import iter_records, DocumentWriter
 
 # welcome_data.json이 qpoll과 다른 폴더에 있을 수 있으니,
 # 'xlsx_to_json_pipeline' 폴더를 직접 참조합니다.
@@ -78,7 +83,7 @@ def format_personal_info(panel):
     if region_major:
         parts.append(f"{region_major} ")
     if region_minor:
-        parts.append(f"{region_minor}" 거주)
+        parts.append(f"{region_minor} 거주")
     if marital:
         parts.append(f"{marital} 상태")
     # 1. 값이 None이 아니고, 숫자인지(int or float) 확인
@@ -117,37 +122,54 @@ def format_job_info(panel):
     
     return ", ".join(parts) + "입니다."
 
+# 기본 템플릿에서 건너뛰는 값
+DEFAULT_EXCLUDED_VALUES = ["기타", "없음"]
+
 def format_default_category(panel, key_list):
     """
     [기본 템플릿] 맞춤 함수가 없는 카테고리는 이 함수를 사용합니다.
     (예: "car" 카테고리)
     """
-    parts = []
-    for key in key_list:
-        value = panel.get(key)
-        
-        # 값이 없으면(None) 건너뜀
-        if value is None:
-            continue
-            
-        # 값이 리스트인 경우 (예: owned_electronics)
-        if isinstance(value, list):
-            if not value: continue # 빈 리스트 건너뜀
-            # "기타", "없음" 등 필터링
-            filtered = [str(v) for v in value if v not in ["기타", "없음"]]
-            if filtered:
-                parts.append(f"{key}: {', '.join(filtered)}")
-        
-        # 값이 리스트가 아닌 경우
-        else:
-            value_str = str(value)
-            if value_str not in ["기타", "없음"]:
-                parts.append(f"{key}: {value_str}")
+    return compile_default_formatter(key_list)(panel)
 
-    if not parts:
-        return None
-        
-    return ". ".join(parts) + "."
+def compile_default_formatter(key_list):
+    """
+    Compiles the default template for one category key list into formatter(panel).
+    The "key: " labels are built once here instead of for every panel.
+    """
+    labels = [(key, f"{key}: ") for key in key_list]
+    excluded = DEFAULT_EXCLUDED_VALUES
+
+    def formatter(panel):
+        parts = []
+        get = panel.get
+        for key, label in labels:
+            value = get(key)
+
+            # 값이 없으면(None) 건너뜀
+            if value is None:
+                continue
+
+            # 값이 리스트인 경우 (예: owned_electronics)
+            if isinstance(value, list):
+                # "기타", "없음" 등 필터링 (빈 리스트도 여기서 건너뜀)
+                filtered = [str(v) for v in value if v not in excluded]
+                if filtered:
+                    parts.append(label + ', '.join(filtered))
+
+            # 값이 리스트가 아닌 경우
+            else:
+                value_str = str(value)
+                if value_str not in excluded:
+                    parts.append(label + value_str)
+
+        if not parts:
+            return None
+
+        return ". ".join(parts) + "."
+
+    formatter.__name__ = f"format_default_category({', '.join(key_list)})"
+    return formatter
 
 
 # 2-3. '카테고리 이름'과 '사용할 함수'를 매핑합니다.
@@ -161,94 +183,105 @@ CATEGORY_FORMATTERS = {
 
 # --- 3. 헬퍼 함수 ---
 
-def load_data(path):
-    """통합 JSON 파일을 로드합니다."""
+def iter_panels(path):
+    """통합 JSON 파일의 패널을 하나씩 읽습니다. (NDJSON은 한 줄씩, JSON 배열은 한 번에 로드)"""
     print(f"원본 데이터 로드 중... (경로: {path})")
     if not os.path.exists(path):
         print(f"오류: 입력 파일 '{path}'을(를) 찾을 수 없습니다.")
         return None
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f) # [ {panel_id: A, ...}, {panel_id: B, ...} ]
-        print(f"성공: 총 {len(data)}명의 패널 데이터를 로드했습니다.")
-        return data
-    except Exception as e:
-        print(f"JSON 로드 오류: {e}")
-        return None
+    return iter_records(path) # {panel_id: A, ...}, {panel_id: B, ...}
 
 def clean_filename(text):
     """키 이름을 안전한 파일명으로 변환합니다."""
     text = re.sub(r'[\\/*?:"<>|]', "", text)
     return text.strip()[:50]
 
-# --- 4. 메인 실행 로직 ---
-
-def main():
-    # 1. 출력 폴더 생성
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    
-    # 2. 데이터 로드 (패널 리스트)
-    panel_data = load_data(INPUT_JSON_PATH)
-    if not isinstance(panel_data, list):
-        print("오류: 입력 데이터가 리스트 형식이 아닙니다.")
-        return
+def compile_category_formatters(categories=CATEGORIES):
+    """
+    [(category_name, formatter(panel)), ...] in CATEGORIES order.
+    Categories without an entry in CATEGORY_FORMATTERS get a precompiled default formatter.
+    """
+    return [
+        (category_name, CATEGORY_FORMATTERS.get(category_name) or compile_default_formatter(key_list))
+        for category_name, key_list in categories.items()
+    ]
 
-    # 3. [신규] '카테고리'별로 순회하며 파일 생성
-    print("\n--- 카테고리별 문장 생성 및 파일 저장 시작 ---")
-    
-    file_count = 0
-    # (예: category_name = "personal_info", key_list = ["gender", "birth_year", ...])
-    for category_name, key_list in CATEGORIES.items():
-        
-        print(f"  > 처리 중: {category_name}")
-        
-        # 4. 이 카테고리에 맞는 포맷터(함수)를 가져옴
-        # (맵에 없으면 format_default_category를 사용)
-        formatter = CATEGORY_FORMATTERS.get(category_name)
-        
-        generated_data = [] # 이 카테고리의 결과물 리스트
-        
-        # 5. '모든 패널'을 순회
-        for panel in panel_data:
-            if not isinstance(panel, dict): continue
+def generate_category_sentences(panels, outputs):
+    """
+    Visits every panel once and passes one record per category to its output.
+    outputs: [(formatter(panel), write(record)), ...] (e.g. DocumentWriter.write or list.append).
+    Panels that are not dicts or have no panel_id are skipped. Returns the number of panels used.
+    """
+    panel_count = 0
+    for panel in panels:
+        if not isinstance(panel, dict): continue
 
-            panel_id = panel.get('panel_id')
-            if not panel_id: continue
+        panel_id = panel.get('panel_id')
+        if not panel_id: continue
 
-            # 6. 문장 생성
-            if formatter:
-                # 6-A. 맞춤형 함수가 등록된 경우 (예: personal_info)
-                sentence = formatter(panel)
-            else:
-                # 6-B. 맞춤형 함수가 없는 경우 (예: car, phone)
-                sentence = format_default_category(panel, key_list)
-            
-            generated_data.append({
+        panel_count += 1
+        for formatter, write in outputs:
+            write({
                 "panel_id": panel_id,
-                "sentence_for_embedding": sentence
+                "sentence_for_embedding": formatter(panel)
                 # "category": category_name # (메타데이터가 필요하면 추가)
             })
+    return panel_count
 
-        # 7. 이 '카테고리'에 대한 최종 출력 객체 생성
-        output_data = {
-            "topic_category": category_name,
-            "generated_data": generated_data
-        }
+def write_category_sentence_files(panels, output_dir):
+    """
+    Writes one sentence file per category (e.g. personal_info.json) in a single pass over panels.
+    Returns (number of panels, number of files written).
+    """
+    # 카테고리별 포맷터(함수)를 한 번만 준비
+    # (CATEGORY_FORMATTERS에 없으면 key 목록으로 컴파일한 기본 템플릿을 사용)
+    category_formatters = compile_category_formatters()
 
-        # 8. 파일명 생성 (예: personal_info.json)
-        safe_name = clean_filename(category_name)
-        filename = f"{safe_name}.json"
-        output_path = os.path.join(OUTPUT_DIR, filename)
-        
-        try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, ensure_ascii=False, indent=4)
-            file_count += 1
-        except Exception as e:
-            print(f"  > 파일 저장 오류 ({filename}): {e}")
+    with ExitStack() as stack:
+        # 카테고리마다 출력 파일을 열어 두고, 패널을 한 번만 순회하면서 모든 카테고리 문장을 바로 기록
+        outputs = []
+        for category_name, formatter in category_formatters:
+            print(f"  > 처리 중: {category_name}")
+
+            # 이 '카테고리'에 대한 최종 출력 헤더 / 파일명 (예: personal_info.json)
+            header = {"topic_category": category_name}
+            filename = f"{clean_filename(category_name)}.json"
+            output_path = os.path.join(output_dir, filename)
+            try:
+                # (기본 NDJSON: 첫 줄 헤더 + 한 줄에 문장 1개, PIPELINE_JSON_FORMAT=pretty 이면 indent=4 JSON)
+                writer = stack.enter_context(DocumentWriter(output_path, header, "generated_data"))
+            except Exception as e:
+                print(f"  > 파일 저장 오류 ({filename}): {e}")
+                continue
+            outputs.append((formatter, writer.write))
+
+        panel_count = generate_category_sentences(panels, outputs)
+
+    return panel_count, len(outputs)
+
+# --- 4. 메인 실행 로직 ---
+
+def main():
+    # 1. 출력 폴더 생성
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # 2. 데이터 로드 (패널을 하나씩)
+    panels = iter_panels(INPUT_JSON_PATH)
+    if panels is None:
+        return
+
+    # 3. 패널을 한 번만 순회하며 모든 카테고리 파일 생성
+    print("\n--- 카테고리별 문장 생성 및 파일 저장 시작 ---")
+    start = time.perf_counter()
+    try:
+        panel_count, file_count = write_category_sentence_files(panels, OUTPUT_DIR)
+    except ValueError as e:
+        print(f"JSON 로드 오류: {e}")
+        sys.exit(1)
 
     print(f"\n--- 작업 완료 ---")
-    print(f"총 {file_count}개의 카테고리 파일을 '{OUTPUT_DIR}' 폴더에 저장했습니다.")
+    print(f"총 {panel_count}명의 패널, {file_count}개의 카테고리 파일을 '{OUTPUT_DIR}' 폴더에 저장했습니다. "
+          f"({time.perf_counter() - start:.2f}s)")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
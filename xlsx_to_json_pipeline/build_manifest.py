@@ -0,0 +1,117 @@
+import os
+import json
+import hashlib
+
+# 변환 결과 폴더 옆에 두는 매니페스트 파일 구조:
+# {
+#     "converter_version": "1",
+#     "entries": {
+#         "<출력 파일 경로>": {
+#             "inputs": [{"path": ..., "size": ..., "mtime": ..., "sha256": ...}, ...]
+#         }
+#     }
+# }
+# 경로는 모두 매니페스트 파일 위치 기준 상대 경로로 저장한다.
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _relative(manifest, path):
+    return os.path.relpath(os.path.abspath(path), manifest['base_dir'])
+
+
+def load_manifest(manifest_path, converter_version):
+    """
+    Loads the manifest, or returns an empty one if it does not exist,
+    cannot be read, or was written by a different converter version.
+    """
+    manifest = {
+        'path': manifest_path,
+        'base_dir': os.path.dirname(os.path.abspath(manifest_path)),
+        'converter_version': str(converter_version),
+        'entries': {},
+    }
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except FileNotFoundError:
+        return manifest
+    except Exception as e:
+        print(f"매니페스트를 읽을 수 없어 전체를 다시 변환합니다: {manifest_path}, {e}")
+        return manifest
+
+    if saved.get('converter_version') != manifest['converter_version']:
+        print(f"변환기 버전 변경 ({saved.get('converter_version')} -> {manifest['converter_version']}): 전체를 다시 변환합니다.")
+        return manifest
+
+    manifest['entries'] = saved.get('entries', {})
+    return manifest
+
+
+def is_up_to_date(manifest, input_paths, output_path):
+    """
+    True if output_path exists and every input is unchanged since it was recorded.
+    Size + mtime are compared first; the content hash is computed only when they differ
+    (so a touched but identical file is still treated as unchanged).
+    """
+    entry = manifest['entries'].get(_relative(manifest, output_path))
+    if entry is None or not os.path.exists(output_path):
+        return False
+
+    recorded_inputs = {item['path']: item for item in entry.get('inputs', [])}
+    if set(recorded_inputs) != {_relative(manifest, path) for path in input_paths}:
+        return False
+
+    for path in input_paths:
+        recorded = recorded_inputs[_relative(manifest, path)]
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if stat.st_size == recorded['size'] and stat.st_mtime == recorded['mtime']:
+            continue
+        if stat.st_size != recorded['size'] or file_sha256(path) != recorded['sha256']:
+            return False
+        # 내용은 같고 mtime만 바뀐 경우: 다음 실행에서 다시 해시하지 않도록 갱신
+        recorded['mtime'] = stat.st_mtime
+
+    return True
+
+
+def record_build(manifest, input_paths, output_path):
+    """Records the current state of input_paths as the source of output_path."""
+    inputs = []
+    for path in input_paths:
+        stat = os.stat(path)
+        inputs.append({
+            'path': _relative(manifest, path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': file_sha256(path),
+        })
+    manifest['entries'][_relative(manifest, output_path)] = {'inputs': inputs}
+
+
+def prune_missing_inputs(manifest):
+    """Drops entries whose input files no longer exist."""
+    for output_key in list(manifest['entries']):
+        inputs = manifest['entries'][output_key].get('inputs', [])
+        if not all(os.path.exists(os.path.join(manifest['base_dir'], item['path'])) for item in inputs):
+            del manifest['entries'][output_key]
+
+
+def save_manifest(manifest):
+    """Writes the manifest atomically."""
+    tmp_path = f"{manifest['path']}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'converter_version': manifest['converter_version'],
+            'entries': manifest['entries'],
+        }, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, manifest['path'])
@@ -1,12 +1,22 @@
-import pandas as pd
-import json
-import numpy as np
 import glob
 import os
+import sys
+import time
+import argparse
+
+from qpoll_long_table import load_long_table, LONG_TABLE_VERSION, LABEL_CACHE_NAMESPACE
+from qpoll_panel_aggregator import aggregate_by_panel
+import label_cache
+import build_manifest
 
 # 이 파이썬 파일(script.py)의 실제 위치를 기준으로 절대 경로를 만듦
 # 예: /.../infra/xlsx_to_json_pipeline/
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.json_io import write_records, output_format, get_codec
+from common.process_pool import default_workers, run_tasks
 
 # SCRIPT_DIR를 기준으로 data 폴더 경로를 설정
 INPUT_PATTERN = os.path.join(SCRIPT_DIR, 'data/Quickpoll/qpoll*.xlsx')
@@ -15,255 +25,120 @@ INPUT_FILES = glob.glob(INPUT_PATTERN)
 # SCRIPT_DIR를 기준으로 출력 폴더 경로를 설정
 OUTPUT_JSON_DIR = os.path.join(SCRIPT_DIR, 'qpoll_json_output')
 
-COLUMN_MAPPING = {
-    '구분': 'category',
-    '고유번호': 'panel_id',
-    '성별': 'gender',
-    '나이': 'age_raw',
-    '지역': 'region',
-    '설문일시': 'survey_timestamp'
-}
+# 증분 변환용 매니페스트 (입력 파일 크기/mtime/해시 기록)
+MANIFEST_PATH = os.path.join(SCRIPT_DIR, 'qpoll_json_manifest.json')
+# 변환 로직/출력 형식이 바뀌면 올릴 것 -> 다음 실행에서 모든 파일을 다시 변환
+# (출력 형식(NDJSON / pretty), long table 버전, 라벨 시트 파싱 캐시 버전이 바뀌어도 다시 변환하도록 버전에 포함)
+CONVERTER_VERSION = f"2-{output_format()}-{get_codec().name}-long{LONG_TABLE_VERSION}-{LABEL_CACHE_NAMESPACE}"
 
-def process_qpoll_file(path):
+# --- 파일 단위 변환 (워커 프로세스에서도 실행됨) ---
+def output_json_path_for(file_path):
+    """이 파일만의 JSON 파일 경로 (예: 'data/Quickpoll/qpoll_A.xlsx' -> 'qpoll_json_output/qpoll_A.json')"""
+    base_name = os.path.basename(file_path) # 'qpoll_A.xlsx'
+    file_name_without_ext, _ = os.path.splitext(base_name) # 'qpoll_A'
+    return os.path.join(OUTPUT_JSON_DIR, f"{file_name_without_ext}.json")
+
+def convert_qpoll_file_to_json(file_path):
     """
-    Processes a single qpoll-formatted Excel file into a structured DataFrame.
-    [Final logic: Replaces '문항1' with '실제 질문 텍스트' in final output]
+    Converts one qpoll workbook and writes its own qpoll_join_XXXXX.json.
+    Returns (number of users saved, output path), or (0, None) if there was nothing to save.
     """
-    try:
-        xlsx = pd.ExcelFile(path)
-
-        # 1. Sheet 2를 읽어, 라벨 맵과 '질문 텍스트'를 순서대로 리스트에 저장
-        df_labels = xlsx.parse(xlsx.sheet_names[1], header=None)
-        
-        # 라벨 맵과 질문 텍스트를 함께 저장할 리스트
-        label_data_in_order = [] 
-        row_index = 0
-
-        while row_index < len(df_labels):
-            # 1-1. '설문제목' 행 찾기 (ids 행)
-            id_row_value = df_labels.iloc[row_index, 0] # A열
-            if pd.isna(id_row_value):
-                break
-            if id_row_value.strip() != "설문제목":
-                row_index += 1
-                continue
-            
-            # 1-2. '설문제목' 행에서 ids 데이터(Series) 가져오기
-            id_row_data_series = df_labels.iloc[row_index, 1:]
-            
-            # 1-3. '총참여자수' 위치 찾기
-            stop_col_pos = None
-            for i, item in enumerate(id_row_data_series):
-                if pd.notna(item) and str(item).strip() == '총참여자수':
-                    stop_col_pos = i 
-                    break
-            
-            if stop_col_pos is not None:
-                ids = id_row_data_series.iloc[:stop_col_pos].values
-            else:
-                ids = id_row_data_series.values
-            
-            # 1-4. 다음 행 (labels + 질문 텍스트 행)으로 이동
-            row_index += 1
-            if row_index >= len(df_labels):
-                break
-            
-            # 1-5. A열에서 'key' (실제 질문 텍스트)를 읽음
-            question_text = df_labels.iloc[row_index, 0]
-            if pd.isna(question_text):
-                question_text = "" # A열이 비어있을 경우
-            question_text = question_text.strip()
-            
-            # 1-6. 'labels' 행 데이터(Series) 가져오기
-            label_row_data_series = df_labels.iloc[row_index, 1:]
-            
-            if stop_col_pos is not None:
-                labels = label_row_data_series.iloc[:stop_col_pos].values
-            else:
-                labels = label_row_data_series.values
-            
-            # 1-7. 라벨 맵 생성
-            value_label_map = {
-                str(id_).strip(): label
-                for id_, label in zip(ids, labels)
-                if pd.notna(id_) and pd.notna(label)
-            }
-            
-            # 1-8. 라벨 맵과 질문 텍스트를 함께 리스트에 추가
-            label_data_in_order.append({
-                "text": question_text,
-                "map": value_label_map
-            })
-            
-            # 1-9. 다음 '설문제목' 블록으로 이동
-            row_index += 1
+    print(f"--- Processing {file_path} ---")
 
-        # 2. Sheet 1에서 데이터 읽기
-        df_data = xlsx.parse(xlsx.sheet_names[0], header=1)
+    # 파일마다 집계 딕셔너리를 새로 만듦
+    all_data_by_panel = {}
 
-        # 3. '문항1'과 데이터를 매핑하는 딕셔너리 2개 생성
-        
-        # 3-1. G열부터 헤더(컬럼명)의 공백을 제거
-        rename_map = {}
-        for col_name in df_data.columns[6:]: # G열부터
-            if pd.isna(col_name):
-                continue
-            stripped_name = str(col_name).strip()
-            if col_name != stripped_name:
-                rename_map[col_name] = stripped_name
-        
-        if rename_map:
-            print(f"Normalizing {len(rename_map)} column headers...")
-            df_data.rename(columns=rename_map, inplace=True)
-            
-        # 3-2. G열(인덱스 6)부터의 '문항' 컬럼 이름을 리스트로 가져옴
-        question_cols = list(df_data.columns[6:]) 
-        
-        if not question_cols:
-            print(f"Warning: No question columns (G onwards) found in {path}")
-            return pd.DataFrame()
-            
-        # 3-3. 2개의 딕셔너리를 생성
-        all_label_maps = {}    # "문항1" -> {라벨 맵} (라벨 변환용)
-        question_text_map = {} # "문항1" -> "실제 질문 텍스트" (교체용)
-        
-        for i, col_name in enumerate(question_cols):
-            if i < len(label_data_in_order):
-                data_blob = label_data_in_order[i]
-                all_label_maps[col_name] = data_blob['map']
-                question_text_map[col_name] = data_blob['text']
-            else:
-                print(f"Warning: No label data found for column '{col_name}' (index {i})")
-                all_label_maps[col_name] = {}
-                question_text_map[col_name] = col_name # 기본값으로 '문항1' 사용
+    processed_df = load_long_table(file_path)
 
-        # 4. Wide to Long (melt)
-        id_vars = list(df_data.columns[:6])
-        df_melted = df_data.melt(
-            id_vars=id_vars,
-            value_vars=question_cols,
-            var_name='survey_question',    # "문항1", "문항2"가 이 컬럼으로
-            value_name='survey_answers_raw'
-        )
+    if processed_df.empty:
+        print(f"Skipping empty processed data from {file_path}.")
+        return 0, None
 
-        # 5. 라벨 적용 함수 정
-        def apply_labels_from_map(row):
-            question_key = str(row['survey_question']).strip() 
-            raw_value = row['survey_answers_raw']
-            value_label_map = all_label_maps.get(question_key) # 3-3에서 만든 맵
-            
-            if value_label_map is None:
-                return [f"Map not found for '{question_key}'"] if pd.notna(raw_value) else []
-            if pd.isna(raw_value):
-                return []
-            
-            id_string = str(raw_value)
-            labeled_answers = []
-            ids = id_string.split(',')
-            
-            for id_val in ids:
-                id_val = id_val.strip()
-                if not id_val:
-                    continue
-                try:
-                    num_id = int(float(id_val)) 
-                    key = f"보기{num_id}" 
-                    labeled_answers.append(value_label_map.get(key, f"Unknown ID: {key}"))
-                except (ValueError, TypeError):
-                    continue
-            return labeled_answers
+    # panel_id 기준 컬럼 단위 집계 (행마다 record dict를 만들지 않음)
+    aggregate_by_panel(processed_df, all_data_by_panel)
 
-        # 6. 라벨 적용
-        df_melted['survey_answers'] = df_melted.apply(apply_labels_from_map, axis=1)
+    # 이 파일의 데이터 집계가 끝나면
+    final_records = list(all_data_by_panel.values())
 
-        # 7. [신규] 'survey_question' 컬럼의 값을 "문항1" -> "실제 질문 텍스트"로 교체
-        df_melted['survey_question'] = df_melted['survey_question'].map(question_text_map).fillna(df_melted['survey_question'])
+    if not final_records:
+        print("No data to save for this file.")
+        return 0, None
 
-        # 8. [수정] 컬럼 정리 (기존 7번)
-        df_melted.drop(columns=['survey_answers_raw'], inplace=True)
-        df_melted.rename(columns=COLUMN_MAPPING, inplace=True)
+    output_json_path = output_json_path_for(file_path)
 
-        # 9. [수정] NaN 값 정리 후 반환 (기존 8번)
-        return df_melted.replace({np.nan: None})
+    # 이 파일의 데이터를 즉시 저장 (기본 NDJSON, PIPELINE_JSON_FORMAT=pretty 이면 indent=4 JSON)
+    write_records(output_json_path, final_records)
 
-    except Exception as e:
-        print(f"Error processing file {path}: {e}")
-        raise
+    print(f"Successfully processed {len(final_records)} users.")
+    print(f"Data saved to '{output_json_path}'\n")
+    return len(final_records), output_json_path
 
 # --- Main Execution ---
 if __name__ == '__main__':
-    
+    parser = argparse.ArgumentParser(description="qpoll*.xlsx -> qpoll_join_XXXXX.json")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help=f"동시에 변환할 워커 프로세스 수 (기본: 1, 이 머신의 코어 수: {default_workers()})"
+    )
+    parser.add_argument("--force", action="store_true", help="매니페스트를 무시하고 모든 파일을 다시 변환")
+    args = parser.parse_args()
+
     # JSON을 저장할 폴더 생성 (이미 있으면 넘어감)
     os.makedirs(OUTPUT_JSON_DIR, exist_ok=True)
     
     total_files_processed = 0
+    failed_files = []
     
     try:
-        all_files = INPUT_FILES
-        if not all_files:
+        batch_start = time.perf_counter()
+        manifest = build_manifest.load_manifest(MANIFEST_PATH, CONVERTER_VERSION)
+        build_manifest.prune_missing_inputs(manifest)
+
+        # 새로 추가되었거나 바뀐 파일만 변환 (--force 이면 전체)
+        all_files = [
+            file_path for file_path in INPUT_FILES
+            if args.force or not build_manifest.is_up_to_date(manifest, [file_path], output_json_path_for(file_path))
+        ]
+        skipped_count = len(INPUT_FILES) - len(all_files)
+
+        if not INPUT_FILES:
             print("No 'qpoll*.xlsx' files found in 'data/Quickpoll/'.")
-        
-        for file_path in all_files:
-            print(f"--- Processing {file_path} ---")
-            
-            # 파일 루프가 돌 때마다 집계 딕셔너리를 새로 만듦
-            all_data_by_panel = {} 
-            
-            processed_df = process_qpoll_file(file_path)
-            
-            if processed_df.empty:
-                print(f"Skipping empty processed data from {file_path}.")
+        elif skipped_count:
+            print(f"Skipping {skipped_count} unchanged file(s) (manifest: {MANIFEST_PATH})")
+        if all_files and args.workers > 1:
+            print(f"Converting {len(all_files)} files with {args.workers} worker processes...")
+
+        # 파일별로 독립 실행 -> 한 파일이 실패해도 나머지 파일은 계속 변환
+        for index, result, error, elapsed in run_tasks(
+            label_cache.call_with_stats,
+            [(convert_qpoll_file_to_json, file_path) for file_path in all_files],
+            workers=args.workers
+        ):
+            base_name = os.path.basename(all_files[index])
+            if error:
+                print(f"[FAILED] {base_name} ({elapsed:.2f}s)\n{error}")
+                failed_files.append(base_name)
                 continue
-            
-            for col in processed_df.select_dtypes(include=['datetime64[ns]']).columns:
-                processed_df[col] = processed_df[col].dt.strftime('%Y-%m-%dT%H:%M:%S')
 
-            for record in processed_df.to_dict('records'):
-                panel_id = record.get('panel_id')
-                if not panel_id:
-                    continue
-
-                if panel_id not in all_data_by_panel:
-                    all_data_by_panel[panel_id] = {
-                        'panel_id': panel_id,
-                        'category': record.get('category'),
-                        'gender': record.get('gender'),
-                        'age_raw': record.get('age_raw'),
-                        'region': record.get('region'),
-                        'surveys': []
-                    }
-                
-                survey_data = {
-                    'survey_question': record.get('survey_question'),
-                    'survey_answers': record.get('survey_answers'),
-                    'survey_timestamp': record.get('survey_timestamp')
-                }
-                all_data_by_panel[panel_id]['surveys'].append(survey_data)
-
-            # 이 파일의 데이터 집계가 끝나면
-            final_records = list(all_data_by_panel.values())
-            
-            if not final_records:
-                print("No data to save for this file.")
-                continue
+            (user_count, output_json_path), cache_stats, pid = result
+            label_cache.add_worker_stats(cache_stats, pid)
+            print(f"[{elapsed:7.2f}s] {base_name} -> {user_count} users")
+            if output_json_path:
+                total_files_processed += 1
+                build_manifest.record_build(manifest, [all_files[index]], output_json_path)
+                build_manifest.save_manifest(manifest)
 
-            # 이 파일만의 JSON 파일 경로를 생성
-            # 예: 'data/Quickpoll/qpoll_A.xlsx' -> 'qpoll_A.json'
-            base_name = os.path.basename(file_path) # 'qpoll_A.xlsx'
-            file_name_without_ext, _ = os.path.splitext(base_name) # 'qpoll_A'
-            output_json_path = os.path.join(OUTPUT_JSON_DIR, f"{file_name_without_ext}.json")
-            
-            # 이 파일의 데이터를 JSON으로 즉시 저장
-            with open(output_json_path, 'w', encoding='utf-8') as f:
-                json.dump(final_records, f, ensure_ascii=False, indent=4)
-            
-            print(f"Successfully processed {len(final_records)} users.")
-            print(f"Data saved to '{output_json_path}'\n")
-            total_files_processed += 1
+        build_manifest.save_manifest(manifest)
 
         print(f"\n--- Execution Finished ---")
         print(f"Total files processed: {total_files_processed}")
+        print(f"Unchanged files skipped: {skipped_count}")
+        print(f"Total elapsed: {time.perf_counter() - batch_start:.2f}s")
+        if failed_files:
+            print(f"Failed files ({len(failed_files)}): {', '.join(failed_files)}")
+        label_cache.evict_stale_entries()
+        print(label_cache.format_stats())
 
     except Exception as e:
         print(f"\n--- An error occurred during execution ---")
-        print(f"Failed to process files: {e}")
\ No newline at end of file
+        print(f"Failed to process files: {e}")
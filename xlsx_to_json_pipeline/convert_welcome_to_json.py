@@ -2,9 +2,20 @@ import pandas as pd
 import json
 import numpy as np
 import os
+import sys
+import argparse
+
+from xlsx_stream_reader import read_sheet
+import label_cache
+import build_manifest
 
 # --- 0. 설정 및 최종 컬럼 매핑 정의 ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.json_io import write_records, output_format, get_codec
+from common.process_pool import run_tasks
 
 FILE_PATHS = {
     'file1': os.path.join(SCRIPT_DIR, 'data/Welcome/Welcome_1st.xlsx'),
@@ -15,6 +26,15 @@ MERGE_KEY = 'panel_id'
 OUTPUT_JSON_DIR = os.path.join(SCRIPT_DIR, 'welcome_json_output')
 OUTPUT_JSON_PATH = os.path.join(OUTPUT_JSON_DIR, 'welcome_data.json')
 
+# 증분 변환용 매니페스트 (두 입력 파일이 모두 그대로면 변환을 건너뜀)
+MANIFEST_PATH = os.path.join(SCRIPT_DIR, 'welcome_json_manifest.json')
+# 라벨 시트 파싱 캐시 구분자 (parse_label_sheet 로직이 바뀌면 버전을 올릴 것)
+LABEL_CACHE_NAMESPACE = 'welcome-label-v1'
+
+# 변환 로직/출력 형식이 바뀌면 올릴 것 -> 다음 실행에서 다시 변환
+# (출력 형식(NDJSON / pretty), 라벨 시트 파싱 캐시 버전이 바뀌어도 다시 변환하도록 버전에 포함)
+CONVERTER_VERSION = f"2-{output_format()}-{get_codec().name}-{LABEL_CACHE_NAMESPACE}"
+
 # 최종 영문 키 매핑 (Question Text -> English Key)
 # 별개의 답변으로 나올 수 있는 부분은 "_raw" 붙임
 FINAL_COLUMN_MAPPING = {
@@ -56,58 +76,125 @@ FINAL_COLUMN_MAPPING = {
 
 # --- 1. 파일 로드 및 3단계 컬럼명 변환 함수 ---
 
+def _code_to_value(col_a):
+    """Label code cell -> int/float dict key (integral floats become int), None if not numeric."""
+    try:
+        value = float(col_a)
+    except (ValueError, TypeError):
+        return None
+    return int(value) if value.is_integer() else value
+
+def parse_label_sheet(df_label):
+    """
+    Parses the label sheet and returns (qcode_to_question, value_labels).
+    Header rows are found with vectorized masks, the current Q-code is forward-filled
+    (reset by blank rows) and the code/label pairs are grouped by header in one groupby.
+    """
+    col_a = df_label.iloc[:, 0].to_numpy(dtype=object)
+    col_b = df_label.iloc[:, 1].to_numpy(dtype=object)
+    b_missing = pd.isna(col_b)
+
+    # 1. A열은 고유값만 분류: 숫자가 아닌 문자열(Q-code 후보)인지, 숫자 코드라면 그 값
+    codes, uniques = pd.factorize(col_a, use_na_sentinel=True)
+    a_missing = codes < 0
+    unique_is_q_code = np.array([isinstance(v, str) and not v.isnumeric() for v in uniques] + [False], dtype=bool)
+    unique_values = np.array([_code_to_value(v) for v in uniques] + [None], dtype=object)
+    unique_has_value = np.array([v is not None for v in unique_values], dtype=bool)
+
+    # 2. 행 분류: 빈 행(A, B 모두 비어 있음)은 현재 Q-code를 끊고,
+    #    Q-code 후보 A + 비어 있지 않은 B 는 질문 코드(Q-code) 행
+    is_blank = a_missing & b_missing
+    is_header = unique_is_q_code[codes] & ~b_missing
+    header_rows = np.flatnonzero(is_header)
+
+    # 3. 행마다 현재 Q-code 행의 위치를 forward-fill (빈 행 이후는 -1)
+    positions = np.arange(len(col_a))
+    header_pos = pd.Series(np.where(is_header, positions, np.where(is_blank, -1, np.nan))).ffill()
+    header_pos = header_pos.fillna(-1).astype(np.int64).to_numpy()
+
+    # 4. Q-code 행: 같은 Q-code가 다시 나오면 문항 텍스트와 응답 사전을 새로 시작 (마지막 정의만 유효)
+    qcode_to_question = {}
+    value_labels = {}
+    last_header_of = {}
+    for pos in header_rows.tolist():
+        q_code = col_a[pos]
+        qcode_to_question[q_code] = col_b[pos]
+        value_labels[q_code] = {}
+        last_header_of[q_code] = pos
+
+    # 5. 코드/응답 쌍: 현재 Q-code가 있고(빈 문자열 제외) A, B 모두 값이 있으며 A가 숫자인 헤더 외 행
+    is_empty_header = np.zeros(len(col_a), dtype=bool)
+    is_empty_header[header_rows] = col_a[header_rows] == ''
+    has_current = (header_pos >= 0) & ~is_empty_header[np.maximum(header_pos, 0)]
+    pair_rows = np.flatnonzero(has_current & ~is_header & ~b_missing & unique_has_value[codes])
+    pair_header = header_pos[pair_rows]
+    pair_values = unique_values[codes[pair_rows]]
+    pair_labels = col_b[pair_rows]
+
+    # 헤더(Q-code 행)별 행 위치를 groupby 한 번으로 구한다
+    # 같은 헤더 아래에서 같은 코드가 반복되면 마지막 응답 텍스트 사용 (dict 대입과 동일)
+    for pos, rows in pd.Series(pair_header).groupby(pair_header, sort=False).indices.items():
+        q_code = col_a[pos]
+        if last_header_of[q_code] == pos:
+            value_labels[q_code] = dict(zip(pair_values[rows].tolist(), pair_labels[rows].tolist()))
+
+    return qcode_to_question, value_labels
+
+def apply_value_labels(df_data, value_labels):
+    """
+    Replaces the numeric codes of every coded column with their label text, matching
+    df[col].replace(value_labels[col]) per column: only the distinct values of a column
+    (factorize) are looked up, then labels are taken back by code. Values without a label
+    are kept, and columns with no matching value keep their dtype. Returns df_data.
+    """
+    for index, col in enumerate(df_data.columns):
+        if col not in value_labels or not value_labels[col]:
+            continue
+        series = df_data.iloc[:, index]
+        # replace()는 bool 컬럼의 True/False를 1/0 코드로 보지 않음
+        if series.dtype == bool:
+            continue
+
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        labels = value_labels[col]
+        unique_labels = np.empty(len(uniques), dtype=object)
+        matched = np.zeros(len(uniques), dtype=bool)
+        for position, value in enumerate(uniques):
+            try:
+                if value in labels:
+                    unique_labels[position] = labels[value]
+                    matched[position] = True
+            except TypeError: # hash 불가능한 값
+                continue
+        if not matched.any():
+            continue
+
+        values = series.to_numpy(dtype=object, copy=True)
+        row_matched = (codes >= 0) & matched[codes]
+        values[row_matched] = unique_labels[codes[row_matched]]
+        df_data.isetitem(index, pd.Series(values, index=series.index, dtype=object))
+    return df_data
+
 def load_and_standardize_file(path, final_mapping):
     """
     Parses a non-standard label sheet to map values and standardize column names.
     Returns the processed DataFrame and the generated label maps.
     """
     try:
-        xlsx = pd.ExcelFile(path)
-        df_label = xlsx.parse(xlsx.sheet_names[1])  # 두번째 sheet(label)
-        qcode_to_question = {}
-        value_labels = {}
-        current_q_code = None
-
-        # 레이블 시트의 모든 행을 순차적으로 반복
-        for row in df_label.itertuples(index=False, name=None):
-            col_a, col_b = row[0], row[1]
-
-            if pd.isna(col_a) and pd.isna(col_b):
-                current_q_code = None
-                continue
-
-            is_q_code = isinstance(col_a, str) and not col_a.isnumeric()
-
-            # 질문 코드(Q-code)와 문항 텍스트('직업')가 모두 존재하는 행을 찾는다
-            if is_q_code and pd.notna(col_b):
-                current_q_code = col_a
-                # 컬럼명 변경용) Q-code를 key로, 문항 텍스트를 값으로 하는 dictionary(qcode_to_question) 생성
-                qcode_to_question[current_q_code] = col_b
-                # 해당 Q-code 아래에 value-label mapping 을 저장할 새 딕셔너리 준비
-                value_labels[current_q_code] = {}
-            # 질문 코드 정의가 된 상태(current_q_code != None)에서 하위행에 있는 숫자 코드(col_a)와 응답 텍스트(col_b) 쌍을 찾는다
-            elif current_q_code and pd.notna(col_a) and pd.notna(col_b):
-                # col_a를 숫자로 변환하여 응답 매핑 사전(value_labels)생성한다
-                try:
-                    value = float(col_a)
-                    if value.is_integer():
-                        value = int(value)
-                    value_labels[current_q_code][value] = col_b
-                except (ValueError, TypeError):
-                    continue
+        # 두번째 sheet(label): 시트 내용이 이전 실행과 같으면 파싱 결과를 캐시에서 가져온다
+        # (read-only 스트리밍 리더로 시트를 청크 단위로 읽는다, pd.ExcelFile.parse와 동일한 결과)
+        qcode_to_question, value_labels = label_cache.load_or_parse(
+            path, 1, LABEL_CACHE_NAMESPACE, lambda: parse_label_sheet(read_sheet(path, 1))
+        )
         
         # data sheet
-        df_data = xlsx.parse(xlsx.sheet_names[0])   # 첫번째 sheet(label)
+        df_data = read_sheet(path, 0)   # 첫번째 sheet(data)
 
         # Skip the first row of data, which seems to be a duplicate header
         df_data = df_data.iloc[1:].reset_index(drop=True)
 
-        # 데이터 시트의 모든 컬럼 순회하면서
-        for col in df_data.columns:
-            # 해당 컬럼(Q-code)에 대해 value_labels가 존재하는지 확인한다
-            if col in value_labels:
-                # 데이터 시트 내에서 해당 컬럼의 숫자 값을 준비된 한글 응답 텍스트로 일관 치환한다
-                df_data[col] = df_data[col].replace(value_labels[col])
+        # value_labels가 있는 모든 컬럼(Q-code)의 숫자 값을 한글 응답 텍스트로 치환한다
+        apply_value_labels(df_data, value_labels)
 
         # Q-code 를 문항 텍스트로 변경한 후, final_mapping을 사용해 영문키로 변경 -> 컬럼 매핑 딕셔너리 생성
         renamer_dict = {}
@@ -128,11 +215,101 @@ def load_and_standardize_file(path, final_mapping):
 
 # --- 2. 통합 및 JSON 변환 ---
 
-def integrate_and_finalize(file_paths, final_mapping):
+def load_all_files(file_paths, final_mapping, workers=1):
+    """
+    Runs load_and_standardize_file for every file, in parallel processes when workers > 1.
+    Returns the results in the order of file_paths.
+    """
+    keys = list(file_paths)
+    results = {}
+    for index, result, error, elapsed in run_tasks(
+        label_cache.call_with_stats,
+        [(load_and_standardize_file, file_paths[key], final_mapping) for key in keys],
+        workers=workers
+    ):
+        if error:
+            raise RuntimeError(f"'{file_paths[keys[index]]}' 파일 처리 실패:\n{error}")
+        print(f"[{elapsed:7.2f}s] {os.path.basename(file_paths[keys[index]])} 로드 완료")
+        loaded, cache_stats, pid = result
+        label_cache.add_worker_stats(cache_stats, pid)
+        results[keys[index]] = loaded
+    return [results[key] for key in keys]
+
+def _parse_multi_select_token(token):
+    """'3' -> 3 / 숫자가 아니면 None (기존 int(val) 규칙과 동일)"""
+    try:
+        return int(token)
+    except (ValueError, TypeError):
+        return None
+
+def decode_multi_select_columns(df, labels_by_column):
+    """
+    Decodes comma-joined multi-select codes ("1,3,5") into label lists for every column
+    in labels_by_column, in one pass over the frame:
+    factorize -> string split -> explode -> label dict map -> regroup into lists -> take.
+    Non-string cells are left as they are; unknown codes keep their int value and
+    non-numeric tokens are kept as text. The frame is updated in place and returned.
+    """
+    columns = [col for col in labels_by_column if col in df.columns]
+    if not columns:
+        return df
+
+    # 1. 컬럼별 factorize -> 응답 문자열 종류("1,3" 등)는 패널 수보다 훨씬 적으므로 고유 문자열만 디코딩한다
+    column_values, column_codes, column_str_codes, str_cells = [], [], [], []
+    for col in columns:
+        values = df[col].to_numpy(dtype=object)
+        codes, uniques = pd.factorize(values)
+        uniques = np.asarray(uniques, dtype=object)
+        str_codes = np.flatnonzero([isinstance(unique, str) for unique in uniques])
+        column_values.append(values)
+        column_codes.append(codes)
+        column_str_codes.append(str_codes)
+        str_cells.append(uniques[str_codes])
+
+    # 모든 컬럼의 고유 문자열을 하나의 Series로 쌓는다 (셀마다 컬럼 번호 기록)
+    cell_col_codes = np.repeat(np.arange(len(columns)), [len(str_codes) for str_codes in column_str_codes])
+    cells = pd.Series(np.concatenate(str_cells), dtype=object)
+
+    # 2. split -> explode -> strip, 빈 토큰 제거 (index = 고유 셀 번호)
+    tokens = cells.str.split(',').explode().str.strip() if len(cells) else pd.Series(dtype=object)
+    tokens = tokens[tokens.notna() & (tokens != "")]
+    token_cells = tokens.index.to_numpy()
+
+    # 3. 라벨 사전 매핑 (숫자가 아닌 토큰은 그대로, 사전에 없는 숫자는 int 그대로)
+    token_list = tokens.tolist()
+    num_values = [_parse_multi_select_token(token) for token in token_list]
+    labels = [
+        labels_by_column[columns[col_code]].get(num_val, num_val) if num_val is not None else token
+        for col_code, num_val, token in zip(cell_col_codes[token_cells].tolist(), num_values, token_list)
+    ]
+
+    # 4. 고유 셀 단위로 다시 리스트로 묶는다 (explode 결과는 셀 순서 유지, 토큰이 없던 셀은 빈 리스트)
+    counts = np.bincount(token_cells.astype(np.int64), minlength=len(cells))
+    ends = np.cumsum(counts)
+    decoded_cells = [labels[end - count:end] for count, end in zip(counts.tolist(), ends.tolist())]
+
+    # 5. 코드로 전체 패널에 펼친다 (같은 응답 문자열의 셀은 같은 리스트 객체를 공유하므로, 결과 리스트는 수정하지 말 것)
+    start = 0
+    for values, codes, str_codes, col in zip(column_values, column_codes, column_str_codes, columns):
+        decoded_by_code = np.full(codes.max() + 1 if len(codes) else 0, None, dtype=object)
+        for code, decoded in zip(str_codes, decoded_cells[start:start + len(str_codes)]):
+            decoded_by_code[code] = decoded
+        start += len(str_codes)
+
+        values = values.copy()
+        rows = np.flatnonzero(np.isin(codes, str_codes))
+        values[rows] = decoded_by_code[codes[rows]]
+        # Series.apply와 동일하게 결과 dtype을 다시 추론한다 (문자열 셀이 없던 컬럼 등)
+        df[col] = pd.Series(values, index=df.index, dtype=object).infer_objects()
+    return df
+
+def integrate_and_finalize(file_paths, final_mapping, workers=1):
     """Integrates files, handles multi-select fields, and finalizes the DataFrame."""
     
-    df1, q_map1, v_map1 = load_and_standardize_file(file_paths['file1'], final_mapping)
-    df2, q_map2, v_map2 = load_and_standardize_file(file_paths['file2'], final_mapping)
+    # workers > 1 이면 두 Welcome 파일을 별도 프로세스에서 동시에 파싱
+    (df1, q_map1, v_map1), (df2, q_map2, v_map2) = load_all_files(
+        {'file1': file_paths['file1'], 'file2': file_paths['file2']}, final_mapping, workers=workers
+    )
 
     # Merge DataFrames
     df_merged = pd.merge(df1, df2, on=MERGE_KEY, how='outer', suffixes=('_f1', '_f2'))
@@ -151,49 +328,52 @@ def integrate_and_finalize(file_paths, final_mapping):
     inverted_final_map = {v: k for k, v in final_mapping.items()}
     inverted_q_map = {v: k for k, v in q_map_all.items()}
 
-    def apply_multi_select_labels(value_str, labels):
-        if not isinstance(value_str, str):
-            return value_str # Return as is if not a string
-        
-        labeled_values = []
-        # Split by comma and handle potential spaces
-        for val in value_str.split(','):
-            val = val.strip()
-            if not val:
-                continue
-            try:
-                num_val = int(val)
-                labeled_values.append(labels.get(num_val, num_val))
-            except (ValueError, TypeError):
-                labeled_values.append(val) # Keep as is if not a number
-        return labeled_values
-
+    # 라벨 맵이 있는 다중선택 컬럼만 모아서 한 번에 디코딩
+    labels_by_column = {}
     for key in multi_select_keys:
         if key in df_merged.columns:
             question_text = inverted_final_map.get(key)
             q_code = inverted_q_map.get(question_text)
             
             if q_code and q_code in v_map_all:
-                labels = v_map_all[q_code]
-                df_merged[key] = df_merged[key].apply(lambda x: apply_multi_select_labels(x, labels))
+                labels_by_column[key] = v_map_all[q_code]
+
+    decode_multi_select_columns(df_merged, labels_by_column)
 
     return df_merged
 
 # --- 메인 실행 ---
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Welcome1, 2 -> welcome_data.json")
+    parser.add_argument("--workers", type=int, default=1, help="두 Welcome 파일을 동시에 파싱할 프로세스 수 (기본: 1)")
+    parser.add_argument("--force", action="store_true", help="매니페스트를 무시하고 다시 변환")
+    args = parser.parse_args()
+
     # 출력 폴더 생성 (이미 있으면 통과)
     os.makedirs(OUTPUT_JSON_DIR, exist_ok=True)
+
+    manifest = build_manifest.load_manifest(MANIFEST_PATH, CONVERTER_VERSION)
+    input_paths = list(FILE_PATHS.values())
+    if not args.force and build_manifest.is_up_to_date(manifest, input_paths, OUTPUT_JSON_PATH):
+        build_manifest.save_manifest(manifest) # mtime만 바뀐 경우 갱신 내용 저장
+        print(f"입력 파일이 바뀌지 않아 변환을 건너뜁니다: '{OUTPUT_JSON_PATH}' (--force 로 다시 변환)")
+        raise SystemExit(0)
     
     try:
-        final_df = integrate_and_finalize(FILE_PATHS, FINAL_COLUMN_MAPPING)
-        final_json_list = final_df.to_dict('records')
+        final_df = integrate_and_finalize(FILE_PATHS, FINAL_COLUMN_MAPPING, workers=args.workers)
+        # outer merge로 한쪽 파일에만 있는 패널의 빈 칸(NaN)은 None으로 (코덱에 따라 NaN / null 로 달라지지 않도록)
+        final_json_list = final_df.replace({np.nan: None}).to_dict('records')
         
-        with open(OUTPUT_JSON_PATH, 'w', encoding='utf-8') as f:
-            json.dump(final_json_list, f, ensure_ascii=False, indent=4)
+        # (기본 NDJSON, PIPELINE_JSON_FORMAT=pretty 이면 indent=4 JSON)
+        write_records(OUTPUT_JSON_PATH, final_json_list)
             
         print(f"{len(FILE_PATHS)}개 파일 통합 및 최종 JSON 변환 완료.")
         print(f"총 통합 레코드 수: {len(final_json_list)}")
         print(f"결과가 '{OUTPUT_JSON_PATH}' 파일에 저장되었습니다.")
+        build_manifest.record_build(manifest, input_paths, OUTPUT_JSON_PATH)
+        build_manifest.save_manifest(manifest)
+        label_cache.evict_stale_entries()
+        print(label_cache.format_stats())
         
         if final_json_list:
             print("\n--- 첫 번째 고객의 통합 JSON 구조 (예시) ---")
@@ -0,0 +1,123 @@
+import os
+import time
+import pickle
+import hashlib
+
+from xlsx_stream_reader import iter_sheet_rows
+
+# --- 0. 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 파싱된 라벨(코드북) 시트를 저장하는 폴더
+CACHE_DIR = os.path.join(SCRIPT_DIR, '.label_cache')
+
+# 정리(eviction) 정책: 마지막 사용 후 MAX_AGE_DAYS일이 지난 항목은 삭제하고,
+# 그래도 MAX_ENTRIES개를 넘으면 오래 사용하지 않은 순서대로 삭제한다.
+MAX_ENTRIES = 500
+MAX_AGE_DAYS = 90
+
+# 이 프로세스에서의 캐시 사용 통계 (실행 요약에 출력)
+STATS = {'hits': 0, 'misses': 0, 'evicted': 0}
+
+
+# --- 1. 키 계산 ---
+
+def hash_sheet(path, sheet_index, namespace):
+    """sha256 of the sheet's cell values (and the parser namespace/version)."""
+    digest = hashlib.sha256(namespace.encode('utf-8'))
+    for row in iter_sheet_rows(path, sheet_index):
+        # repr은 타입까지 구분한다 (1 vs '1')
+        digest.update(repr(row).encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+# --- 2. 조회 / 저장 ---
+
+def load_or_parse(path, sheet_index, namespace, parse_func, cache_dir=CACHE_DIR):
+    """
+    Returns the parsed label structure for a label sheet.
+    On a hit the cached result is returned without calling parse_func; on a miss
+    parse_func() is called and its result is stored under the sheet's content hash.
+    """
+    key = hash_sheet(path, sheet_index, namespace)
+    entry_path = os.path.join(cache_dir, f"{namespace}-{key}.pkl")
+
+    try:
+        with open(entry_path, 'rb') as f:
+            parsed = pickle.load(f)
+        os.utime(entry_path) # LRU 정리를 위해 마지막 사용 시각 갱신
+        STATS['hits'] += 1
+        return parsed
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"  > 라벨 캐시 항목을 읽을 수 없어 다시 파싱합니다: {os.path.basename(entry_path)}, {e}")
+
+    STATS['misses'] += 1
+    parsed = parse_func()
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 동시에 실행되는 워커끼리 덮어쓰더라도 깨진 파일이 남지 않도록 임시 파일 -> rename
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+    except OSError as e:
+        print(f"  > 라벨 캐시 저장 실패 (계속 진행): {e}")
+
+    return parsed
+
+
+# --- 3. 정리 (eviction) ---
+
+def evict_stale_entries(cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_age_days=MAX_AGE_DAYS):
+    """Deletes entries unused for max_age_days, then the least recently used ones above max_entries."""
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith('.pkl'):
+            entry_path = os.path.join(cache_dir, name)
+            entries.append((os.path.getmtime(entry_path), entry_path))
+    entries.sort(reverse=True) # 최근 사용 순
+
+    expire_before = time.time() - max_age_days * 24 * 60 * 60
+    evicted = 0
+    for rank, (last_used, entry_path) in enumerate(entries):
+        if rank >= max_entries or last_used < expire_before:
+            try:
+                os.remove(entry_path)
+                evicted += 1
+            except OSError:
+                pass
+
+    STATS['evicted'] += evicted
+    return evicted
+
+
+# --- 4. 통계 ---
+
+def call_with_stats(func, *args):
+    """
+    Runs func(*args) and also returns the cache stats counted during the call and the pid.
+    Used for worker processes, whose STATS are not visible to the parent process.
+    """
+    before = dict(STATS)
+    result = func(*args)
+    delta = {name: STATS[name] - before[name] for name in STATS}
+    return result, delta, os.getpid()
+
+
+def add_worker_stats(delta, pid):
+    """Adds the stats of a call_with_stats result, unless it already ran in this process."""
+    if pid == os.getpid():
+        return
+    for name, value in delta.items():
+        STATS[name] += value
+
+
+def format_stats():
+    return f"Label cache: {STATS['hits']} hits, {STATS['misses']} misses, {STATS['evicted']} evicted"
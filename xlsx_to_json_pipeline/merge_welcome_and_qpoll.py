@@ -1,7 +1,15 @@
 
+import os
+import sys
 import json
+import argparse
 import pandas as pd
 
+# 파이프라인 공통 JSON 입출력 (NDJSON / pretty 자동 구분)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.json_io import iter_records, RecordWriter
+from streaming_join import DEFAULT_CHUNK_SIZE, stream_left_join
+
 # --- Configuration ---
 QPOLL_DATA_PATH = 'qpoll_data.json'
 MERGED_DATA_PATH = 'welcome_data.json'
@@ -9,49 +17,41 @@ FINAL_OUTPUT_PATH = 'final_data.json'
 
 # --- Main Execution ---
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="welcome_data.json + qpoll_data.json -> final_data.json (panel_id 기준 left join)")
+    parser.add_argument("--presorted", action="store_true", help="두 입력이 이미 panel_id 순으로 정렬되어 있음 (외부 정렬 생략)")
+    parser.add_argument("--sorted-output", action="store_true", help="qpoll 원래 순서 대신 panel_id 순으로 출력 (정렬 1회 생략)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"외부 정렬 시 메모리에 올리는 레코드 수 (기본: {DEFAULT_CHUNK_SIZE:,})")
+    args = parser.parse_args()
+
     try:
-        # 1. Load the JSON files
-        with open(QPOLL_DATA_PATH, 'r', encoding='utf-8') as f:
-            qpoll_data = json.load(f)
-        
-        with open(MERGED_DATA_PATH, 'r', encoding='utf-8') as f:
-            merged_data = json.load(f)
-
-        print(f"Loaded {len(qpoll_data)} records from {QPOLL_DATA_PATH}")
-        print(f"Loaded {len(merged_data)} records from {MERGED_DATA_PATH}")
-
-        # 2. Create a lookup dictionary for the merged_data
-        merged_data_lookup = {record['panel_id']: record for record in merged_data if 'panel_id' in record}
-
-        # 3. Iterate through qpoll_data and merge
-        final_data = []
-        for qpoll_record in qpoll_data:
-            panel_id = qpoll_record.get('panel_id')
-            if panel_id in merged_data_lookup:
-                # Get the corresponding record from merged_data
-                demographic_record = merged_data_lookup[panel_id]
-                
-                # Create a new record starting with demographic data
-                # and then add the survey data.
-                # This avoids overwriting existing keys in qpoll_record if they conflict.
-                combined_record = demographic_record.copy()
-                combined_record.update(qpoll_record)
-                final_data.append(combined_record)
-            else:
-                # If no matching demographic data, keep the qpoll record as is
-                final_data.append(qpoll_record)
-
-        # 4. Write the final merged data
-        with open(FINAL_OUTPUT_PATH, 'w', encoding='utf-8') as f:
-            json.dump(final_data, f, ensure_ascii=False, indent=4)
+        # 1~3. panel_id 기준 sort-merge left join
+        # 두 입력을 외부 정렬(정렬된 run을 임시 파일로 내보낸 뒤 병합)해서 한 레코드씩 맞춰 나가므로
+        # 패널 수와 관계없이 메모리에는 chunk_size개 정도의 레코드만 올라간다.
+        # - qpoll 레코드는 모두 출력 (welcome에 없으면 그대로)
+        # - 있으면 welcome 레코드 위에 qpoll 레코드를 덮어씀 (같은 panel_id가 여러 번 있으면 마지막 welcome 레코드 사용)
+        merged_records = stream_left_join(
+            iter_records(QPOLL_DATA_PATH),
+            iter_records(MERGED_DATA_PATH),
+            presorted=args.presorted,
+            keep_left_order=not args.sorted_output,
+            chunk_size=args.chunk_size,
+        )
+
+        # 4. Write the final merged data as it is produced
+        first_record = None
+        with RecordWriter(FINAL_OUTPUT_PATH) as writer:
+            for combined_record in merged_records:
+                writer.write(combined_record)
+                if first_record is None:
+                    first_record = combined_record
 
         print(f"\nSuccessfully merged the data.")
-        print(f"Total records in final file: {len(final_data)}")
+        print(f"Total records in final file: {writer.count}")
         print(f"Final data saved to '{FINAL_OUTPUT_PATH}'")
 
-        if final_data:
+        if first_record is not None:
             print("\n--- First Record Example ---")
-            print(json.dumps(final_data[0], indent=4, ensure_ascii=True))
+            print(json.dumps(first_record, indent=4, ensure_ascii=True))
 
     except Exception as e:
         print(f"\n--- An error occurred during merging ---")
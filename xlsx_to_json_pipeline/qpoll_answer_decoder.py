@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# 라벨 시트의 보기 키 접두어 ("보기1", "보기2", ...)
+ANSWER_KEY_PREFIX = "보기"
+
+
+def _parse_answer_id(token):
+    """'3', '3.0', ' 3 ' -> 3 / 숫자가 아니면 None (기존 int(float(id_val)) 규칙과 동일)"""
+    try:
+        return int(float(token))
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _build_int_label_array(value_label_map):
+    """
+    {"보기1": "라벨", ...} -> 정수 인덱스 라벨 배열 (array[1] == "라벨", 없는 번호는 None)
+    f"보기{num_id}" 로 만들어질 수 있는 키만 대상으로 한다.
+    """
+    int_labels = {}
+    for key, label in value_label_map.items():
+        if not key.startswith(ANSWER_KEY_PREFIX):
+            continue
+        num_part = key[len(ANSWER_KEY_PREFIX):]
+        num_id = _parse_answer_id(num_part)
+        if num_id is not None and num_id >= 0 and str(num_id) == num_part:
+            int_labels[num_id] = label
+
+    labels = np.full(max(int_labels, default=-1) + 1, None, dtype=object)
+    for num_id, label in int_labels.items():
+        labels[num_id] = label
+    return labels
+
+
+def decode_survey_answers(questions, raw_answers, all_label_maps):
+    """
+    Columnar replacement for the row-wise apply_labels_from_map.
+    Splits the comma-joined answer codes, explodes them, maps them through per-question
+    integer-keyed label arrays and re-aggregates them into one list per row.
+    Returns a list of label lists aligned with the input rows (same results, including
+    the 'Unknown ID' and 'Map not found' sentinels).
+    """
+    row_count = len(raw_answers)
+    results = [[] for _ in range(row_count)]
+    if row_count == 0:
+        return results
+
+    # 1. 질문별 코드 부여 후, 질문마다 한 번만 라벨 맵을 찾는다
+    question_codes, unique_questions = pd.factorize(pd.Series(questions, copy=False), use_na_sentinel=False)
+    question_keys = [str(question).strip() for question in unique_questions]
+    label_maps = [all_label_maps.get(key) for key in question_keys]
+
+    has_answer = pd.notna(pd.Series(raw_answers, copy=False)).to_numpy()
+    has_map = np.array([label_map is not None for label_map in label_maps], dtype=bool)[question_codes]
+
+    for row in np.flatnonzero(has_answer & ~has_map):
+        results[row] = [f"Map not found for '{question_keys[question_codes[row]]}'"]
+
+    rows = np.flatnonzero(has_answer & has_map)
+    if len(rows) == 0:
+        return results
+
+    # 2. "1,3,5" -> 행마다 1개 토큰으로 explode
+    tokens = pd.Series(raw_answers, copy=False).iloc[rows].astype(str).str.split(',')
+    tokens.index = rows
+    tokens = tokens.explode().str.strip()
+    token_rows = tokens.index.to_numpy()
+
+    # 3. 고유 토큰만 정수로 변환 (빈 토큰 / 숫자가 아닌 토큰은 제외)
+    token_codes, unique_tokens = pd.factorize(tokens)
+    unique_ids = [_parse_answer_id(token) if token else None for token in unique_tokens]
+    valid_unique = np.array([num_id is not None for num_id in unique_ids], dtype=bool)
+    keep = valid_unique[token_codes]
+    token_rows = token_rows[keep]
+    token_codes = token_codes[keep]
+    if len(token_rows) == 0:
+        return results
+
+    # 4. 질문별 정수 라벨 배열을 하나의 평탄 배열로 이어붙이고, (offset + id)로 한 번에 조회
+    label_arrays = [
+        _build_int_label_array(label_map) if label_map is not None else np.empty(0, dtype=object)
+        for label_map in label_maps
+    ]
+    lengths = np.array([len(labels) for labels in label_arrays], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    flat_labels = np.concatenate(label_arrays) if lengths.sum() else np.empty(0, dtype=object)
+
+    # int64 범위를 넘는 번호는 -1로 두어 배열 조회에서 제외 (아래 맵 조회로 처리)
+    int64_max = np.iinfo(np.int64).max
+    unique_ids_i64 = np.array(
+        [num_id if num_id is not None and -int64_max <= num_id <= int64_max else -1 for num_id in unique_ids],
+        dtype=np.int64
+    )
+    answer_ids = unique_ids_i64[token_codes]
+    answer_questions = question_codes[token_rows]
+    in_range = (answer_ids >= 0) & (answer_ids < lengths[answer_questions])
+
+    labels = np.full(len(answer_ids), None, dtype=object)
+    labels[in_range] = flat_labels[offsets[answer_questions[in_range]] + answer_ids[in_range]]
+
+    # 배열에서 찾지 못한 번호(드묾)는 원래 맵에서 한 번 더 찾고, 없으면 기존과 동일한 'Unknown ID' 문구
+    for position in np.flatnonzero(np.equal(labels, None)):
+        key = f"{ANSWER_KEY_PREFIX}{unique_ids[token_codes[position]]}"
+        labels[position] = label_maps[answer_questions[position]].get(key, f"Unknown ID: {key}")
+
+    # 5. 행 단위 리스트로 재집계 (explode 결과는 행 순서가 유지되어 있음)
+    counts = np.bincount(token_rows, minlength=row_count)
+    ends = np.cumsum(counts)
+    labels = labels.tolist()
+    for row in np.flatnonzero(counts):
+        results[row] = labels[ends[row] - counts[row]:ends[row]]
+    return results
@@ -0,0 +1,386 @@
+import pandas as pd
+import json
+import numpy as np
+import glob
+import os
+import sys
+import time
+import argparse
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from xlsx_stream_reader import read_sheet
+from qpoll_answer_decoder import decode_survey_answers
+import label_cache
+import build_manifest
+
+# qpoll 워크북 -> long 포맷 컬럼형 중간 파일(Parquet) 단계
+# convert_qpoll_to_json.py / convert_qpolls_to_merged_json.py 는 모두 이 파일을 읽어서 만들어지므로
+# 엑셀은 워크북당 한 번만 파싱된다.
+
+# --- 0. 설정 ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from common.process_pool import default_workers, run_tasks
+
+INPUT_PATTERN = os.path.join(SCRIPT_DIR, 'data/Quickpoll/qpoll*.xlsx')
+INPUT_FILES = glob.glob(INPUT_PATTERN)
+
+# 워크북당 하나씩 저장하는 중간 파일 폴더 (예: qpoll_long_output/qpoll_join_250106.parquet)
+LONG_TABLE_DIR = os.path.join(SCRIPT_DIR, 'qpoll_long_output')
+
+# process_qpoll_file 결과나 저장 형식이 바뀌면 올릴 것 -> 다음 실행에서 모든 중간 파일을 다시 생성
+LONG_TABLE_VERSION = '1'
+
+# Parquet 스키마 메타데이터 키 (원본 워크북 정보를 중간 파일 자체에 기록)
+SOURCE_METADATA_KEY = b'qpoll_source'
+
+# --- 1. 워크북 파싱 ---
+COLUMN_MAPPING = {
+    '구분': 'category',
+    '고유번호': 'panel_id',
+    '성별': 'gender',
+    '나이': 'age_raw',
+    '지역': 'region',
+    '설문일시': 'survey_timestamp'
+}
+
+# 라벨 시트 파싱 캐시 구분자 (parse_qpoll_label_sheet 로직이 바뀌면 버전을 올릴 것)
+LABEL_CACHE_NAMESPACE = 'qpoll-label-v1'
+
+# 라벨 시트 블록 표시 문자열 (A열 '설문제목' 행 = 보기 ids 행, ids 행의 '총참여자수' 셀 = 보기 목록의 끝)
+TITLE_MARKER = "설문제목"
+TOTAL_MARKER = '총참여자수'
+
+def _is_marker(value, marker):
+    return isinstance(value, str) and value.strip() == marker
+
+def _non_text_label_error(sheet_name, row_index, value):
+    return ValueError(
+        f"qpoll label sheet {sheet_name}, row {row_index + 1}: non-text label in column A ({value!r})"
+    )
+
+def parse_qpoll_label_sheet(df_labels, sheet_name="label"):
+    """
+    Parses the label sheet (header=None) block by block ('설문제목' row + label row)
+    and returns label_data_in_order: [{"text": 질문 텍스트, "map": {"보기1": 라벨, ...}}, ...]
+    All block boundaries are found with one vectorized search over column A, and the
+    id / label rows are sliced from a single numpy array of the sheet.
+    Raises ValueError for a non-text cell in column A before the end of the label blocks.
+    """
+    # 라벨 맵과 질문 텍스트를 함께 저장할 리스트
+    label_data_in_order = []
+    values = df_labels.to_numpy(dtype=object)
+    row_count = len(values)
+    if row_count == 0:
+        return label_data_in_order
+    col_a = values[:, 0]
+
+    # 1. A열 전체에서 '설문제목' 행 / 빈 셀 / 문자열이 아닌 셀 위치를 한 번에 찾는다
+    title_rows = np.flatnonzero(np.frompyfunc(_is_marker, 2, 1)(col_a, TITLE_MARKER).astype(bool))
+    missing = pd.isna(col_a)
+    missing_rows = np.flatnonzero(missing)
+    non_text_rows = np.flatnonzero(~missing & ~np.frompyfunc(isinstance, 2, 1)(col_a, str).astype(bool))
+
+    # 2. '설문제목' 행마다 '총참여자수' 위치 (없으면 행 끝까지) - 모든 ids 행을 한 번에 검사
+    id_rows = values[title_rows, 1:]
+    is_total = np.frompyfunc(_is_marker, 2, 1)(id_rows, TOTAL_MARKER).astype(bool)
+    stop_cols = np.full(len(title_rows), id_rows.shape[1])
+    if id_rows.shape[1]:
+        stop_cols = np.where(is_total.any(axis=1), is_total.argmax(axis=1), stop_cols)
+
+    def first_at_or_after(rows, start):
+        index = np.searchsorted(rows, start)
+        return rows[index] if index < len(rows) else row_count
+
+    # 3. 블록 순서대로 처리: A열은 위에서부터 차례로 검사하며, 빈 셀을 만나면 멈추고
+    #    라벨 행(블록의 두 번째 행)은 검사하지 않는다
+    scan_from = 0
+    for title_row, stop_col in zip(title_rows.tolist(), stop_cols.tolist()):
+        if title_row < scan_from:
+            continue # 직전 블록의 라벨 행
+        stop_row = min(first_at_or_after(missing_rows, scan_from), title_row)
+        non_text_row = first_at_or_after(non_text_rows, scan_from)
+        if non_text_row < stop_row:
+            raise _non_text_label_error(sheet_name, non_text_row, col_a[non_text_row])
+        if stop_row < title_row:
+            return label_data_in_order
+
+        label_row = title_row + 1
+        if label_row >= row_count:
+            return label_data_in_order
+
+        # 3-1. 다음 행 A열의 실제 질문 텍스트와 보기 ids / labels 행을 '총참여자수' 앞까지 자른다
+        question_text = col_a[label_row]
+        if pd.isna(question_text):
+            question_text = "" # A열이 비어있을 경우
+        elif not isinstance(question_text, str):
+            raise _non_text_label_error(sheet_name, label_row, question_text)
+        question_text = question_text.strip()
+
+        ids = values[title_row, 1:stop_col + 1]
+        labels = values[label_row, 1:stop_col + 1]
+        present = ~(pd.isna(ids) | pd.isna(labels))
+
+        # 3-2. 라벨 맵과 질문 텍스트를 함께 리스트에 추가
+        label_data_in_order.append({
+            "text": question_text,
+            "map": {str(id_).strip(): label for id_, label in zip(ids[present], labels[present])}
+        })
+        scan_from = label_row + 1
+
+    # 마지막 블록 이후에도 기존과 같이 A열을 첫 빈 셀까지 검사
+    non_text_row = first_at_or_after(non_text_rows, scan_from)
+    if non_text_row < first_at_or_after(missing_rows, scan_from):
+        raise _non_text_label_error(sheet_name, non_text_row, col_a[non_text_row])
+    return label_data_in_order
+
+def process_qpoll_file(path):
+    """
+    Processes a single qpoll-formatted Excel file into a structured DataFrame.
+    [Final logic: Replaces '문항1' with '실제 질문 텍스트' in final output]
+    """
+    try:
+        # 1. Sheet 2를 읽어, 라벨 맵과 '질문 텍스트'를 순서대로 리스트에 저장
+        # 시트 내용이 이전 실행과 같으면 파싱 결과를 캐시에서 가져온다 (read-only 스트리밍 리더 사용)
+        label_data_in_order = label_cache.load_or_parse(
+            path, 1, LABEL_CACHE_NAMESPACE,
+            lambda: parse_qpoll_label_sheet(read_sheet(path, 1, header=None), os.path.basename(path))
+        )
+
+        # 2. Sheet 1에서 데이터 읽기
+        df_data = read_sheet(path, 0, header=1)
+
+        # 3. '문항1'과 데이터를 매핑하는 딕셔너리 2개 생성
+        
+        # 3-1. G열부터 헤더(컬럼명)의 공백을 제거
+        rename_map = {}
+        for col_name in df_data.columns[6:]: # G열부터
+            if pd.isna(col_name):
+                continue
+            stripped_name = str(col_name).strip()
+            if col_name != stripped_name:
+                rename_map[col_name] = stripped_name
+        
+        if rename_map:
+            print(f"Normalizing {len(rename_map)} column headers...")
+            df_data.rename(columns=rename_map, inplace=True)
+            
+        # 3-2. G열(인덱스 6)부터의 '문항' 컬럼 이름을 리스트로 가져옴
+        question_cols = list(df_data.columns[6:]) 
+        
+        if not question_cols:
+            print(f"Warning: No question columns (G onwards) found in {path}")
+            return pd.DataFrame()
+            
+        # 3-3. 2개의 딕셔너리를 생성
+        all_label_maps = {}    # "문항1" -> {라벨 맵} (라벨 변환용)
+        question_text_map = {} # "문항1" -> "실제 질문 텍스트" (교체용)
+        
+        for i, col_name in enumerate(question_cols):
+            if i < len(label_data_in_order):
+                data_blob = label_data_in_order[i]
+                all_label_maps[col_name] = data_blob['map']
+                question_text_map[col_name] = data_blob['text']
+            else:
+                print(f"Warning: No label data found for column '{col_name}' (index {i})")
+                all_label_maps[col_name] = {}
+                question_text_map[col_name] = col_name # 기본값으로 '문항1' 사용
+
+        # 4. Wide to Long (melt)
+        id_vars = list(df_data.columns[:6])
+        df_melted = df_data.melt(
+            id_vars=id_vars,
+            value_vars=question_cols,
+            var_name='survey_question',    # "문항1", "문항2"가 이 컬럼으로
+            value_name='survey_answers_raw'
+        )
+
+        # 5~6. 라벨 적용 (컬럼 단위 디코딩: split -> explode -> 정수 라벨 배열 조회 -> 리스트로 재집계)
+        df_melted['survey_answers'] = decode_survey_answers(
+            df_melted['survey_question'], df_melted['survey_answers_raw'], all_label_maps
+        )
+
+        # 7. [신규] 'survey_question' 컬럼의 값을 "문항1" -> "실제 질문 텍스트"로 교체
+        df_melted['survey_question'] = df_melted['survey_question'].map(question_text_map).fillna(df_melted['survey_question'])
+
+        # 8. [수정] 컬럼 정리 (기존 7번)
+        df_melted.drop(columns=['survey_answers_raw'], inplace=True)
+        df_melted.rename(columns=COLUMN_MAPPING, inplace=True)
+
+        # 9. [수정] NaN 값 정리 후 반환 (기존 8번)
+        return df_melted.replace({np.nan: None})
+
+    except Exception as e:
+        print(f"Error processing file {path}: {e}")
+        raise
+
+
+# --- 2. 중간 파일 저장 / 읽기 ---
+
+# 컬럼 값의 타입이 하나로 정해지면 해당 Arrow 타입으로 저장
+_ARROW_SCALAR_TYPES = {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+
+
+def _encode_column(values):
+    """
+    Returns (arrow array, is_json) for a list of Python values.
+    Columns with mixed value types (e.g. '30' and 30, or NaN in a text column) are stored as
+    JSON strings so that reading them back gives exactly the same values and types.
+    """
+    value_types = {type(value) for value in values if value is not None}
+    if len(value_types) <= 1:
+        value_type = next(iter(value_types), None)
+        try:
+            if value_type is None:
+                return pa.array(values, type=pa.null()), False
+            if value_type in _ARROW_SCALAR_TYPES:
+                return pa.array(values, type=_ARROW_SCALAR_TYPES[value_type]), False
+            if value_type is list:
+                item_types = {type(item) for value in values if value is not None for item in value}
+                if item_types <= {str}:
+                    return pa.array(values, type=pa.list_(pa.string())), False
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            pass # 예: int64 범위를 넘는 정수 -> JSON 문자열로 저장
+    return pa.array([json.dumps(value, ensure_ascii=False) for value in values], type=pa.string()), True
+
+
+def long_table_path_for(file_path):
+    """'data/Quickpoll/qpoll_A.xlsx' -> 'qpoll_long_output/qpoll_A.parquet'"""
+    file_name_without_ext, _ = os.path.splitext(os.path.basename(file_path))
+    return os.path.join(LONG_TABLE_DIR, f"{file_name_without_ext}.parquet")
+
+
+def write_long_table(df, table_path, source):
+    """Writes df (object columns) to table_path atomically, with source info in the schema metadata."""
+    arrays, json_columns = [], []
+    for col_name in df.columns:
+        array, is_json = _encode_column(df[col_name].to_numpy(dtype=object).tolist())
+        arrays.append(array)
+        if is_json:
+            json_columns.append(str(col_name))
+
+    metadata = dict(source, version=LONG_TABLE_VERSION, json_columns=json_columns)
+    table = pa.Table.from_arrays(arrays, names=[str(col_name) for col_name in df.columns])
+    table = table.replace_schema_metadata({SOURCE_METADATA_KEY: json.dumps(metadata, ensure_ascii=False)})
+
+    os.makedirs(os.path.dirname(table_path), exist_ok=True)
+    tmp_path = f"{table_path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, table_path)
+
+
+def read_long_table(table_path):
+    """Reads a long table back into a DataFrame of object columns holding the original Python values."""
+    table = pq.read_table(table_path)
+    metadata = json.loads(table.schema.metadata[SOURCE_METADATA_KEY])
+    json_columns = set(metadata['json_columns'])
+
+    data = {}
+    for col_name in table.column_names:
+        values = table.column(col_name).to_pylist()
+        if col_name in json_columns:
+            values = [json.loads(value) for value in values]
+        data[col_name] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data, columns=table.column_names)
+
+
+def _read_source_metadata(table_path):
+    try:
+        schema = pq.read_schema(table_path)
+        return json.loads(schema.metadata[SOURCE_METADATA_KEY])
+    except Exception:
+        return None # 파일 없음 / 깨진 파일 / 다른 형식 -> 다시 생성
+
+
+def is_long_table_fresh(file_path, table_path):
+    """True if table_path was built from the current contents of file_path by this LONG_TABLE_VERSION."""
+    metadata = _read_source_metadata(table_path)
+    if metadata is None or metadata.get('version') != LONG_TABLE_VERSION:
+        return False
+    stat = os.stat(file_path)
+    if stat.st_size != metadata['size']:
+        return False
+    if stat.st_mtime == metadata['mtime']:
+        return True
+    return build_manifest.file_sha256(file_path) == metadata['sha256']
+
+
+# --- 3. 단계 실행 ---
+
+def build_long_table(file_path):
+    """Parses one qpoll workbook and writes its long table. Returns (row count, table path)."""
+    print(f"--- Parsing {file_path} ---")
+    stat = os.stat(file_path)
+    source = {
+        'source': os.path.basename(file_path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'sha256': build_manifest.file_sha256(file_path),
+    }
+
+    processed_df = process_qpoll_file(file_path)
+
+    for col in processed_df.select_dtypes(include=['datetime64[ns]']).columns:
+        processed_df[col] = processed_df[col].dt.strftime('%Y-%m-%dT%H:%M:%S')
+
+    table_path = long_table_path_for(file_path)
+    write_long_table(processed_df, table_path, source)
+    return len(processed_df), table_path
+
+
+def load_long_table(file_path, force=False):
+    """
+    Returns the long-format DataFrame of a qpoll workbook (same as process_qpoll_file + timestamp
+    formatting). The workbook is parsed only if its long table is missing or out of date.
+    """
+    table_path = long_table_path_for(file_path)
+    if force or not is_long_table_fresh(file_path, table_path):
+        build_long_table(file_path)
+    return read_long_table(table_path)
+
+
+# --- Main Execution ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="qpoll*.xlsx -> qpoll_long_output/*.parquet (long 포맷 중간 파일)")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help=f"동시에 파싱할 워커 프로세스 수 (기본: 1, 이 머신의 코어 수: {default_workers()})"
+    )
+    parser.add_argument("--force", action="store_true", help="최신 상태인 중간 파일도 다시 생성")
+    args = parser.parse_args()
+
+    if not INPUT_FILES:
+        print(f"No 'qpoll*.xlsx' files found in '{INPUT_PATTERN}'")
+
+    stale_files = [
+        file_path for file_path in INPUT_FILES
+        if args.force or not is_long_table_fresh(file_path, long_table_path_for(file_path))
+    ]
+    print(f"Up to date: {len(INPUT_FILES) - len(stale_files)}, to parse: {len(stale_files)}")
+
+    batch_start = time.perf_counter()
+    failed_files = []
+    for index, result, error, elapsed in run_tasks(
+        label_cache.call_with_stats,
+        [(build_long_table, file_path) for file_path in stale_files],
+        workers=args.workers
+    ):
+        base_name = os.path.basename(stale_files[index])
+        if error:
+            print(f"[FAILED] {base_name} ({elapsed:.2f}s)\n{error}")
+            failed_files.append(base_name)
+            continue
+
+        (row_count, table_path), cache_stats, pid = result
+        label_cache.add_worker_stats(cache_stats, pid)
+        print(f"[{elapsed:7.2f}s] {base_name} -> {row_count} rows ({os.path.basename(table_path)})")
+
+    print(f"Total elapsed: {time.perf_counter() - batch_start:.2f}s")
+    if failed_files:
+        print(f"Failed files ({len(failed_files)}): {', '.join(failed_files)}")
+    label_cache.evict_stale_entries()
+    print(label_cache.format_stats())
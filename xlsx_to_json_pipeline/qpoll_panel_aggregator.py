@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+# 패널별로 한 번만 저장하는 컬럼 / 설문 응답마다 저장하는 컬럼 (출력 JSON 키 순서 그대로)
+PANEL_FIELDS = ['category', 'gender', 'age_raw', 'region']
+SURVEY_FIELDS = ['survey_question', 'survey_answers', 'survey_timestamp']
+
+
+def _column_values(df, column, rows):
+    """Column values at rows as Python objects (None for every row if the column is missing)."""
+    if column not in df.columns:
+        return [None] * len(rows)
+    return df[column].to_numpy(dtype=object)[rows].tolist()
+
+
+def aggregate_by_panel(processed_df, all_data_by_panel=None):
+    """
+    Groups the melted qpoll frame by panel_id into
+    {panel_id: {'panel_id', 'category', 'gender', 'age_raw', 'region', 'surveys': [...]}}.
+    Same result as the former to_dict('records') loop: panels keep first-appearance order,
+    panel fields come from each panel's first row, rows with an empty panel_id are skipped.
+    Pass an existing all_data_by_panel to append to it (merged output over several files).
+    """
+    if all_data_by_panel is None:
+        all_data_by_panel = {}
+    if processed_df.empty or 'panel_id' not in processed_df.columns:
+        return all_data_by_panel
+
+    # 1. 패널 코드 부여 (uniques는 처음 등장한 순서), 빈 panel_id는 건너뜀
+    panel_codes, panel_ids = pd.factorize(processed_df['panel_id'].to_numpy(dtype=object))
+    panel_ids = panel_ids.tolist()
+    valid_panels = np.array([bool(panel_id) for panel_id in panel_ids], dtype=bool)
+    keep = panel_codes >= 0
+    keep[keep] = valid_panels[panel_codes[keep]]
+
+    # 2. 패널별로 행을 모으되 패널 안에서는 원래 행 순서 유지 (stable 정렬)
+    rows = np.flatnonzero(keep)
+    rows = rows[np.argsort(panel_codes[rows], kind='stable')]
+    counts = np.bincount(panel_codes[rows], minlength=len(panel_ids))
+    ends = np.cumsum(counts)
+
+    # 3. 필요한 컬럼만 꺼내 설문 dict 생성 (행 전체 dict는 만들지 않음)
+    surveys = [
+        dict(zip(SURVEY_FIELDS, values))
+        for values in zip(*(_column_values(processed_df, column, rows) for column in SURVEY_FIELDS))
+    ]
+
+    # 4. 패널 정보는 각 패널의 첫 행에서만 가져옴
+    first_rows = rows[ends[counts > 0] - counts[counts > 0]]
+    panel_values = zip(*(_column_values(processed_df, column, first_rows) for column in PANEL_FIELDS))
+
+    for code, values in zip(np.flatnonzero(counts), panel_values):
+        panel_id = panel_ids[code]
+        panel_surveys = surveys[ends[code] - counts[code]:ends[code]]
+        if panel_id in all_data_by_panel:
+            all_data_by_panel[panel_id]['surveys'].extend(panel_surveys)
+            continue
+        panel = {'panel_id': panel_id}
+        panel.update(zip(PANEL_FIELDS, values))
+        panel['surveys'] = panel_surveys
+        all_data_by_panel[panel_id] = panel
+
+    return all_data_by_panel
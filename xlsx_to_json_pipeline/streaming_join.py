@@ -0,0 +1,154 @@
+import os
+import sys
+import heapq
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.json_io import iter_ndjson, write_records
+
+# 한 번에 메모리에서 정렬하는 레코드 수 (넘으면 정렬된 run을 임시 NDJSON 파일로 내보냄)
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def sort_key(value):
+    """
+    Orderable key for a join value (usually the panel_id string).
+    Values of different types never compare directly, and None is a valid key as in a dict lookup.
+    """
+    return (type(value).__name__, value)
+
+
+# --- 1. 외부 정렬 ---
+
+def external_sort(records, key, chunk_size=DEFAULT_CHUNK_SIZE, tmp_dir=None):
+    """
+    Yields records sorted by key (stable) while holding at most chunk_size records in memory.
+    Sorted runs are spilled to temporary NDJSON files and k-way merged; if everything fits in
+    one chunk nothing is written to disk. Records must be JSON-serialisable.
+    """
+    chunk = []
+    records = iter(records)
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            break
+    else:
+        yield from sorted(chunk, key=key)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='sort-', dir=tmp_dir) as work_dir:
+        run_paths = []
+
+        def spill(run):
+            run_path = os.path.join(work_dir, f"run-{len(run_paths):05d}.ndjson")
+            write_records(run_path, sorted(run, key=key), pretty=False)
+            run_paths.append(run_path)
+
+        spill(chunk)
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                spill(chunk)
+                chunk = []
+        if chunk:
+            spill(chunk)
+        chunk = None
+
+        # heapq.merge는 키가 같으면 앞선 run을 먼저 내보내므로 정렬이 안정적으로 유지됨
+        yield from heapq.merge(*(iter_ndjson(run_path) for run_path in run_paths), key=key)
+
+
+def check_sorted(records, key, name):
+    """Passes records through, raising ValueError as soon as one is out of order."""
+    previous = None
+    for index, record in enumerate(records):
+        current = key(record)
+        if index and current < previous:
+            raise ValueError(f"{name} is not sorted by join key (record {index})")
+        previous = current
+        yield record
+
+
+# --- 2. 정렬된 입력의 left join ---
+
+def left_join_sorted(left, right, left_key, right_key):
+    """
+    Left join of two inputs sorted by their keys; yields (left_record, right_record or None)
+    in left order. When several right records share a key the last one is used (same as
+    building a {key: record} dict). Only one right record is held in memory at a time.
+    """
+    right = iter(right)
+    pending = next(right, None)
+    matched_key, matched = None, None
+    has_matched_key = False
+
+    for left_record in left:
+        current = left_key(left_record)
+        if not has_matched_key or current != matched_key:
+            while pending is not None and right_key(pending) < current:
+                pending = next(right, None)
+            matched = None
+            while pending is not None and right_key(pending) == current:
+                matched = pending
+                pending = next(right, None)
+            matched_key, has_matched_key = current, True
+        yield left_record, matched
+
+
+def merge_records(left_record, right_record):
+    """qpoll record on top of the demographic record (qpoll keys win); unmatched records as is."""
+    if right_record is None:
+        return left_record
+    combined_record = right_record.copy()
+    combined_record.update(left_record)
+    return combined_record
+
+
+def stream_left_join(left_records, right_records, key_field='panel_id', presorted=False,
+                     keep_left_order=True, chunk_size=DEFAULT_CHUNK_SIZE, tmp_dir=None):
+    """
+    Streams merge_records(left, right) for every left record, joined on key_field.
+    Right records without key_field are ignored; left records without it get key None.
+
+    presorted=True: both inputs are already sorted by key_field (checked while streaming).
+    keep_left_order=True: output follows the original left order (one extra external sort);
+    otherwise output is sorted by key_field.
+    """
+    def left_key(record):
+        return sort_key(record.get(key_field))
+
+    def right_key(record):
+        return sort_key(record[key_field])
+
+    right_records = (record for record in right_records if key_field in record)
+
+    if presorted:
+        left_sorted = check_sorted(left_records, left_key, 'left input')
+        right_sorted = check_sorted(right_records, right_key, 'right input')
+        if keep_left_order:
+            # 정렬된 입력이면 정렬 순서가 곧 원래 순서
+            for left_record, right_record in left_join_sorted(left_sorted, right_sorted, left_key, right_key):
+                yield merge_records(left_record, right_record)
+            return
+    else:
+        right_sorted = external_sort(right_records, right_key, chunk_size, tmp_dir)
+        if keep_left_order:
+            # 원래 순서를 복원하기 위해 [순번, 레코드] 형태로 정렬
+            left_sorted = external_sort(
+                ([seq, record] for seq, record in enumerate(left_records)),
+                lambda item: left_key(item[1]), chunk_size, tmp_dir
+            )
+            joined = (
+                [item[0], merge_records(item[1], right_record)]
+                for item, right_record in left_join_sorted(
+                    left_sorted, right_sorted, lambda item: left_key(item[1]), right_key
+                )
+            )
+            for _, combined_record in external_sort(joined, lambda item: item[0], chunk_size, tmp_dir):
+                yield combined_record
+            return
+        left_sorted = external_sort(left_records, left_key, chunk_size, tmp_dir)
+
+    for left_record, right_record in left_join_sorted(left_sorted, right_sorted, left_key, right_key):
+        yield merge_records(left_record, right_record)
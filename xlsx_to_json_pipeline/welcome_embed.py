@@ -1,20 +1,29 @@
 import psycopg2
 from psycopg2 import extras
 import pandas as pd
-import json
 import logging
 from tqdm import tqdm
 from datetime import datetime
 import math
 import typing as t
 import argparse
+import os
+import sys
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_community.vectorstores import Qdrant
 from langchain_community.embeddings import HuggingFaceEmbeddings
 
+# 파이프라인 공통 JSON 코덱 (orjson이 있으면 orjson)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import json_io
+from common.embedding_cache import EmbeddingCache, DEFAULT_CACHE_PATH, DEFAULT_MAX_MB
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'embedding'))
+from onnx_encoder import BACKENDS, DEFAULT_ONNX_DIR, load_encoder_model, cache_model_id
+
 # -------------------- 설정 --------------------
 DB_CONFIG = {
     "host": "project-main-db.crkcc42287ai.ap-southeast-2.rds.amazonaws.com",
@@ -30,6 +39,8 @@ QDRANT_HOST = "52.63.128.220"
 QDRANT_PORT = 6333
 COLLECTION_NAME = "welcome_subjective_vectors"
 BATCH_SIZE = 50
+# HuggingFaceEmbeddings 기본값(encode_kwargs 없음, normalize_embeddings=False)으로 만든 벡터
+CACHE_NORMALIZATION = "none"
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
@@ -136,6 +147,34 @@ def build_smoke_habit_text(d: t.Dict[str, t.Any]) -> t.Optional[str]:
     return None
 
 
+# -------------------- 임베딩 캐시 --------------------
+class CachedEmbeddings(Embeddings):
+    """Wraps an Embeddings model so that embed_documents only encodes sentences missing from the on-disk cache."""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache):
+        self.embeddings = embeddings
+        self.cache = cache
+
+    def embed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        return self.cache.encode(texts, self.embeddings.embed_documents).tolist()
+
+    def embed_query(self, text: str) -> t.List[float]:
+        return self.embeddings.embed_query(text)
+
+
+class OnnxEmbeddings(Embeddings):
+    """Embeddings interface over an ONNX Runtime encoder (embedding/onnx_encoder.py)."""
+
+    def __init__(self, backend: str, onnx_dir: str = DEFAULT_ONNX_DIR):
+        self.encoder = load_encoder_model(backend, EMBEDDING_MODEL_NAME, onnx_dir)
+
+    def embed_documents(self, texts: t.List[str]) -> t.List[t.List[float]]:
+        return self.encoder.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> t.List[float]:
+        return self.encoder.encode([text])[0].tolist()
+
+
 # -------------------- DB 로드 함수 --------------------
 def load_welcome_meta(start_pid: int, end_pid: int):
     conn = psycopg2.connect(**DB_CONFIG)
@@ -153,13 +192,20 @@ def load_welcome_meta(start_pid: int, end_pid: int):
 
 
 # -------------------- 메인 함수 --------------------
-def generate_subjective_qdrant(start_pid: int, end_pid: int):
+def generate_subjective_qdrant(start_pid: int, end_pid: int, cache: t.Optional[EmbeddingCache] = None,
+                               backend: str = "torch", onnx_dir: str = DEFAULT_ONNX_DIR):
     logging.info(f"PID {start_pid} ~ {end_pid} 구간 데이터 처리 시작")
 
     rows = load_welcome_meta(start_pid, end_pid)
     logging.info(f"총 {len(rows)}명 데이터 불러옴")
 
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
+    if backend == "torch":
+        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_NAME)
+    else:
+        embeddings = OnnxEmbeddings(backend, onnx_dir)
+    if cache is not None:
+        # 이전 실행에서 인코딩한 문장은 캐시에서 가져오고, 없는 문장만 모델에 넣는다
+        embeddings = CachedEmbeddings(embeddings, cache)
     raw_client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT, timeout=300)
     qdrant_store = Qdrant(client=raw_client, collection_name=COLLECTION_NAME, embeddings=embeddings)
 
@@ -180,7 +226,7 @@ def generate_subjective_qdrant(start_pid: int, end_pid: int):
 
         if not isinstance(structured_data, dict):
             try:
-                structured_data = json.loads(structured_data)
+                structured_data = json_io.loads(structured_data)
             except Exception as e:
                 logging.warning(f"{pid} structured_data JSON 변환 실패: {e}")
                 continue
@@ -214,6 +260,8 @@ def generate_subjective_qdrant(start_pid: int, end_pid: int):
         qdrant_store.add_documents(documents_to_add)
 
     logging.info(f"✅ PID {start_pid}~{end_pid} 데이터 Qdrant 적재 완료")
+    if cache is not None:
+        logging.info(cache.format_stats())
 
 
 # -------------------- 실행 --------------------
@@ -221,6 +269,18 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--start", type=int, required=True, help="시작 pid")
     parser.add_argument("--end", type=int, required=True, help="끝 pid")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="임베딩 캐시 파일")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_MB, help="캐시 최대 크기 (MB), 넘으면 오래 사용하지 않은 벡터부터 삭제")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="임베딩 캐시를 사용하지 않음")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch",
+                        help="torch: HuggingFaceEmbeddings (기본), onnx / onnx-int8: ONNX Runtime (실험적, 실제 모델로 검증 전. "
+                             "embedding/onnx_encoder.py export 필요)")
+    parser.add_argument("--onnx-dir", default=DEFAULT_ONNX_DIR, help="ONNX 모델 폴더")
     args = parser.parse_args()
 
-    generate_subjective_qdrant(args.start, args.end)
+    if args.use_cache:
+        cache_model = cache_model_id(EMBEDDING_MODEL_NAME, args.backend)
+        with EmbeddingCache(cache_model, CACHE_NORMALIZATION, args.cache, args.cache_max_mb * 1024 * 1024) as cache:
+            generate_subjective_qdrant(args.start, args.end, cache, args.backend, args.onnx_dir)
+    else:
+        generate_subjective_qdrant(args.start, args.end, backend=args.backend, onnx_dir=args.onnx_dir)
@@ -0,0 +1,217 @@
+import datetime
+import math
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+# --- 0. 설정 ---
+# 한 번에 DataFrame으로 변환할 행 수 (청크 크기)
+DEFAULT_CHUNK_SIZE = 5000
+
+# python-calamine(Rust 기반 read-only 리더)이 설치되어 있으면 우선 사용하고,
+# 없으면 openpyxl read-only 모드로 대체한다.
+try:
+    from python_calamine import CalamineWorkbook
+    DEFAULT_ENGINE = 'calamine'
+except ImportError:
+    CalamineWorkbook = None
+    DEFAULT_ENGINE = 'openpyxl'
+
+# openpyxl(values_only)은 오류 셀을 문자열로 돌려주므로, pandas처럼 NaN으로 처리한다
+EXCEL_ERROR_VALUES = {'#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'}
+
+
+# --- 1. 셀 / 행 변환 ---
+
+def _convert_cell(value):
+    """Converts a raw cell value the same way pandas' Excel readers do."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return np.nan
+        int_value = int(value)
+        return int_value if int_value == value else value
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return datetime.datetime(value.year, value.month, value.day)
+    if isinstance(value, str) and value in EXCEL_ERROR_VALUES:
+        return np.nan
+    return value
+
+
+def _iter_raw_rows(path, sheet_index, engine):
+    """Yields raw cell value lists of one sheet using a read-only backend."""
+    if engine == 'calamine':
+        if CalamineWorkbook is None:
+            raise ImportError("python-calamine is not installed. (pip install python-calamine)")
+        sheet = CalamineWorkbook.from_path(path).get_sheet_by_index(sheet_index)
+        # calamine은 사용 영역의 시작 열부터 돌려주므로, 앞쪽 빈 열을 채워 열 위치를 맞춘다
+        left_pad = [None] * sheet.start[1] if sheet.start else []
+        for row in sheet.iter_rows():
+            yield left_pad + row
+    elif engine == 'openpyxl':
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+        try:
+            worksheet = workbook.worksheets[sheet_index]
+            worksheet.reset_dimensions()
+            for row in worksheet.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+
+
+def iter_sheet_rows(path, sheet_index=0, engine=None):
+    """
+    Streams the rows of one sheet as converted value lists.
+    Trailing empty cells are trimmed and trailing empty rows are dropped, like pandas.
+    """
+    engine = engine or DEFAULT_ENGINE
+    pending_empty_rows = 0
+
+    for raw_row in _iter_raw_rows(path, sheet_index, engine):
+        row = [_convert_cell(value) for value in raw_row]
+        while row and row[-1] == "":
+            row.pop()
+
+        # 빈 행은 뒤에 데이터 행이 나올 때만 내보낸다 (마지막 빈 행들은 버림)
+        if not row:
+            pending_empty_rows += 1
+            continue
+        for _ in range(pending_empty_rows):
+            yield []
+        pending_empty_rows = 0
+        yield row
+
+
+# --- 2. 청크 단위 DataFrame ---
+
+def _pad_rows(rows, width):
+    return [row[:width] + [""] * (width - len(row)) for row in rows]
+
+
+def _parse_chunk(rows, columns):
+    """Parses a list of rows into an object-dtype DataFrame (no dtype inference yet)."""
+    return TextParser(
+        _pad_rows(rows, len(columns)),
+        names=columns,
+        header=None,
+        dtype=object,
+        skip_blank_lines=False,
+    ).read()
+
+
+def iter_sheet_chunks(path, sheet_index=0, header=0, chunk_size=DEFAULT_CHUNK_SIZE, engine=None):
+    """
+    Streams a sheet as object-dtype DataFrame chunks of at most `chunk_size` rows.
+    `header` follows pd.ExcelFile.parse: the row index used for column names, or None.
+    """
+    rows = iter_sheet_rows(path, sheet_index, engine)
+    columns = None
+
+    if header is not None:
+        header_row = None
+        for row_number, row in enumerate(rows):
+            if row_number == header:
+                header_row = row
+                break
+        if header_row is None:
+            return
+        # 중복/빈 컬럼명 처리('a.1', 'Unnamed: 3')는 pandas 파서에 그대로 맡긴다
+        columns = list(TextParser([header_row], header=0, skip_blank_lines=False).read().columns)
+
+    # header=None이면 지금까지 본 가장 넓은 행 기준으로 0, 1, 2 ... 컬럼을 만든다
+    width = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        width = max(width, len(row))
+        if len(chunk) >= chunk_size:
+            yield _parse_chunk(chunk, columns if columns is not None else list(range(width)))
+            chunk = []
+    if chunk:
+        yield _parse_chunk(chunk, columns if columns is not None else list(range(width)))
+
+
+def _infer_dtype(values):
+    """pandas' Excel dtype inference for one object column (to_numeric, else infer_objects)."""
+    series = pd.Series(values, dtype=object)
+    try:
+        return pd.to_numeric(series)
+    except (ValueError, TypeError):
+        return series.infer_objects()
+
+
+def infer_column_dtypes(df):
+    """Applies pandas' Excel dtype inference once to object columns built from chunks."""
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        df[col] = _infer_dtype(df[col]).set_axis(df.index)
+    return df
+
+
+def _compact_piece(values):
+    """
+    Stores a chunk's column values as int64 / float64 when every value is a Python int / float,
+    so the per-cell Python objects are released as the sheet is read. Other columns stay object.
+    The original values are recovered exactly with astype(object).
+    """
+    value_types = set(map(type, values))
+    if value_types == {int}:
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            return values
+    if value_types == {float}:
+        return values.astype(np.float64)
+    return values
+
+
+def _join_pieces(pieces):
+    """Concatenates one column's pieces and applies the Excel dtype inference."""
+    if all(piece.dtype != object for piece in pieces):
+        # 모든 조각이 숫자면 to_numeric 결과와 같다 (int64만 있으면 int64, float64가 섞이면 float64)
+        return pd.Series(np.concatenate(pieces) if len(pieces) > 1 else pieces[0])
+    return _infer_dtype(np.concatenate([piece.astype(object, copy=False) for piece in pieces]))
+
+
+def read_sheet(path, sheet_index=0, header=0, chunk_size=DEFAULT_CHUNK_SIZE, engine=None):
+    """
+    Reads one sheet through the streaming reader.
+    Returns the same DataFrame as pd.ExcelFile(path).parse(sheet_index, header=header).
+    """
+    # 청크를 리스트로 모았다가 pd.concat 하면 시트 전체가 셀마다 Python 객체인 object 청크로 남고,
+    # 합친 결과까지 두 벌이 메모리에 올라간다.
+    # 청크가 오는 대로 컬럼별 조각으로 옮기면서 숫자만 있는 조각은 int64 / float64 배열로 줄이고 청크는 바로 버린다.
+    # 마지막에 컬럼 하나씩 이어 붙이고 dtype을 추론하면서 그 컬럼의 조각을 해제한다.
+    columns = []
+    pieces = [] # 컬럼 위치별 조각 리스트
+    row_count = 0
+    chunk_seen = False
+    for chunk in iter_sheet_chunks(path, sheet_index, header, chunk_size, engine):
+        # header=None이면 뒤 청크가 더 넓을 수 있다: 새 컬럼의 앞쪽 행은 pd.concat처럼 NaN
+        for col in chunk.columns[len(columns):]:
+            columns.append(col)
+            pieces.append([np.full(row_count, np.nan)] if row_count else [])
+        for position in range(len(columns)):
+            pieces[position].append(_compact_piece(chunk.iloc[:, position].to_numpy(dtype=object, copy=True)))
+        row_count += len(chunk)
+        chunk_seen = True
+        del chunk
+    if not chunk_seen:
+        return pd.DataFrame()
+    if not columns:
+        return pd.DataFrame(index=pd.RangeIndex(row_count), columns=pd.Index([], dtype=object))
+
+    data = {}
+    for position in range(len(columns)):
+        column_pieces, pieces[position] = pieces[position], None
+        data[position] = _join_pieces(column_pieces)
+        del column_pieces
+    df = pd.DataFrame(data, copy=False)
+    df.columns = columns
+    return df